@@ -13,7 +13,7 @@ class Bet(BlockchainObject):
     type_id = 26
 
     def refresh(self):
-        data = self.blockchain.rpc.get_object(self.identifier)
+        data = self.blockchain.objectloader.load(self.identifier)
         if not data:
             raise BetDoesNotExistException(self.identifier)
         dict.__init__(self, data)
@@ -18,10 +18,10 @@ class BettingMarket(BlockchainObject):
         assert (
             self.identifier[:5] == "1.25."
         ), "Identifier needs to be of form '1.25.xx'"
-        data = self.blockchain.rpc.get_object(self.identifier)
+        data = self.blockchain.objectloader.load(self.identifier)
         if not data:
             raise BettingMarketDoesNotExistException(self.identifier)
-        super(BettingMarket, self).__init__(data)
+        super(BettingMarket, self).__init__(data, blockchain_instance=self.blockchain)
         self.cached = True
 
     @property
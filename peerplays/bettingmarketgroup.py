@@ -19,10 +19,12 @@ class BettingMarketGroup(BlockchainObject):
     type_id = 24
 
     def refresh(self):
-        data = self.blockchain.rpc.get_object(self.identifier)
+        data = self.blockchain.objectloader.load(self.identifier)
         if not data:
             raise BettingMarketGroupDoesNotExistException(self.identifier)
-        super(BettingMarketGroup, self).__init__(data)
+        super(BettingMarketGroup, self).__init__(
+            data, blockchain_instance=self.blockchain
+        )
         self.cached = True
 
     @property
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from .instance import BlockchainInstance
+from .exceptions import BlockDoesNotExistsException
 from graphenecommon.block import (
     Block as GrapheneBlock,
     BlockHeader as GrapheneBlockHeader,
@@ -33,6 +34,27 @@ class Block(GrapheneBlock):
     def define_classes(self):
         self.type_id = "-none-"
 
+    def refresh(self):
+        """ Read the block from the block store (if used) and fall back
+            to the API. Irreversible blocks are added to the store.
+        """
+        store = getattr(self.blockchain, "blockstore", None)
+        if store is None:
+            return super(Block, self).refresh()
+        identifier = self.identifier
+        block = store.get(identifier)
+        if not block:
+            block = self.blockchain.rpc.get_block(identifier)
+            if not block:
+                raise BlockDoesNotExistsException
+            if store.is_irreversible(identifier, self.blockchain.rpc):
+                store.add(identifier, block)
+        super(GrapheneBlock, self).__init__(
+            block, blockchain_instance=self.blockchain, use_cache=self._use_cache
+        )
+        # block does not contain an id and thus identifier gets overwritten
+        self.identifier = identifier
+
 
 @BlockchainInstance.inject
 class BlockHeader(GrapheneBlockHeader):
@@ -1,10 +1,22 @@
 # -*- coding: utf-8 -*-
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from .block import Block
+from .exceptions import BlockDoesNotExistsException
 from .instance import BlockchainInstance
+from peerplaysapi.node import PeerPlaysNodeRPC
 from peerplaysbase import operationids
 from graphenecommon.blockchain import Blockchain as GrapheneBlockchain
 
 
+#: Lightweight record of an operation yielded by
+#: :meth:`Blockchain.stream_operations`
+OperationRecord = namedtuple(
+    "OperationRecord",
+    ["block_num", "trx_in_block", "op_in_trx", "timestamp", "type", "op"],
+)
+
+
 @BlockchainInstance.inject
 class Blockchain(GrapheneBlockchain):
     """ This class allows to access the blockchain and read data
@@ -22,3 +34,122 @@ class Blockchain(GrapheneBlockchain):
     def define_classes(self):
         self.block_class = Block
         self.operationids = operationids
+
+    def block_range(self, start, stop=None, window=100, workers=1, nodes=[]):
+        """ Yields the blocks ``start`` to ``stop`` (inclusive) strictly in
+            order. Other than :meth:`blocks`, up to ``window`` ``get_block``
+            requests are in flight at once (per worker), so that fetching
+            long ranges is not limited by the latency of the node.
+
+            :param int start: First block
+            :param int stop: Last block (defaults to the current block)
+            :param int window: Number of blocks requested at once
+            :param int workers: Number of windows fetched concurrently
+            :param list nodes: Urls of further API nodes to spread the
+                requests across (round robin, together with the instance's
+                own connection)
+            :raises peerplays.exceptions.BlockDoesNotExistsException: if a
+                block of the range is not available
+
+            .. code-block:: python
+
+                for block in Blockchain().block_range(1000000, 1100000, workers=4):
+                    print(block["block_num"], block["timestamp"])
+
+        """
+        if stop is None:
+            stop = self.get_current_block_num()
+        rpcs = [self.blockchain.rpc] + [
+            PeerPlaysNodeRPC(url, num_retries=self.blockchain.rpc.num_retries)
+            for url in nodes
+        ]
+        workers = max(workers, len(rpcs))
+        chunks = (
+            (rpcs[i % len(rpcs)], range(num, min(num + window, stop + 1)))
+            for i, num in enumerate(range(start, stop + 1, window))
+        )
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(executor.submit(self._fetch_blocks, *chunk))
+                if len(pending) < workers:
+                    continue
+                for block in pending.popleft().result():
+                    yield block
+            while pending:
+                for block in pending.popleft().result():
+                    yield block
+
+    def stream_operations(self, opNames=[], start=None, stop=None, **kwargs):
+        """ Yield the operations of the given types as
+            :class:`OperationRecord` tuples
+
+            Other than :meth:`stream`, operations are filtered by their
+            numerical id before anything is done with them, and no dictionary
+            is built for the yielded records. With ``stop``, the blocks are
+            fetched with :meth:`block_range` (``kwargs`` are handed over).
+
+            :param list opNames: Operation names to filter for, e.g.
+                ``["bet_place", "transfer"]`` (defaults to all operations)
+            :param int start: Start at this block
+            :param int stop: Stop at this block
+
+            .. code-block:: python
+
+                for op in Blockchain().stream_operations(["bet_place"], start=1000):
+                    print(op.block_num, op.op["bettor_id"], op.op["amount_to_bet"])
+
+        """
+        try:
+            op_ids = set(self.operationids.operations[name] for name in opNames)
+        except KeyError as e:
+            raise ValueError("Unknown operation {}".format(str(e)))
+        names = self.operationids.ops
+
+        if stop is not None:
+            if start is None:
+                start = self.get_current_block_num()
+            blocks = self.block_range(start, stop, **kwargs)
+        else:
+            blocks = self.blocks(start=start)
+
+        for block in blocks:
+            for trx_in_block, tx in enumerate(block["transactions"]):
+                for op_in_trx, (op_id, op) in enumerate(tx["operations"]):
+                    if op_ids and op_id not in op_ids:
+                        continue
+                    yield OperationRecord(
+                        block["block_num"],
+                        trx_in_block,
+                        op_in_trx,
+                        block["timestamp"],
+                        names[op_id],
+                        op,
+                    )
+
+    def _fetch_blocks(self, rpc, block_nums):
+        store = getattr(self.blockchain, "blockstore", None)
+        blocks = store.get_many(block_nums) if store is not None else dict()
+        missing = [x for x in block_nums if x not in blocks]
+        if missing:
+            with rpc.batch(max_pipeline=len(missing)) as batch:
+                for block_num in missing:
+                    batch.get_block(block_num)
+            fetched = list(zip(missing, batch.results()))
+            for block_num, block in fetched:
+                if not block:
+                    raise BlockDoesNotExistsException(
+                        "Block {} is not available".format(block_num)
+                    )
+                blocks[block_num] = block
+            if store is not None:
+                store.add_many(
+                    [x for x in fetched if store.is_irreversible(x[0], self.blockchain.rpc)]
+                )
+        ret = []
+        for block_num in block_nums:
+            block = blocks[block_num]
+            block.update({"block_num": block_num})
+            ret.append(block)
+        return ret
@@ -1,4 +1,8 @@
 # -*- coding: utf-8 -*-
+import time
+import threading
+from collections import OrderedDict
+from .exceptions import AccountDoesNotExistsException, AssetDoesNotExistsException
 from .instance import BlockchainInstance
 from graphenecommon.blockchainobject import (
     BlockchainObject as GrapheneBlockchainObject,
@@ -9,9 +13,289 @@ from graphenecommon.blockchainobject import (
 
 @BlockchainInstance.inject
 class BlockchainObject(GrapheneBlockchainObject):
-    pass
+    def __init__(self, *args, **kwargs):
+        GrapheneBlockchainObject.__init__(self, *args, **kwargs)
+        # Lazy objects created within a ``prefetch()`` block are loaded
+        # together with the next object that is actually needed
+        if (
+            self._lazy
+            and not self._fetched
+            and isinstance(self.identifier, str)
+            and self.objectid_valid(self.identifier)
+        ):
+            loader = getattr(self.blockchain, "objectloader", None)
+            if loader and loader.active:
+                loader.want(self.identifier)
 
 
 @BlockchainInstance.inject
 class BlockchainObjects(GrapheneBlockchainObjects):
     pass
+
+
+class _Batch:
+    def __init__(self):
+        self.ids = OrderedDict()
+        self.leader = False
+        self.done = threading.Event()
+        self.results = dict()
+        self.error = None
+
+
+class ObjectLoader:
+    """ Coalesce single-object lookups into ``get_objects`` calls
+
+        Ids requested through :meth:`load` (from different threads) while
+        another fetch is in flight or within ``window`` seconds, and all
+        ids registered through :meth:`want` are fetched together with a
+        single (pipelined) ``get_objects`` call. A lookup without any
+        concurrent one is sent right away. The results are stored in the
+        ``ObjectCache``.
+
+        Within a ``with peerplays.prefetch():`` block, lazy objects register
+        their ids and all loaded objects are kept until the block is left:
+
+        .. code-block:: python
+
+            with peerplays.prefetch(["1.22.1", "1.22.2"]):
+                events = [Event(x) for x in ids]
+
+        :param instance blockchain_instance: instance
+        :param float window: Seconds to wait for other ids before sending
+            (defaults to ``0``, i.e. only coalesce the lookups that arrive
+            while another fetch is in flight)
+        :param int max_batch: Number of ids per ``get_objects`` call
+    """
+
+    def __init__(self, blockchain_instance, window=0, max_batch=100):
+        self.blockchain = blockchain_instance
+        self.window = window
+        self.max_batch = max_batch
+        self._depth = 0
+        self._loaded = dict()
+        self._lock = threading.Lock()
+        # Held by the leader of a batch while fetching it
+        self._sending = threading.Lock()
+        self._batch = _Batch()
+
+    @property
+    def active(self):
+        """ Are we within a ``prefetch()`` block?
+        """
+        return self._depth > 0
+
+    def __enter__(self):
+        with self._lock:
+            self._depth += 1
+        return self
+
+    def __exit__(self, *args):
+        with self._lock:
+            self._depth -= 1
+            if not self._depth:
+                self._loaded = dict()
+                # The ids of a batch with a leader are needed by its
+                # followers
+                if not self._batch.leader:
+                    self._batch = _Batch()
+
+    def want(self, ids):
+        """ Register ids to be fetched with the next :meth:`load`
+
+            :param list ids: Object ids
+        """
+        if isinstance(ids, str):
+            ids = [ids]
+        cache = self.blockchain.blockchainobject_class._cache
+        with self._lock:
+            for id in ids:
+                if id not in self._loaded and id not in cache:
+                    self._batch.ids[id] = None
+
+    def load(self, id):
+        """ Return the object with id ``id``, fetching it together with
+            all other pending ids
+
+            :param str id: Object id
+        """
+        with self._lock:
+            if id in self._loaded:
+                return self._loaded[id]
+            batch = self._batch
+            batch.ids[id] = None
+            leader = not batch.leader
+            batch.leader = True
+
+        if leader:
+            # Ids requested while the previous batch is in flight join this
+            # one
+            with self._sending:
+                if self.window:
+                    time.sleep(self.window)
+                with self._lock:
+                    self._batch = _Batch()
+                self._fetch(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error:
+            raise batch.error
+        return batch.results.get(id)
+
+    def fetch(self, ids):
+        """ Fetch the objects ``ids`` right away, with as few (pipelined)
+            ``get_objects`` calls as possible, and store them in the cache
+
+            :param list ids: Object ids
+            :returns: The objects by id (``None`` for objects that do not
+                exist)
+        """
+        batch = _Batch()
+        batch.leader = True
+        for id in ids:
+            batch.ids[id] = None
+        self._fetch(batch)
+        if batch.error:
+            raise batch.error
+        return batch.results
+
+    def _fetch(self, batch):
+        try:
+            ids = list(batch.ids)
+            rpc = self.blockchain.rpc
+            if len(ids) <= self.max_batch:
+                objects = rpc.get_objects(ids)
+            else:
+                with rpc.batch() as calls:
+                    for i in range(0, len(ids), self.max_batch):
+                        calls.get_objects(ids[i : i + self.max_batch])
+                objects = [x for chunk in calls.results() for x in chunk]
+            cache = self.blockchain.blockchainobject_class._cache
+            for id, data in zip(ids, objects):
+                batch.results[id] = data
+                if data:
+                    cache[id] = data
+            with self._lock:
+                if self.active:
+                    self._loaded.update(batch.results)
+        except Exception as e:
+            batch.error = e
+        finally:
+            batch.done.set()
+
+
+class NameCache:
+    """ Resolve account names and asset symbols to their objects (and ids)
+
+        Resolved objects are kept for ``ttl`` seconds and shared by all
+        operation builders of an instance, so that many operations for the
+        same account need a single lookup. Object ids are passed through
+        by :meth:`account_id` and :meth:`asset_id` without any lookup.
+
+        Entries of objects that change can be dropped early by handing
+        object notices over to :meth:`process_notice`, e.g.
+
+        .. code-block:: python
+
+            PeerPlaysWebsocket(
+                urls, objects=["1.2.100"], on_object=peerplays.namecache.process_notice
+            )
+
+        :param instance blockchain_instance: instance
+        :param float ttl: Seconds to keep a resolved object (defaults to
+            ``3600``)
+    """
+
+    def __init__(self, blockchain_instance, ttl=3600):
+        self.blockchain = blockchain_instance
+        self.ttl = ttl
+        self._objects = dict()
+        self._keys = dict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def account(self, name):
+        """ The account ``name`` (or id) as returned by the API
+
+            :raises peerplays.exceptions.AccountDoesNotExistsException: if
+                the account does not exist
+        """
+        return self._resolve("account", name)
+
+    def asset(self, symbol):
+        """ The asset ``symbol`` (or id) as returned by the API
+
+            :raises peerplays.exceptions.AssetDoesNotExistsException: if
+                the asset does not exist
+        """
+        return self._resolve("asset", symbol)
+
+    def account_id(self, account):
+        """ Id of the account ``account`` (name, id or object)
+        """
+        if not account:
+            raise ValueError("You need to provide an account")
+        return self._id(account, "1.2.", self.account)
+
+    def asset_id(self, asset):
+        """ Id of the asset ``asset`` (symbol, id or object)
+        """
+        return self._id(asset, "1.3.", self.asset)
+
+    def _id(self, identifier, space_type, resolve):
+        if isinstance(identifier, dict):
+            return identifier["id"]
+        if identifier.startswith(space_type) and identifier[4:].isdigit():
+            return identifier
+        return resolve(identifier)["id"]
+
+    def _resolve(self, kind, identifier):
+        key = (kind, identifier)
+        now = time.time()
+        with self._lock:
+            cached = self._objects.get(key)
+        if cached and cached[1] > now:
+            return cached[0]
+
+        rpc = self.blockchain.rpc
+        if kind == "account":
+            data = rpc.get_account(identifier)
+            if not data:
+                raise AccountDoesNotExistsException(identifier)
+        else:
+            data = rpc.get_asset(identifier)
+            if not data:
+                raise AssetDoesNotExistsException(identifier)
+
+        with self._lock:
+            self._objects[key] = (data, now + self.ttl)
+            self._keys.setdefault(data["id"], set()).add(key)
+        # Later lookups by id (e.g. of the signing account) hit the cache
+        self.blockchain.blockchainobject_class._cache[data["id"]] = data
+        return data
+
+    def invalidate(self, identifier=None):
+        """ Drop the object with the name, symbol or id ``identifier``
+            (or all objects) from the cache
+        """
+        with self._lock:
+            if identifier is None:
+                self._objects.clear()
+                self._keys.clear()
+                return
+            keys = self._keys.pop(identifier, set())
+            keys |= {x for x in self._objects if x[1] == identifier}
+            for key in keys:
+                data, _ = self._objects.pop(key, (None, None))
+                if data:
+                    self._keys.pop(data["id"], None)
+
+    def process_notice(self, notice):
+        """ Drop the objects that a notice reports as changed or removed
+        """
+        if isinstance(notice, dict):
+            notice = notice.get("id")
+        if notice in self._keys:
+            self.invalidate(notice)
@@ -0,0 +1,166 @@
+import hashlib
+import logging
+import threading
+import time
+from binascii import hexlify
+from calendar import timegm
+from concurrent.futures import Future
+from peerplaysapi.exceptions import RPCError, decodeRPCErrorMsg
+from peerplaysapi.websocket import PeerPlaysWebsocket
+from peerplaysbase.serializer import encode_transaction
+from .exceptions import TransactionExpired
+from .instance import BlockchainInstance
+
+log = logging.getLogger(__name__)
+
+timeformat = "%Y-%m-%dT%H:%M:%S%Z"
+
+
+def transaction_id(tx, prefix="PPY"):
+    """ Id of a transaction given as dictionary
+    """
+    digest = hashlib.sha256(encode_transaction(tx, prefix=prefix, signed=False))
+    return hexlify(digest.digest()[:20]).decode("ascii")
+
+
+@BlockchainInstance.inject
+class BroadcastQueue:
+    """ Broadcast transactions back to back and track their inclusion
+
+        Transactions are broadcast with ``broadcast_transaction_with_callback``
+        over a websocket connection of its own and without waiting for
+        previous transactions to be included. Every submitted transaction
+        is represented by a :class:`concurrent.futures.Future` that
+        resolves once the transaction has been included in a block, or
+        fails if the node rejected it (``RPCError``) or if it expired
+        (:class:`peerplays.exceptions.TransactionExpired`). Expiration is
+        checked whenever a new block is announced.
+
+        :param peerplaysapi.websocket.PeerPlaysWebsocket websocket: Use this
+            websocket instead of opening a new connection
+        :param int grace: Seconds to wait for a confirmation after the
+            expiration of a transaction (defaults to ``10``)
+        :param instance blockchain_instance: Blockchain instance
+
+        .. code-block:: python
+
+            from peerplays.broadcast import BroadcastQueue
+
+            queue = BroadcastQueue()
+            futures = [queue.submit(tx) for tx in signed_transactions]
+            for future in futures:
+                print(future.result()["block_num"])
+            queue.close()
+
+        A confirmation is only received on the connection that broadcast
+        the transaction. Transactions that are in flight while the
+        connection is lost will therefore expire.
+    """
+
+    def __init__(self, websocket=None, grace=10, **kwargs):
+        self.grace = grace
+        self.pending = dict()
+        self.requests = dict()
+        self.lock = threading.Lock()
+        self.thread = None
+        if websocket is None:
+            websocket = PeerPlaysWebsocket.for_rpc(self.blockchain.rpc)
+        self.websocket = websocket
+        self.websocket.on_block += self.process_block
+        self.websocket.on_broadcast += self.process_confirmation
+        self.websocket.on_response += self.process_response
+
+    def __len__(self):
+        return len(self.pending)
+
+    def start(self, timeout=None):
+        """ Connect the websocket in a background thread (if it is not
+            connected already)
+        """
+        if self.thread is None and not self.websocket.connected.is_set():
+            self.thread = threading.Thread(
+                target=self.websocket.run_forever, name="broadcast"
+            )
+            self.thread.daemon = True
+            self.thread.start()
+        if not self.websocket.connected.wait(timeout):
+            raise TimeoutError("Could not connect to the node")
+
+    def close(self):
+        """ Close the connection. Pending transactions stay pending.
+        """
+        self.websocket.close()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def submit(self, tx):
+        """ Broadcast a signed transaction
+
+            :param tx: Signed transaction as dictionary or
+                :class:`peerplays.transactionbuilder.TransactionBuilder`
+                (which is signed if necessary and cleared)
+            :returns: Future for the confirmation, e.g.
+                ``{"id": ..., "block_num": ..., "trx_num": ..., "trx": ...}``
+            :rtype: concurrent.futures.Future
+        """
+        if hasattr(tx, "broadcast"):
+            txbuffer = tx
+            if not txbuffer._is_signed():
+                txbuffer.sign()
+            tx = txbuffer.json()
+            txbuffer.clear()
+        tx = dict(tx)
+
+        future = Future()
+        future.tx_id = transaction_id(tx, prefix=self.blockchain.prefix)
+        expiration = timegm(time.strptime(tx["expiration"] + "UTC", timeformat))
+
+        self.start()
+        with self.lock:
+            self.pending[future.tx_id] = (future, expiration)
+            request_id = self.websocket.broadcast_transaction_with_callback(
+                self.websocket.__events__.index("on_broadcast"),
+                tx,
+                api_id="network_broadcast",
+            )
+            self.requests[request_id] = future.tx_id
+        return future
+
+    def process_confirmation(self, confirmation):
+        """ The transaction ``confirmation["id"]`` has been included
+        """
+        with self.lock:
+            pending = self.pending.pop(confirmation["id"], None)
+        if pending:
+            pending[0].set_result(confirmation)
+
+    def process_response(self, response):
+        """ The node accepted or rejected a transaction
+        """
+        with self.lock:
+            tx_id = self.requests.pop(response["id"], None)
+            if tx_id is None or "error" not in response:
+                return
+            pending = self.pending.pop(tx_id, None)
+        if pending:
+            error = response["error"]
+            pending[0].set_exception(
+                RPCError(decodeRPCErrorMsg(error.get("message", error)))
+            )
+
+    def process_block(self, block_id):
+        """ Fail the transactions that can no longer be included
+        """
+        now = time.time()
+        with self.lock:
+            expired = [
+                tx_id
+                for tx_id, (_, expiration) in self.pending.items()
+                if expiration + self.grace < now
+            ]
+            expired = [(tx_id, self.pending.pop(tx_id)[0]) for tx_id in expired]
+        for tx_id, future in expired:
+            future.set_exception(
+                TransactionExpired("Transaction {} expired".format(tx_id))
+            )
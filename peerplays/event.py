@@ -15,10 +15,10 @@ class Event(BlockchainObject):
     type_id = 22
 
     def refresh(self):
-        data = self.blockchain.rpc.get_object(self.identifier)
+        data = self.blockchain.objectloader.load(self.identifier)
         if not data:
             raise EventDoesNotExistException(self.identifier)
-        super(Event, self).__init__(data)
+        super(Event, self).__init__(data, blockchain_instance=self.blockchain)
         self.cached = True
 
     @property
@@ -15,10 +15,10 @@ class EventGroup(BlockchainObject):
     type_id = 21
 
     def refresh(self):
-        data = self.blockchain.rpc.get_object(self.identifier)
+        data = self.blockchain.objectloader.load(self.identifier)
         if not data:
             raise EventGroupDoesNotExistException(self.identifier)
-        super(EventGroup, self).__init__(data)
+        super(EventGroup, self).__init__(data, blockchain_instance=self.blockchain)
         self.cached = True
 
     @property
@@ -135,3 +135,17 @@ class GenesisBalanceDoesNotExistsException(Exception):
     """
 
     pass
+
+
+class BlockStoreIntegrityError(Exception):
+    """ A stored block does not match the block ids of the chain
+    """
+
+    pass
+
+
+class TransactionExpired(Exception):
+    """ The transaction expired before it was included in a block
+    """
+
+    pass
@@ -1,8 +1,10 @@
+import os
 import logging
 from events import Events
 from peerplaysapi.websocket import PeerPlaysWebsocket
 from peerplays.instance import shared_peerplays_instance
 from peerplays.account import Account, AccountUpdate
+from peerplays.blockchain import Blockchain
 log = logging.getLogger(__name__)
 # logging.basicConfig(level=logging.DEBUG)
 
@@ -12,10 +14,31 @@ class Notify(Events):
 
         :param list accounts: Account names/ids to be notified about when changing
         :param list objects: Object ids to be notified about when changed
+            (or a dictionary that maps object ids to their own callbacks)
         :param fnt on_tx: Callback that will be called for each transaction received
         :param fnt on_block: Callback that will be called for each block received
         :param fnt on_account: Callback that will be called for changes of the listed accounts
         :param peerplays.peerplays.PeerPlays peerplays_instance: PeerPlays instance
+        :param peerplaysapi.dispatcher.Dispatcher dispatcher: Call the
+            callbacks from a dispatcher instead of the websocket's thread
+        :param bool coalesce: Only notify about the latest state of changed
+            objects and accounts once per block
+        :param int start_block: Resume after this block number
+        :param str checkpoint: File that stores the number of the last
+            processed block. Notify resumes after it when restarted.
+
+        Notify keeps track of the last block it handed to ``on_block``.
+        Blocks that have been missed (e.g. while reconnecting) are fetched
+        and handed to ``on_block`` before the next live block, and blocks
+        are not handed over twice by the same instance.
+
+        Delivery is **at-least-once**: the checkpoint is stored after the
+        callback returned, so a block whose callback was interrupted (or
+        whose checkpoint could not be written) is handed over again after
+        a restart. Handlers need to be idempotent, e.g. by storing
+        :attr:`current_block` (the number of the block being handed over)
+        together with their own results and skipping blocks they have
+        already processed.
 
         **Example**
 
@@ -51,6 +74,10 @@ class Notify(Events):
         on_block=None,
         on_account=None,
         peerplays_instance=None,
+        dispatcher=None,
+        coalesce=False,
+        start_block=None,
+        checkpoint=None,
     ):
         # Events
         super(Notify, self).__init__()
@@ -68,6 +95,15 @@ class Notify(Events):
             )
             account_ids.append(account["id"])
 
+        # Block tracking
+        self.checkpoint = checkpoint
+        self.last_block = start_block
+        self.current_block = None
+        if checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as fp:
+                self.last_block = int(fp.read().strip())
+        track_blocks = on_block or checkpoint or start_block is not None
+
         # Callbacks
         if on_tx:
             self.on_tx += on_tx
@@ -79,16 +115,16 @@ class Notify(Events):
             self.on_account += on_account
 
         # Open the websocket
-        self.websocket = PeerPlaysWebsocket(
-            urls=self.peerplays.rpc.urls,
-            user=self.peerplays.rpc.user,
-            password=self.peerplays.rpc.password,
+        self.websocket = PeerPlaysWebsocket.for_rpc(
+            self.peerplays.rpc,
             accounts=account_ids,
             objects=objects,
             on_tx=on_tx,
             on_object=on_object,
-            on_block=on_block,
+            on_block=self.process_block if track_blocks else None,
             on_account=self.process_account,
+            dispatcher=dispatcher,
+            coalesce_notices=coalesce,
         )
 
     def process_account(self, message):
@@ -100,6 +136,45 @@ class Notify(Events):
             blockchain_instance=self.blockchain
         ))
 
+    def process_block(self, block_id):
+        """ Hand new blocks over to ``on_block``. Missed blocks are
+            backfilled first while blocks that have already been processed
+            are ignored.
+        """
+        # The block number is encoded in the first 4 bytes of the block id
+        block_num = int(block_id[:8], 16)
+        if self.last_block is not None:
+            if block_num <= self.last_block:
+                log.debug("Ignoring block %d, it has been processed already", block_num)
+                return
+            if block_num > self.last_block + 1:
+                self.backfill(self.last_block + 1, block_num)
+        self.emit_block(block_num, block_id)
+
+    def backfill(self, start, stop):
+        """ Hand the blocks ``start`` to ``stop - 1`` over to ``on_block``
+        """
+        log.info("Backfilling blocks %d to %d", start, stop - 1)
+        blockchain = Blockchain(mode="head", blockchain_instance=self.peerplays)
+        # The id of a block is found in its successor
+        for block in blockchain.block_range(start + 1, stop):
+            self.emit_block(block["block_num"] - 1, block["previous"])
+
+    def emit_block(self, block_num, block_id):
+        self.current_block = block_num
+        self.on_block(block_id)
+        self.last_block = block_num
+        if self.checkpoint:
+            self.store_checkpoint()
+
+    def store_checkpoint(self):
+        """ Atomically store the number of the last processed block
+        """
+        tmp = self.checkpoint + ".tmp"
+        with open(tmp, "w") as fp:
+            fp.write(str(self.last_block))
+        os.replace(tmp, self.checkpoint)
+
     def listen(self):
         """ This call initiates the listening/notification process. It
             behaves similar to ``run_forever()``.
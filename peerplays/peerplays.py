@@ -1,4 +1,5 @@
 import logging
+import time
 
 from datetime import datetime
 
@@ -7,6 +8,8 @@ from graphenecommon.chain import AbstractGrapheneChain
 from peerplaysapi.node import PeerPlaysNodeRPC
 from peerplaysbase.account import PublicKey
 from peerplaysbase import operations
+from peerplaysbase.fees import FeeSchedule
+from peerplaysbase.signedtransactions import Signed_Transaction
 
 from .asset import Asset
 from .account import Account
@@ -21,10 +24,15 @@ from .bettingmarketgroup import BettingMarketGroup
 from .bettingmarket import BettingMarket
 from .bet import Bet
 from .genesisbalance import GenesisBalance
-from .exceptions import AccountExistsException, MissingKeyError, KeyAlreadyInStoreException
+from .exceptions import (
+    AccountExistsException,
+    BettingMarketDoesNotExistException,
+    MissingKeyError,
+    KeyAlreadyInStoreException,
+)
 from .wallet import Wallet
-from .transactionbuilder import TransactionBuilder, ProposalBuilder
-from .utils import formatTime, test_proposal_in_buffer
+from .transactionbuilder import TransactionBuilder, ProposalBuilder, TransactionBatcher
+from .utils import formatTime, parse_time, scale_to_int, test_proposal_in_buffer
 log = logging.getLogger(__name__)
 
 
@@ -54,6 +62,16 @@ class PeerPlays(AbstractGrapheneChain):
             "irrversible")
         :param bool bundle: Do not broadcast transactions right away, but allow
             to bundle operations *(optional)*
+        :param bool autobatch: Pack operations into as few transactions as
+            possible, see :meth:`flush` *(optional)*
+        :param int autobatch_max_ops: Maximum number of operations per
+            transaction with ``autobatch`` *(optional)*
+        :param float autobatch_interval: Broadcast operations queued with
+            ``autobatch`` after this many seconds, checked when operations
+            are added and by ``batcher.poll()`` *(optional)*
+        :param bool local_fees: Compute the fees of operations from the
+            cached fee schedule (see :attr:`fee_schedule`) instead of
+            querying the API for every transaction *(optional)*
 
         Three wallet operation modes are possible:
 
@@ -109,6 +127,17 @@ class PeerPlays(AbstractGrapheneChain):
         This class also deals with edits, votes and reading content.
     """
 
+    def __init__(self, *args, **kwargs):
+        self.autobatch = bool(kwargs.pop("autobatch", False))
+        self.autobatch_max_ops = kwargs.pop("autobatch_max_ops", None)
+        self.autobatch_interval = kwargs.pop("autobatch_interval", None)
+        self._batcher = None
+        self.local_fees = bool(kwargs.pop("local_fees", False))
+        self._fee_schedule = None
+        self._global_properties = None
+        self._next_maintenance = None
+        super().__init__(*args, **kwargs)
+
     def define_classes(self):
         from .blockchainobject import BlockchainObject
 
@@ -120,41 +149,240 @@ class PeerPlays(AbstractGrapheneChain):
         self.transactionbuilder_class = TransactionBuilder
         self.blockchainobject_class = BlockchainObject
 
+    # -------------------------------------------------------------------------
+    # Object loading
+    # -------------------------------------------------------------------------
+    @property
+    def objectloader(self):
+        """ The :class:`peerplays.blockchainobject.ObjectLoader` that
+            coalesces object lookups of this instance
+        """
+        from .blockchainobject import ObjectLoader
+
+        if not getattr(self, "_objectloader", None):
+            self._objectloader = ObjectLoader(blockchain_instance=self)
+        return self._objectloader
+
+    def prefetch(self, ids=[]):
+        """ Fetch objects in bulk instead of one ``get_object`` call per
+            object. Within the returned context, lazy objects register their
+            ids and are loaded together with the next object that is
+            actually needed.
+
+            :param list ids: Object ids to fetch with the next lookup
+
+            .. code-block:: python
+
+                with peerplays.prefetch(event_ids):
+                    events = [Event(x) for x in event_ids]
+                    groups = [EventGroup(x, lazy=True) for x in group_ids]
+                    # one call for all groups
+                    names = [g["name"] for g in groups]
+        """
+        self.objectloader.want(ids)
+        return self.objectloader
+
+    # -------------------------------------------------------------------------
+    # Name resolution
+    # -------------------------------------------------------------------------
+    @property
+    def namecache(self):
+        """ The :class:`peerplays.blockchainobject.NameCache` that resolves
+            account names and asset symbols for the operation builders of
+            this instance
+        """
+        from .blockchainobject import NameCache
+
+        if not getattr(self, "_namecache", None):
+            self._namecache = NameCache(blockchain_instance=self)
+        return self._namecache
+
+    def resolve_account(self, account=None):
+        """ Id of an account given by name or id (defaults to
+            ``default_account``). Ids are taken as they are, names are
+            resolved through :attr:`namecache`.
+        """
+        if not account:
+            if "default_account" in self.config:
+                account = self.config["default_account"]
+        if not account:
+            raise ValueError("You need to provide an account")
+        return self.namecache.account_id(account)
+
+    # -------------------------------------------------------------------------
+    # Block storage
+    # -------------------------------------------------------------------------
+    @property
+    def blockstore(self):
+        """ The :class:`peerplays.storage.SqliteBlockStore` used by
+            :class:`peerplays.block.Block` and
+            :meth:`peerplays.blockchain.Blockchain.block_range` (if any)
+        """
+        return getattr(self, "_blockstore", None)
+
+    def use_blockstore(self, blockstore=None, **kwargs):
+        """ Store irreversible blocks locally so that they are fetched
+            from the API only once
+
+            :param peerplays.storage.SqliteBlockStore blockstore: Store to
+                use (defaults to a new store, ``kwargs`` are handed over)
+        """
+        from .storage import SqliteBlockStore
+
+        self._blockstore = blockstore or SqliteBlockStore(**kwargs)
+        return self._blockstore
+
+    # -------------------------------------------------------------------------
+    # Reference blocks
+    # -------------------------------------------------------------------------
+    @property
+    def tapos(self):
+        """ The :class:`peerplays.tapos.TaposCache` that provides the
+            reference block of new transactions (if any)
+        """
+        return getattr(self, "_tapos", None)
+
+    def use_tapos_cache(self, tapos=None, **kwargs):
+        """ Take the reference block of new transactions and the global
+            properties from a cache that is updated by block notices
+            instead of querying the API for every transaction
+
+            :param peerplays.tapos.TaposCache tapos: Cache to use (defaults
+                to a new cache, ``kwargs`` are handed over)
+        """
+        from .tapos import TaposCache
+
+        self._tapos = tapos or TaposCache(blockchain_instance=self, **kwargs)
+        self._tapos.start()
+        return self._tapos
+
+    # -------------------------------------------------------------------------
+    # Chain parameters
+    # -------------------------------------------------------------------------
+    @property
+    def chain_params(self):
+        """ Parameters of the connected chain as
+            :class:`peerplaysbase.signedtransactions.ChainParameters`, i.e.
+            with the chain id decoded once for all transactions signed by
+            this instance
+        """
+        params = self.rpc.chain_params
+        cached = getattr(self, "_chain_params", None)
+        if cached is None or cached["chain_id"] != params["chain_id"]:
+            self._chain_params = Signed_Transaction.resolve_chain(params)
+        return self._chain_params
+
+    # -------------------------------------------------------------------------
+    # Fees
+    # -------------------------------------------------------------------------
+    def cached_global_properties(self):
+        """ The global properties of the :class:`peerplays.tapos.TaposCache`
+            (if any), otherwise fetched once per maintenance interval
+        """
+        tapos = self.tapos
+        if tapos is not None and tapos.global_properties:
+            return tapos.global_properties
+        if self._global_properties is None or time.time() >= self._next_maintenance:
+            dynamic = self.rpc.get_dynamic_global_properties()
+            self._global_properties = self.rpc.get_global_properties()
+            self._next_maintenance = parse_time(
+                dynamic["next_maintenance_time"]
+            ).timestamp()
+        return self._global_properties
+
+    @property
+    def fee_schedule(self):
+        """ The current :class:`peerplaysbase.fees.FeeSchedule`
+
+            The committee can only change the fee schedule at a maintenance
+            interval, so the schedule is parsed again only once the global
+            properties have been refreshed (see
+            :meth:`cached_global_properties`).
+        """
+        properties = self.cached_global_properties()
+        if self._fee_schedule is None or self._fee_schedule.source is not properties:
+            self._fee_schedule = FeeSchedule(properties["parameters"]["current_fees"])
+            self._fee_schedule.source = properties
+        return self._fee_schedule
+
+    # -------------------------------------------------------------------------
+    # Automatic batching
+    # -------------------------------------------------------------------------
+    @property
+    def batcher(self):
+        """ The :class:`peerplays.transactionbuilder.TransactionBatcher`
+            that packs operations if ``autobatch`` is enabled
+        """
+        if self._batcher is None:
+            self._batcher = TransactionBatcher(
+                self,
+                max_ops=self.autobatch_max_ops,
+                interval=self.autobatch_interval,
+            )
+        return self._batcher
+
+    def finalizeOp(self, ops, account, permission, **kwargs):
+        """ Like :meth:`graphenecommon.chain.AbstractGrapheneChain.finalizeOp`
+            but with ``autobatch`` enabled, operations are packed into as
+            few transactions as possible. In that case, the results of the
+            transactions that were broadcast by this call are returned
+            (if any) and :meth:`flush` broadcasts the remaining operations.
+        """
+        if (
+            self.autobatch
+            and not kwargs.get("append_to")
+            and not self.proposer
+            and not self.unsigned
+            and not self.bundle
+        ):
+            return self.batcher.append(
+                ops, account, permission, fee_asset=kwargs.get("fee_asset")
+            )
+        return super().finalizeOp(ops, account, permission, **kwargs)
+
+    def flush(self):
+        """ Broadcast the operations queued due to ``autobatch``
+
+            :returns: Results of the broadcast transactions
+        """
+        if self._batcher is None:
+            return []
+        return self._batcher.flush()
+
     # -------------------------------------------------------------------------
     # Simple Transfer
     # -------------------------------------------------------------------------
     def transfer(self, to, amount, asset, memo="", account=None, **kwargs):
         """ Transfer an asset to another account.
 
-            :param str to: Recipient
+            :param str to: Recipient (name or id)
             :param float amount: Amount to transfer
-            :param str asset: Asset to transfer
+            :param str asset: Asset to transfer (symbol or id)
             :param str memo: (optional) Memo, may begin with `#` for encrypted
                 messaging
             :param str account: (optional) the source account for the transfer
-                if not ``default_account``
+                (name or id) if not ``default_account``
         """
         from .memo import Memo
 
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-
-        account = Account(account, blockchain_instance=self)
+        account = self.resolve_account(account)
+        to = self.namecache.account_id(to)
+        asset = Asset(self.namecache.asset(asset), blockchain_instance=self)
         amount = Amount(amount, asset, blockchain_instance=self)
-        to = Account(to, blockchain_instance=self)
 
-        memoObj = Memo(from_account=account, to_account=to, blockchain_instance=self)
+        if memo:
+            memoObj = Memo(
+                from_account=account, to_account=to, blockchain_instance=self
+            )
+            memo = memoObj.encrypt(memo)
 
         op = operations.Transfer(
             **{
                 "fee": {"amount": 0, "asset_id": "1.3.0"},
-                "from": account["id"],
-                "to": to["id"],
+                "from": account,
+                "to": to,
                 "amount": {"amount": int(amount), "asset_id": amount.asset["id"]},
-                "memo": memoObj.encrypt(memo),
+                "memo": memo or None,
                 "prefix": self.prefix,
             }
         )
@@ -241,8 +469,8 @@ class PeerPlays(AbstractGrapheneChain):
         except:
             pass
 
-        referrer = Account(referrer, blockchain_instance=self)
-        registrar = Account(registrar, blockchain_instance=self)
+        referrer = self.namecache.account_id(referrer)
+        registrar = self.namecache.account_id(registrar)
 
         " Generate new keys from password"
         from peerplaysbase.account import PasswordKey, PublicKey
@@ -290,21 +518,17 @@ class PeerPlays(AbstractGrapheneChain):
             active_key_authority.append([k, 1])
 
         for k in additional_owner_accounts:
-            addaccount = Account(k, blockchain_instance=self)
-            owner_accounts_authority.append([addaccount["id"], 1])
+            owner_accounts_authority.append([self.namecache.account_id(k), 1])
         for k in additional_active_accounts:
-            addaccount = Account(k, blockchain_instance=self)
-            active_accounts_authority.append([addaccount["id"], 1])
+            active_accounts_authority.append([self.namecache.account_id(k), 1])
 
         # voting account
-        voting_account = Account(
-            proxy_account or "proxy-to-self", blockchain_instance=self
-        )
+        voting_account = self.namecache.account_id(proxy_account or "proxy-to-self")
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "registrar": registrar["id"],
-            "referrer": referrer["id"],
+            "registrar": registrar,
+            "referrer": referrer,
             "referrer_percent": int(referrer_percent * 100),
             "name": account_name,
             "owner": {
@@ -321,7 +545,7 @@ class PeerPlays(AbstractGrapheneChain):
             },
             "options": {
                 "memo_key": memo,
-                "voting_account": voting_account["id"],
+                "voting_account": voting_account,
                 "num_witness": 0,
                 "num_committee": 0,
                 "votes": [],
@@ -339,21 +563,16 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
+        account = self.resolve_account(account)
         op = operations.Account_upgrade(
             **{
                 "fee": {"amount": 0, "asset_id": "1.3.0"},
-                "account_to_upgrade": account["id"],
+                "account_to_upgrade": account,
                 "upgrade_to_lifetime_member": True,
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def _test_weights_treshold(self, authority):
         """ This method raises an error if the threshold of an authority cannot
@@ -398,15 +617,9 @@ class PeerPlays(AbstractGrapheneChain):
         """
         from copy import deepcopy
 
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-
         if permission not in ["owner", "active"]:
             raise ValueError("Permission needs to be either 'owner', or 'active")
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
 
         if not weight:
             weight = account[permission]["weight_threshold"]
@@ -417,8 +630,8 @@ class PeerPlays(AbstractGrapheneChain):
             authority["key_auths"].append([str(pubkey), weight])
         except Exception:
             try:
-                foreign_account = Account(foreign, blockchain_instance=self)
-                authority["account_auths"].append([foreign_account["id"], weight])
+                foreign_account = self.namecache.account_id(foreign)
+                authority["account_auths"].append([foreign_account, weight])
             except Exception:
                 raise ValueError("Unknown foreign account or invalid public key")
         if threshold:
@@ -453,15 +666,9 @@ class PeerPlays(AbstractGrapheneChain):
             :param int threshold: The threshold that needs to be reached
                 by signatures to be able to interact
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-
         if permission not in ["owner", "active"]:
             raise ValueError("Permission needs to be either 'owner', or 'active")
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
         authority = account[permission]
 
         try:
@@ -474,16 +681,15 @@ class PeerPlays(AbstractGrapheneChain):
             )
         except:
             try:
-                foreign_account = Account(foreign, blockchain_instance=self)
+                foreign_account = self.namecache.account_id(foreign)
                 affected_items = list(
                     filter(
-                        lambda x: x[0] == foreign_account["id"],
-                        authority["account_auths"],
+                        lambda x: x[0] == foreign_account, authority["account_auths"]
                     )
                 )
                 authority["account_auths"] = list(
                     filter(
-                        lambda x: x[0] != foreign_account["id"],
+                        lambda x: x[0] != foreign_account,
                         authority["account_auths"],
                     )
                 )
@@ -532,15 +738,9 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-
         PublicKey(key, prefix=self.prefix)
 
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
         account["options"]["memo_key"] = key
         op = operations.Account_update(
             **{
@@ -563,12 +763,7 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
         options = account["options"]
 
         if not isinstance(witnesses, (list, set, tuple)):
@@ -601,12 +796,7 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
         options = account["options"]
 
         if not isinstance(witnesses, (list, set, tuple)):
@@ -640,12 +830,7 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
         options = account["options"]
 
         if not isinstance(committees, (list, set, tuple)):
@@ -678,12 +863,7 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
         options = account["options"]
 
         if not isinstance(committees, (list, set, tuple)):
@@ -719,17 +899,14 @@ class PeerPlays(AbstractGrapheneChain):
         """
         from .proposal import Proposal
 
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
         is_key = approver and approver[:3] == self.prefix
         if not approver and not is_key:
             approver = account
         elif approver and not is_key:
-            approver = Account(approver, blockchain_instance=self)
+            approver = Account(
+                self.namecache.account_id(approver), blockchain_instance=self
+            )
         else:
             approver = PublicKey(approver)
 
@@ -764,16 +941,13 @@ class PeerPlays(AbstractGrapheneChain):
         """
         from .proposal import Proposal
 
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
+        account = Account(self.resolve_account(account), blockchain_instance=self)
         if not approver:
             approver = account
         else:
-            approver = Account(approver, blockchain_instance=self)
+            approver = Account(
+                self.namecache.account_id(approver), blockchain_instance=self
+            )
 
         if not isinstance(proposal_ids, (list, set, tuple)):
             proposal_ids = {proposal_ids}
@@ -794,31 +968,29 @@ class PeerPlays(AbstractGrapheneChain):
             )
         return self.finalizeOp(op, account["name"], "active", **kwargs)
 
-    
-    def deleteproposal(
-        self, proposal_id, account=None, **kwargs
-    ):
 
+    def deleteproposal(self, proposal_id, account=None, **kwargs):
+        """ Delete a proposal
+
+            :param str proposal_id: Id of the proposal
+            :param str account: (optional) the account that pays the fee
+                (defaults to ``default_account``)
+        """
         from .proposal import Proposal
-        if not account:
-            if "default_account" in config:
-                account = config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
 
+        account = self.resolve_account(account)
         proposal = Proposal(proposal_id, blockchain_instance=self)
-        using_owner_authority = False
 
-        op = operations.Proposal_delete(**{
-            "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "fee_paying_account": account["id"],
-            "using_owner_authority": using_owner_authority,
-            "proposal": proposal_id,
-            "prefix": self.prefix
-        })
-
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        op = operations.Proposal_delete(
+            **{
+                "fee": {"amount": 0, "asset_id": "1.3.0"},
+                "fee_paying_account": account,
+                "using_owner_authority": False,
+                "proposal": proposal["id"],
+                "prefix": self.prefix,
+            }
+        )
+        return self.finalizeOp(op, account, "active", **kwargs)
    
     # -------------------------------------------------------------------------
     # Bookie related calls
@@ -832,12 +1004,7 @@ class PeerPlays(AbstractGrapheneChain):
                 to (defaults to ``default_account``)
         """
         assert isinstance(names, list)
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         op = operations.Sport_create(
             **{
                 "fee": {"amount": 0, "asset_id": "1.3.0"},
@@ -845,7 +1012,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def sport_update(self, sport_id, names=[], account=None, **kwargs):
         """ Update a sport. This needs to be **proposed**.
@@ -857,12 +1024,7 @@ class PeerPlays(AbstractGrapheneChain):
                 to (defaults to ``default_account``)
         """
         assert isinstance(names, list)
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         sport = Sport(sport_id)
         op = operations.Sport_update(
             **{
@@ -872,7 +1034,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def sport_delete(self, sport_id="0.0.0", account=None, **kwargs):
 
@@ -883,13 +1045,7 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) Account used to verify the operation
         """
 
-        if not account:
-            if "default_account" in config:
-                account = config["default_account"]
-            if not account:
-                raise ValueError("You need to provide an account")
-
-        account = Account(account)
+        account = self.resolve_account(account)
         sport = Sport(sport_id)
         op = operations.Sport_delete(
             **{
@@ -899,7 +1055,7 @@ class PeerPlays(AbstractGrapheneChain):
             }
         )
 
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def event_group_create(self, names, sport_id="0.0.0", account=None, **kwargs):
         """ Create an event group. This needs to be **proposed**.
@@ -912,11 +1068,7 @@ class PeerPlays(AbstractGrapheneChain):
                 to (defaults to ``default_account``)
         """
         assert isinstance(names, list)
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
+        account = self.resolve_account(account)
         if sport_id[0] == "1":
             # Test if object exists
             Sport(sport_id)
@@ -925,7 +1077,6 @@ class PeerPlays(AbstractGrapheneChain):
             test_proposal_in_buffer(
                 kwargs.get("append_to", self.propbuffer), "sport_create", sport_id
             )
-        account = Account(account)
         op = operations.Event_group_create(
             **{
                 "fee": {"amount": 0, "asset_id": "1.3.0"},
@@ -934,7 +1085,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def event_group_update(
         self, event_group_id, names=[], sport_id="0.0.0", account=None, **kwargs
@@ -950,11 +1101,7 @@ class PeerPlays(AbstractGrapheneChain):
                 to (defaults to ``default_account``)
         """
         assert isinstance(names, list)
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
+        account = self.resolve_account(account)
         if sport_id[0] == "1":
             # Test if object exists
             Sport(sport_id)
@@ -963,7 +1110,6 @@ class PeerPlays(AbstractGrapheneChain):
             test_proposal_in_buffer(
                 kwargs.get("append_to", self.propbuffer), "sport_create", sport_id
             )
-        account = Account(account)
         event_group = EventGroup(event_group_id)
         op = operations.Event_group_update(
             **{
@@ -974,7 +1120,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def eventgroup_delete(self, event_group_id="0.0.0", account=None, **kwargs):
         """ Delete an eventgroup. This needs to be **propose**.
@@ -982,12 +1128,7 @@ class PeerPlays(AbstractGrapheneChain):
             :param str event_group_id: ID of the event group to be deleted
 
             :param str account: (optional) Account used to verify the operation"""
-        if not account:
-            if "default_account" in config:
-                account = config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an Account")
-        account = Account(account)
+        account = self.resolve_account(account)
         eventgroup = EventGroup(event_group_id)
 
         op = operations.Event_group_delete(
@@ -997,7 +1138,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def event_create(
         self, name, season, start_time, event_group_id="0.0.0", account=None, **kwargs
@@ -1018,12 +1159,7 @@ class PeerPlays(AbstractGrapheneChain):
         assert isinstance(
             start_time, datetime
         ), "start_time needs to be a `datetime.datetime`"
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         if event_group_id[0] == "1":
             # Test if object exists
             EventGroup(event_group_id)
@@ -1044,7 +1180,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def event_update(
         self,
@@ -1075,12 +1211,7 @@ class PeerPlays(AbstractGrapheneChain):
         assert isinstance(
             start_time, datetime
         ), "start_time needs to be a `datetime.datetime`"
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         event = Event(event_id)
         op_data = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
@@ -1114,7 +1245,7 @@ class PeerPlays(AbstractGrapheneChain):
             op_data.update({"new_status": status})
 
         op = operations.Event_update(**op_data)
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def event_update_status(self, event_id, status, scores=[], account=None, **kwargs):
         """ Update the status of an event. This needs to be **proposed**.
@@ -1126,12 +1257,7 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         event = Event(event_id)
 
         # Do not try to update status of it doesn't change it on the chain
@@ -1147,7 +1273,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def betting_market_rules_create(self, names, descriptions, account=None, **kwargs):
         """ Create betting market rules
@@ -1162,12 +1288,7 @@ class PeerPlays(AbstractGrapheneChain):
         """
         assert isinstance(names, list)
         assert isinstance(descriptions, list)
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         op = operations.Betting_market_rules_create(
             **{
                 "fee": {"amount": 0, "asset_id": "1.3.0"},
@@ -1176,7 +1297,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def betting_market_rules_update(
         self, rules_id, names, descriptions, account=None, **kwargs
@@ -1194,12 +1315,7 @@ class PeerPlays(AbstractGrapheneChain):
         """
         assert isinstance(names, list)
         assert isinstance(descriptions, list)
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         rule = Rule(rules_id)
         op = operations.Betting_market_rules_update(
             **{
@@ -1210,7 +1326,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def betting_market_group_create(
         self,
@@ -1242,13 +1358,8 @@ class PeerPlays(AbstractGrapheneChain):
         """
         if not asset:
             asset = self.rpc.chain_params["core_symbol"]
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
-        asset = Asset(asset, blockchain_instance=self)
+        account = self.resolve_account(account)
+        asset = self.namecache.asset_id(asset)
         if event_id[0] == "1":
             # Test if object exists
             Event(event_id)
@@ -1273,14 +1384,14 @@ class PeerPlays(AbstractGrapheneChain):
                 "description": description,
                 "event_id": event_id,
                 "rules_id": rules_id,
-                "asset_id": asset["id"],
+                "asset_id": asset,
                 "never_in_play": bool(never_in_play),
                 "delay_before_settling": int(delay_before_settling),
                 "resolution_constraint": resolution_constraint,
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def betting_market_group_update(
         self,
@@ -1303,12 +1414,7 @@ class PeerPlays(AbstractGrapheneChain):
             :param str account: (optional) the account to allow access
                 to (defaults to ``default_account``)
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, blockchain_instance=self)
+        account = self.resolve_account(account)
         bmg = BettingMarketGroup(betting_market_group_id)
 
         # Do not try to update status of it doesn't change it on the chain
@@ -1351,7 +1457,7 @@ class PeerPlays(AbstractGrapheneChain):
             op_data.update({"status": status})
 
         op = operations.Betting_market_group_update(**op_data)
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def betting_market_create(
         self, payout_condition, description, group_id="0.0.0", account=None, **kwargs
@@ -1368,12 +1474,7 @@ class PeerPlays(AbstractGrapheneChain):
                 to (defaults to ``default_account``)
         """
         assert isinstance(payout_condition, list)
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         if group_id[0] == "1":
             # Test if object exists
             BettingMarketGroup(group_id)
@@ -1393,7 +1494,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def betting_market_update(
         self,
@@ -1417,12 +1518,7 @@ class PeerPlays(AbstractGrapheneChain):
                 to (defaults to ``default_account``)
         """
         assert isinstance(payout_condition, list)
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         market = BettingMarket(betting_market_id)
         if group_id[0] == "1":
             # Test if object exists
@@ -1444,7 +1540,7 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     def betting_market_resolve(
         self, betting_market_group_id, results, account=None, **kwargs
@@ -1467,12 +1563,7 @@ class PeerPlays(AbstractGrapheneChain):
 
         """
         assert isinstance(results, (list, set, tuple))
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
+        account = self.resolve_account(account)
         # Test if object exists
         BettingMarketGroup(betting_market_group_id)
         op = operations.Betting_market_group_resolve(
@@ -1483,11 +1574,55 @@ class PeerPlays(AbstractGrapheneChain):
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
     # -------------------------------------------------------------------------
     # The betting in bookie
     # -------------------------------------------------------------------------
+    def _validated_id(self, identifier, klass, validate):
+        """ Id of an object of type ``klass`` (e.g. a betting market) that
+            goes into an operation. With ``validate``
+
+            * ``"none"``, the id only needs to be well-formed
+            * ``"cached"``, the object is loaded unless it is cached
+            * ``"remote"``, the object is always loaded from the API
+        """
+        if validate not in ["none", "cached", "remote"]:
+            raise ValueError("validate needs to be 'none', 'cached' or 'remote'")
+        prefix = "1.{}.".format(klass.type_id)
+        if not (
+            isinstance(identifier, str)
+            and identifier.startswith(prefix)
+            and identifier[len(prefix) :].isdigit()
+        ):
+            raise ValueError(
+                "{} is not a valid {} id".format(identifier, klass.__name__)
+            )
+        if validate == "cached":
+            klass(identifier, blockchain_instance=self)
+        elif validate == "remote":
+            klass(identifier, lazy=True, blockchain_instance=self).refresh()
+        return identifier
+
+    def prevalidate(self, ids, refresh=False):
+        """ Verify that many objects exist (e.g. the betting markets of a
+            large set of bets) with as few API calls as possible
+
+            Objects that are not cached are fetched together and stored
+            in the cache, so that operations referring to them can then be
+            built with ``validate="cached"`` without any further lookup.
+
+            :param list ids: Object ids
+            :param bool refresh: Fetch cached objects as well
+            :returns: The ids of the objects that do not exist
+        """
+        cache = self.blockchainobject_class._cache
+        wanted = [x for x in dict.fromkeys(ids) if refresh or x not in cache]
+        if not wanted:
+            return []
+        objects = self.objectloader.fetch(wanted)
+        return [x for x in wanted if not objects.get(x)]
+
     def bet_place(
         self,
         betting_market_id,
@@ -1495,6 +1630,7 @@ class PeerPlays(AbstractGrapheneChain):
         backer_multiplier,
         back_or_lay,
         account=None,
+        validate="cached",
         **kwargs
     ):
         """ Place a bet
@@ -1504,59 +1640,192 @@ class PeerPlays(AbstractGrapheneChain):
             :param peerplays.amount.Amount amount_to_bet: Amount to bet with
             :param int backer_multiplier: Multipler for backer
             :param str back_or_lay: "back" or "lay" the bet
-            :param str account: (optional) the account to bet (defaults
-                        to ``default_account``)
+            :param str account: (optional) the account to bet, name or id
+                (defaults to ``default_account``)
+            :param str validate: (optional) How to make sure the betting
+                market exists: ``"none"`` (only check the id), ``"cached"``
+                (default, load the market unless cached) or ``"remote"``
+                (always ask the API), see :meth:`prevalidate`
         """
         from . import GRAPHENE_BETTING_ODDS_PRECISION
 
         assert isinstance(amount_to_bet, Amount)
         assert back_or_lay in ["back", "lay"]
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
-        bm = BettingMarket(betting_market_id)
+        account = self.resolve_account(account)
+        betting_market_id = self._validated_id(
+            betting_market_id, BettingMarket, validate
+        )
         op = operations.Bet_place(
             **{
                 "fee": {"amount": 0, "asset_id": "1.3.0"},
-                "bettor_id": account["id"],
-                "betting_market_id": bm["id"],
+                "bettor_id": account,
+                "betting_market_id": betting_market_id,
                 "amount_to_bet": amount_to_bet.json(),
                 "backer_multiplier": (
-                    int(backer_multiplier * GRAPHENE_BETTING_ODDS_PRECISION)
+                    int(round(backer_multiplier * GRAPHENE_BETTING_ODDS_PRECISION))
                 ),
                 "back_or_lay": back_or_lay,
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
-    def bet_cancel(self, bet_to_cancel, account=None, **kwargs):
+    def bet_place_many(
+        self, bets, asset=None, account=None, validate="cached", max_ops=None, **kwargs
+    ):
+        """ Place many bets with as few transactions as possible
+
+            :param bets: The bets, either as list of ``(betting_market_id,
+                amount_to_bet, backer_multiplier, back_or_lay)`` tuples or
+                as columns, i.e. a dictionary (or a pandas data frame, or a
+                NumPy record array) with these keys. Columns of numbers may
+                be NumPy arrays.
+            :param str asset: (optional) Asset of the amounts to bet if they
+                are given as numbers rather than
+                :class:`peerplays.amount.Amount`
+            :param str account: (optional) the account to bet, name or id
+                (defaults to ``default_account``)
+            :param str validate: (optional) How to make sure the betting
+                markets exist, see :meth:`bet_place`. Every betting market is
+                checked once, all of them with a single :meth:`prevalidate`.
+            :param int max_ops: (optional) Maximum number of bets per
+                transaction
+            :returns: The broadcast transactions
+
+            The odds of all bets are converted and checked against the
+            chain's ``min_bet_multiplier`` and ``max_bet_multiplier`` in
+            one pass before any operation is built. With ``bundle``,
+            ``autobatch``, a ``proposer`` or ``append_to``, the operations are
+            handed over to :meth:`finalizeOp` instead.
+
+            .. code-block:: python
+
+                peerplays.bet_place_many(
+                    {
+                        "betting_market_id": ["1.25.1", "1.25.2"],
+                        "amount_to_bet": numpy.array([10, 20]),
+                        "backer_multiplier": numpy.array([1.5, 2.25]),
+                        "back_or_lay": ["back", "lay"],
+                    },
+                    asset="1.3.0",
+                )
+
+        """
+        from . import GRAPHENE_BETTING_ODDS_PRECISION
+
+        keys = [
+            "betting_market_id",
+            "amount_to_bet",
+            "backer_multiplier",
+            "back_or_lay",
+        ]
+        # Columns: a dict, a data frame or a NumPy record array
+        dtype = getattr(bets, "dtype", None)
+        if hasattr(bets, "keys") or getattr(dtype, "names", None):
+            markets, amounts, multipliers, sides = [bets[key] for key in keys]
+        else:
+            bets = list(bets)
+            markets, amounts, multipliers, sides = (
+                [bet[i] for bet in bets] for i in range(len(keys))
+            )
+        markets, sides = list(markets), list(sides)
+        if not (len(markets) == len(amounts) == len(multipliers) == len(sides)):
+            raise ValueError("All columns need to have the same length")
+        if validate not in ["none", "cached", "remote"]:
+            raise ValueError("validate needs to be 'none', 'cached' or 'remote'")
+        if asset is None and not all(isinstance(x, Amount) for x in amounts):
+            raise ValueError("An asset is required if the amounts to bet are numbers")
+
+        if not set(sides) <= {"back", "lay"}:
+            raise ValueError("back_or_lay needs to be 'back' or 'lay'")
+
+        parameters = self.cached_global_properties()["parameters"]
+        multipliers = scale_to_int(multipliers, GRAPHENE_BETTING_ODDS_PRECISION)
+        minimum = parameters.get("min_bet_multiplier", 10100)
+        maximum = parameters.get("max_bet_multiplier", 10000000)
+        for i, multiplier in enumerate(multipliers):
+            if not minimum <= multiplier <= maximum:
+                raise ValueError(
+                    "Bet {} has a backer_multiplier outside of [{}, {}]".format(
+                        i,
+                        minimum / GRAPHENE_BETTING_ODDS_PRECISION,
+                        maximum / GRAPHENE_BETTING_ODDS_PRECISION,
+                    )
+                )
+
+        if asset is None:
+            amounts = [amount.json() for amount in amounts]
+        else:
+            asset = self.namecache.asset(asset)
+            amounts = [
+                {"amount": amount, "asset_id": asset["id"]}
+                for amount in scale_to_int(amounts, 10 ** asset["precision"])
+            ]
+        if any(amount["amount"] <= 0 for amount in amounts):
+            raise ValueError("amount_to_bet needs to be positive")
+
+        unique = list(dict.fromkeys(markets))
+        for market in unique:
+            self._validated_id(market, BettingMarket, "none")
+        if validate != "none":
+            missing = self.prevalidate(unique, refresh=(validate == "remote"))
+            if missing:
+                raise BettingMarketDoesNotExistException(", ".join(missing))
+
+        account = self.resolve_account(account)
+        ops = [
+            operations.Bet_place(
+                **{
+                    "fee": {"amount": 0, "asset_id": "1.3.0"},
+                    "bettor_id": account,
+                    "betting_market_id": market,
+                    "amount_to_bet": amount,
+                    "backer_multiplier": multiplier,
+                    "back_or_lay": side,
+                    "prefix": self.prefix,
+                }
+            )
+            for market, amount, multiplier, side in zip(
+                markets, amounts, multipliers, sides
+            )
+        ]
+        if (
+            self.autobatch
+            or kwargs.get("append_to")
+            or self.proposer
+            or self.unsigned
+            or self.bundle
+        ):
+            return self.finalizeOp(ops, account, "active", **kwargs)
+
+        batcher = TransactionBatcher(self, max_ops=max_ops)
+        results = batcher.append(
+            ops, account, "active", fee_asset=kwargs.get("fee_asset")
+        )
+        results.extend(batcher.flush())
+        return results
+
+    def bet_cancel(self, bet_to_cancel, account=None, validate="cached", **kwargs):
         """ Cancel a bet
 
             :param str bet_to_cancel: The identifier that identifies the bet to
                 cancel
-            :param str account: (optional) the account that owns the bet
-                (defaults to ``default_account``)
+            :param str account: (optional) the account that owns the bet,
+                name or id (defaults to ``default_account``)
+            :param str validate: (optional) How to make sure the bet exists,
+                see :meth:`bet_place`
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account)
-        bet = Bet(bet_to_cancel)
+        account = self.resolve_account(account)
+        bet_to_cancel = self._validated_id(bet_to_cancel, Bet, validate)
         op = operations.Bet_cancel(
             **{
                 "fee": {"amount": 0, "asset_id": "1.3.0"},
-                "bettor_id": account["id"],
-                "bet_to_cancel": bet["id"],
+                "bettor_id": account,
+                "bet_to_cancel": bet_to_cancel,
                 "prefix": self.prefix,
             }
         )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
    # -------------------------------------------------------------------------
    # HRP methods
@@ -1574,11 +1843,11 @@ class PeerPlays(AbstractGrapheneChain):
 
         #accounts_authority = [["1.2.30", 2]]
 
-        owner_account = Account(owner_account, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner_account)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "owner_account": owner_account["id"],
+            "owner_account": owner_account,
             "permission_name": permission_name,
             "auth": {
                 "account_auths": account_auths,
@@ -1604,11 +1873,11 @@ class PeerPlays(AbstractGrapheneChain):
 
         #accounts_authority = [["1.2.30", 2]]
 
-        owner_account = Account(owner_account, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner_account)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "owner_account": owner_account["id"],
+            "owner_account": owner_account,
             "permission_id": permission_id,
             "new_auth": {
                 "account_auths": account_auths,
@@ -1628,11 +1897,11 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(owner_account, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner_account)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "owner_account": owner_account["id"],
+            "owner_account": owner_account,
             "permission_id": permission_id,
             "prefix": self.prefix,
         }
@@ -1652,7 +1921,7 @@ class PeerPlays(AbstractGrapheneChain):
 
         #accounts_authority = [["1.2.30", 2]]
 
-        owner_account = Account(owner_account, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner_account)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
@@ -1660,7 +1929,7 @@ class PeerPlays(AbstractGrapheneChain):
             "operation_type": operation_type,
             "valid_from": valid_from,
             "valid_to": valid_to,
-            "owner_account": owner_account["id"],
+            "owner_account": owner_account,
             "prefix": self.prefix,
         }
         op = operations.Custom_account_authority_create(**op)
@@ -1675,14 +1944,14 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(owner_account, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner_account)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
             "auth_id": auth_id,
             "new_valid_from": new_valid_from,
             "new_valid_to": new_valid_to,
-            "owner_account": owner_account["id"],
+            "owner_account": owner_account,
             "prefix": self.prefix,
         }
         op = operations.Custom_account_authority_update(**op)
@@ -1695,12 +1964,12 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(owner_account, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner_account)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
             "auth_id": auth_id,
-            "owner_account": owner_account["id"],
+            "owner_account": owner_account,
             "prefix": self.prefix,
         }
         op = operations.Custom_account_authority_delete(**op)
@@ -1721,12 +1990,12 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(issuer_id_or_name, blockchain_instance=self)
+        owner_account = self.namecache.account_id(issuer_id_or_name)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
             "item_ids": item_ids,
-            "issuer": owner_account["id"],
+            "issuer": owner_account,
             "minimum_price": minimum_price,
             "maximum_price": maximum_price,
             "buying_item": buying_item,
@@ -1745,11 +2014,11 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(bidder_account_id_or_name, blockchain_instance=self)
+        owner_account = self.namecache.account_id(bidder_account_id_or_name)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "bidder": owner_account["id"],
+            "bidder": owner_account,
             "offer_id": offer_id,
             "bid_price": bid_price,
             "prefix": self.prefix,
@@ -1764,11 +2033,11 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(issuer_account_id_or_name, blockchain_instance=self)
+        owner_account = self.namecache.account_id(issuer_account_id_or_name)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "issuer": owner_account["id"],
+            "issuer": owner_account,
             "offer_id": offer_id,
             "prefix": self.prefix,
         }
@@ -1794,13 +2063,13 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(owner_account_id_or_name, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner_account_id_or_name)
         if not isinstance(revenue_partner, type(None)):
-            revenue_partner = Account(revenue_partner, blockchain_instance=self)["id"]
+            revenue_partner = self.namecache.account_id(revenue_partner)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "owner": owner_account["id"],
+            "owner": owner_account,
             "name": name,
             "symbol": symbol,
             "base_uri": base_uri,
@@ -1831,13 +2100,13 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(owner_account_id_or_name, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner_account_id_or_name)
         if not isinstance(revenue_partner, type(None)):
-            revenue_partner = Account(revenue_partner, blockchain_instance=self)["id"]
+            revenue_partner = self.namecache.account_id(revenue_partner)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "owner": owner_account["id"],
+            "owner": owner_account,
             "nft_metadata_id": nft_metadata_id,
             "name": name,
             "symbol": symbol,
@@ -1863,18 +2132,20 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        payer = Account(metadata_owner_account_id_or_name, blockchain_instance=self)
-        owner = Account(owner_account_id_or_name, blockchain_instance=self)
-        approved = Account(approved_account_id_or_name, blockchain_instance=self)
-        approved_operators = Account(approved_operators, blockchain_instance=self)
+        payer = self.namecache.account_id(metadata_owner_account_id_or_name)
+        owner = self.namecache.account_id(owner_account_id_or_name)
+        approved = self.namecache.account_id(approved_account_id_or_name)
+        if isinstance(approved_operators, (str, dict)):
+            approved_operators = [approved_operators]
+        approved_operators = [self.namecache.account_id(x) for x in approved_operators]
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "payer": payer["id"],
+            "payer": payer,
             "nft_metadata_id": metadata_id,
-            "owner": owner["id"],
-            "approved": approved["id"],
-            "approved_operators": approved_operators["id"],
+            "owner": owner,
+            "approved": approved,
+            "approved_operators": approved_operators,
             "token_uri": token_uri,
             "prefix": self.prefix,
         }
@@ -1891,11 +2162,11 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(operator_, blockchain_instance=self)
+        owner_account = self.namecache.account_id(operator_)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "operator_": owner_account["id"],
+            "operator_": owner_account,
             "from": from_,
             "to": to_,
             "token_id": token_id,
@@ -1913,13 +2184,13 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(operator_, blockchain_instance=self)
-        approved = Account(approved, blockchain_instance=self)
+        owner_account = self.namecache.account_id(operator_)
+        approved = self.namecache.account_id(approved)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "operator_": owner_account["id"],
-            "approved": approved["id"],
+            "operator_": owner_account,
+            "approved": approved,
             "token_id": token_id,
             "prefix": self.prefix,
         }
@@ -1934,13 +2205,13 @@ class PeerPlays(AbstractGrapheneChain):
         **kwargs
         ):
 
-        owner_account = Account(owner, blockchain_instance=self)
-        operator_ = Account(operator_, blockchain_instance=self)
+        owner_account = self.namecache.account_id(owner)
+        operator_ = self.namecache.account_id(operator_)
 
         op = {
             "fee": {"amount": 0, "asset_id": "1.3.0"},
-            "owner": owner_account["id"],
-            "operator_": operator_["id"],
+            "owner": owner_account,
+            "operator_": operator_,
             "approved": approved,
             "prefix": self.prefix,
         }
@@ -1955,12 +2226,7 @@ class PeerPlays(AbstractGrapheneChain):
         :param str orderNumbers: The Order Object ide of the form
             ``1.7.xxxx``
         """
-        if not account:
-            if "default_account" in self.config:
-                account = self.config["default_account"]
-        if not account:
-            raise ValueError("You need to provide an account")
-        account = Account(account, full=False, blockchain_instance=self)
+        account = self.resolve_account(account)
 
         if not isinstance(orderNumbers, (list, set, tuple)):
             orderNumbers = {orderNumbers}
@@ -1971,12 +2237,12 @@ class PeerPlays(AbstractGrapheneChain):
                 operations.Limit_order_cancel(
                     **{
                         "fee": {"amount": 0, "asset_id": "1.3.0"},
-                        "fee_paying_account": account["id"],
+                        "fee_paying_account": account,
                         "order": order,
                         "extensions": [],
                         "prefix": self.prefix,
                     }
                 )
             )
-        return self.finalizeOp(op, account["name"], "active", **kwargs)
+        return self.finalizeOp(op, account, "active", **kwargs)
 
@@ -15,7 +15,7 @@ class Rule(BlockchainObject):
     type_id = 23
 
     def refresh(self):
-        rule = self.blockchain.rpc.get_object(self.identifier)
+        rule = self.blockchain.objectloader.load(self.identifier)
         if not rule:
             raise RuleDoesNotExistException
         super().__init__(rule)
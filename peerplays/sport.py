@@ -15,10 +15,10 @@ class Sport(BlockchainObject):
     type_id = 20
 
     def refresh(self):
-        data = self.blockchain.rpc.get_object(self.identifier)
+        data = self.blockchain.objectloader.load(self.identifier)
         if not data:
             raise SportDoesNotExistException(self.identifier)
-        super(Sport, self).__init__(data)
+        super(Sport, self).__init__(data, blockchain_instance=self.blockchain)
 
     @property
     def eventgroups(self):
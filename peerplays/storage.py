@@ -1,3 +1,8 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import zlib
 from graphenestorage import (
     InRamConfigurationStore,
     InRamEncryptedKeyStore,
@@ -7,6 +12,8 @@ from graphenestorage import (
     SQLiteFile,
     SqlitePlainKeyStore,
 )
+from peerplaysapi.decoder import loads
+from .exceptions import BlockStoreIntegrityError
 
 
 url = "wss://node.peerplays.download"
@@ -24,3 +31,259 @@ def get_default_key_store(config, *args, **kwargs):
     if "appname" not in kwargs:
         kwargs["appname"] = "peerplays"
     return SqliteEncryptedKeyStore(config=config, **kwargs)
+
+
+class SqliteBlockStore(SQLiteFile):
+    """ Persistent store for irreversible blocks
+
+        Blocks are stored as compressed JSON in a separate SQLite database
+        (``blocks.sqlite`` next to the wallet and configuration) indexed by
+        their block number. Irreversible blocks never change, so every block
+        needs to be fetched from the API only once.
+
+        Next to each block, its own id (from the API or, if missing, from
+        the ``previous`` field of its successor), its transaction ids and a
+        checksum of the stored data are kept. When a block is read, the
+        checksum, the block number in its id and ``previous``, its id and
+        its transaction ids are checked against the stored values. When a
+        block is added, its ``previous`` has to match the id of the stored
+        predecessor. :meth:`verify` additionally checks this linkage for
+        all stored blocks.
+
+        The ids are not recomputed from the contents of the blocks, so the
+        store detects data that changed after it was stored, but not a block
+        that was wrong when it was received.
+
+        .. code-block:: python
+
+            peerplays.use_blockstore()
+            for block in Blockchain().block_range(1, 1000000):
+                pass  # fetched from the API only once
+
+    """
+
+    __tablename__ = "blocks"
+    __columns__ = "block_num, block_id, transaction_ids, checksum, data"
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault("appname", "peerplays")
+        kwargs.setdefault("profile", "blocks")
+        SQLiteFile.__init__(self, *args, **kwargs)
+        self.last_irreversible = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.sqlite_file, check_same_thread=False)
+        self._connection.execute(
+            """CREATE TABLE IF NOT EXISTS {} (
+                block_num INTEGER PRIMARY KEY,
+                block_id TEXT,
+                transaction_ids TEXT,
+                checksum TEXT NOT NULL,
+                data BLOB NOT NULL
+            )""".format(
+                self.__tablename__
+            )
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def encode(block):
+        return zlib.compress(json.dumps(block, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def decode(data):
+        return loads(zlib.decompress(data))
+
+    @staticmethod
+    def checksum(data):
+        return hashlib.sha256(data).hexdigest()
+
+    @staticmethod
+    def block_num_of(block_id):
+        """ The block number is encoded in the first 4 bytes of the block id
+        """
+        return int(block_id[:8], 16)
+
+    def check(self, block_num, block_id, transaction_ids, checksum, data):
+        """ Decode a stored block and check it against the values stored
+            next to it
+
+            :raises BlockStoreIntegrityError: if the block does not match
+        """
+        if self.checksum(data) != checksum:
+            raise BlockStoreIntegrityError(
+                "Stored block {} is corrupt".format(block_num)
+            )
+        block = self.decode(data)
+        if block_id and self.block_num_of(block_id) != block_num:
+            raise BlockStoreIntegrityError(
+                "Stored id of block {} is {}".format(block_num, block_id)
+            )
+        if block_id and block.get("block_id", block_id) != block_id:
+            raise BlockStoreIntegrityError(
+                "Block {} does not match its stored id {}".format(block_num, block_id)
+            )
+        if self.block_num_of(block["previous"]) != block_num - 1:
+            raise BlockStoreIntegrityError(
+                "Stored block {} does not follow {}".format(
+                    block_num, block["previous"]
+                )
+            )
+        if transaction_ids is not None and (
+            json.loads(transaction_ids) != block.get("transaction_ids")
+            or len(block["transaction_ids"]) != len(block.get("transactions", []))
+        ):
+            raise BlockStoreIntegrityError(
+                "Transactions of block {} do not match their stored ids".format(
+                    block_num
+                )
+            )
+        return block
+
+    def is_irreversible(self, block_num, rpc):
+        """ Is ``block_num`` irreversible? Only asks ``rpc`` for the last
+            irreversible block if ``block_num`` is newer than the last one
+            known
+        """
+        if block_num > self.last_irreversible:
+            props = rpc.get_dynamic_global_properties()
+            self.last_irreversible = props["last_irreversible_block_num"]
+        return block_num <= self.last_irreversible
+
+    def get(self, block_num):
+        """ Returns the stored block or ``None``
+        """
+        return self.get_many([block_num]).get(block_num)
+
+    def get_many(self, block_nums):
+        """ Returns a dictionary of the stored blocks by block number
+        """
+        block_nums = list(block_nums)
+        ret = dict()
+        with self._lock:
+            for i in range(0, len(block_nums), 500):
+                chunk = block_nums[i : i + 500]
+                rows = self._connection.execute(
+                    "SELECT {} FROM {} WHERE block_num IN ({})".format(
+                        self.__columns__,
+                        self.__tablename__,
+                        ",".join("?" * len(chunk)),
+                    ),
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    ret[row[0]] = self.check(*row)
+        return ret
+
+    def add(self, block_num, block):
+        """ Store an (irreversible) block
+        """
+        self.add_many([(block_num, block)])
+
+    def add_many(self, blocks):
+        """ Store many (irreversible) blocks
+
+            :param list blocks: List of tuples ``(block_num, block)``
+            :raises BlockStoreIntegrityError: if a block does not match the
+                stored blocks
+        """
+        with self._lock:
+            cursor = self._connection.cursor()
+            try:
+                for block_num, block in blocks:
+                    self._add(cursor, block_num, block)
+                self._connection.commit()
+            except Exception:
+                self._connection.rollback()
+                raise
+
+    def _add(self, cursor, block_num, block):
+        previous = block["previous"]
+        if self.block_num_of(previous) != block_num - 1:
+            raise BlockStoreIntegrityError(
+                "Block {} does not follow {}".format(block_num, previous)
+            )
+        block_id = block.get("block_id")
+        if block_id and self.block_num_of(block_id) != block_num:
+            raise BlockStoreIntegrityError(
+                "Block id {} does not match block {}".format(block_id, block_num)
+            )
+        transaction_ids = block.get("transaction_ids")
+        if transaction_ids is not None:
+            if len(transaction_ids) != len(block.get("transactions", [])):
+                raise BlockStoreIntegrityError(
+                    "Block {} does not have one id per transaction".format(block_num)
+                )
+            transaction_ids = json.dumps(transaction_ids)
+
+        # Our previous is the id of the stored predecessor
+        row = cursor.execute(
+            "SELECT block_id FROM {} WHERE block_num=?".format(self.__tablename__),
+            (block_num - 1,),
+        ).fetchone()
+        if row and row[0] and row[0] != previous:
+            raise BlockStoreIntegrityError(
+                "Block {} does not follow stored block {}".format(block_num, row[0])
+            )
+        if row and not row[0]:
+            cursor.execute(
+                "UPDATE {} SET block_id=? WHERE block_num=?".format(self.__tablename__),
+                (previous, block_num - 1),
+            )
+
+        # The stored successor knows our id
+        row = cursor.execute(
+            "SELECT data FROM {} WHERE block_num=?".format(self.__tablename__),
+            (block_num + 1,),
+        ).fetchone()
+        if row:
+            successor_previous = self.decode(row[0])["previous"]
+            if block_id and block_id != successor_previous:
+                raise BlockStoreIntegrityError(
+                    "Stored block {} does not follow {}".format(block_num + 1, block_id)
+                )
+            block_id = successor_previous
+
+        data = self.encode(block)
+        cursor.execute(
+            "INSERT OR REPLACE INTO {} ({}) VALUES (?, ?, ?, ?, ?)".format(
+                self.__tablename__, self.__columns__
+            ),
+            (block_num, block_id, transaction_ids, self.checksum(data), data),
+        )
+
+    def verify(self, start=0, stop=None):
+        """ Check the stored blocks (see :meth:`check`) and their linkage
+            and return the numbers of the blocks that do not match their
+            stored values or the id of their predecessor
+        """
+        bad = []
+        last_num, last_id = None, None
+        query = "SELECT {} FROM {} WHERE block_num >= ?".format(
+            self.__columns__, self.__tablename__
+        )
+        args = [start]
+        if stop is not None:
+            query += " AND block_num <= ?"
+            args.append(stop)
+        with self._lock:
+            rows = self._connection.execute(query + " ORDER BY block_num", args)
+            for row in rows:
+                block_num, block_id = row[:2]
+                try:
+                    block = self.check(*row)
+                    if last_num == block_num - 1 and last_id:
+                        if block["previous"] != last_id:
+                            raise BlockStoreIntegrityError
+                except Exception:
+                    bad.append(block_num)
+                last_num, last_id = block_num, block_id
+        return bad
+
+    def __len__(self):
+        with self._lock:
+            return self._connection.execute(
+                "SELECT COUNT(*) FROM {}".format(self.__tablename__)
+            ).fetchone()[0]
+
+    def __contains__(self, block_num):
+        return self.get(block_num) is not None
@@ -0,0 +1,127 @@
+import logging
+import struct
+import threading
+import time
+from binascii import unhexlify
+from collections import deque
+from peerplaysapi.websocket import PeerPlaysWebsocket
+from .instance import BlockchainInstance
+from .utils import parse_time
+
+log = logging.getLogger(__name__)
+
+
+def ref_block_params(block_id):
+    """ ``ref_block_num`` and ``ref_block_prefix`` of a transaction that
+        references the block ``block_id``
+    """
+    data = unhexlify(block_id)
+    return (
+        struct.unpack_from(">I", data)[0] & 0xFFFF,
+        struct.unpack_from("<I", data, 4)[0],
+    )
+
+
+@BlockchainInstance.inject
+class TaposCache:
+    """ Keep the reference block for new transactions (TaPoS) and the
+        chain parameters up to date from block notices
+
+        Transactions reference the block ``depth`` blocks behind the most
+        recently announced block. The global properties are fetched again
+        once the next maintenance interval has started. As long as the
+        cache is fresh, :class:`peerplays.transactionbuilder.TransactionBuilder`
+        needs no API call to obtain the reference block.
+
+        :param peerplaysapi.websocket.PeerPlaysWebsocket websocket: Use this
+            websocket instead of opening a new connection (e.g. the one of
+            a :class:`peerplays.broadcast.BroadcastQueue`)
+        :param int depth: Number of blocks between the most recent block
+            and the referenced block (defaults to ``3``)
+        :param int max_age: Seconds after the last block notice after which
+            the cache is considered stale and the API is used again
+            (defaults to ``30``)
+        :param instance blockchain_instance: Blockchain instance
+
+        .. code-block:: python
+
+            from peerplays import PeerPlays
+
+            peerplays = PeerPlays()
+            peerplays.use_tapos_cache()
+
+    """
+
+    def __init__(self, websocket=None, depth=3, max_age=30, **kwargs):
+        self.max_age = max_age
+        self.blocks = deque(maxlen=depth + 1)
+        self.updated = None
+        self.global_properties = None
+        self.next_maintenance = None
+        self.lock = threading.Lock()
+        self.thread = None
+        if websocket is None:
+            websocket = PeerPlaysWebsocket.for_rpc(self.blockchain.rpc)
+        self.websocket = websocket
+        self.websocket.on_block += self.process_block
+
+    def start(self, timeout=None):
+        """ Load the current parameters and connect the websocket in a
+            background thread (if it is not connected already)
+        """
+        self.refresh()
+        if self.thread is None and not self.websocket.connected.is_set():
+            self.thread = threading.Thread(
+                target=self.websocket.run_forever, name="tapos"
+            )
+            self.thread.daemon = True
+            self.thread.start()
+        if not self.websocket.connected.wait(timeout):
+            raise TimeoutError("Could not connect to the node")
+
+    def close(self):
+        """ Close the connection. The cache turns stale after ``max_age``.
+        """
+        self.websocket.close()
+        if self.thread:
+            self.thread.join()
+            self.thread = None
+
+    def refresh(self):
+        """ Fetch the dynamic and global properties from the API
+        """
+        rpc = self.blockchain.rpc
+        dynamic = rpc.get_dynamic_global_properties()
+        properties = rpc.get_global_properties()
+        with self.lock:
+            self.global_properties = properties
+            self.next_maintenance = parse_time(
+                dynamic["next_maintenance_time"]
+            ).timestamp()
+            if not self.blocks:
+                self.blocks.append(dynamic["head_block_id"])
+                self.updated = time.time()
+
+    def process_block(self, block_id):
+        """ A new block has been announced
+        """
+        now = time.time()
+        with self.lock:
+            self.blocks.append(block_id)
+            self.updated = now
+            due = self.next_maintenance is not None and now >= self.next_maintenance
+            if due:
+                # Retry later should the refresh fail
+                self.next_maintenance = now + self.max_age
+        if due:
+            self.refresh()
+
+    def block_params(self):
+        """ ``(ref_block_num, ref_block_prefix)`` for a new transaction,
+            or ``None`` if the cache is stale
+        """
+        with self.lock:
+            if not self.blocks or time.time() - self.updated > self.max_age:
+                return None
+            block_id = self.blocks[0]
+        return ref_block_params(block_id)
@@ -1,17 +1,21 @@
 # -*- coding: utf-8 -*-
+import time
 from graphenecommon.transactionbuilder import (
     TransactionBuilder as GrapheneTransactionBuilder,
     ProposalBuilder as GrapheneProposalBuilder,
 )
 
+from graphenebase.objects import Asset as GrapheneAsset
 from peerplaysbase import operations
 from peerplaysbase.account import PrivateKey, PublicKey
 from peerplaysbase.objects import Operation
+from peerplaysbase.serializer import CompiledOperation
 from peerplaysbase.signedtransactions import Signed_Transaction
 
 from .amount import Amount
 from .asset import Asset
 from .account import Account
+from .exceptions import MissingKeyError
 from .instance import BlockchainInstance
 
 
@@ -51,3 +55,253 @@ class TransactionBuilder(GrapheneTransactionBuilder):
         self.publickey_class = PublicKey
         self.signed_transaction_class = Signed_Transaction
         self.amount_class = Amount
+
+    def add_required_fees(self, ops, asset_id="1.3.0"):
+        """ Set the fees of the operations. With ``local_fees`` enabled on
+            the blockchain instance, fees in the core asset are computed
+            from the cached fee schedule, otherwise (or if that is not
+            possible for any of the operations) they are obtained from the
+            API.
+        """
+        if getattr(self.blockchain, "local_fees", False) and asset_id == "1.3.0":
+            fees = self.blockchain.fee_schedule.calculate(
+                ops, prefix=self.blockchain.prefix
+            )
+            if fees is not None:
+                for op, fee in zip(ops, fees):
+                    if isinstance(op, CompiledOperation):
+                        op.op["fee"] = {"amount": fee, "asset_id": asset_id}
+                    else:
+                        op.op.data["fee"] = GrapheneAsset(
+                            amount=fee, asset_id=asset_id
+                        )
+                return ops
+        return super().add_required_fees(ops, asset_id=asset_id)
+
+    def get_block_params(self, use_head_block=False):
+        """ Obtain ``ref_block_num`` and ``ref_block_prefix`` from the
+            :class:`peerplays.tapos.TaposCache` of the blockchain instance
+            (if any and fresh) or from the API
+        """
+        tapos = getattr(self.blockchain, "tapos", None)
+        if tapos is not None and not use_head_block:
+            params = tapos.block_params()
+            if params:
+                return params
+        return super().get_block_params(use_head_block=use_head_block)
+
+    def sign(self):
+        """ Sign the transaction with the keys found in the wallet or
+            added with ``appendWif``
+        """
+        if not self.prepare_signing():
+            return
+        self.tx.sign(self.wifs, chain=self.blockchain.chain_params)
+        self["signatures"].extend(self.tx.json().get("signatures"))
+        return self.tx
+
+    @staticmethod
+    def sign_many(txbuffers, workers=None, executor=None):
+        """ Sign many transactions at once in a pool of processes
+
+            This is equivalent to calling :meth:`sign` on every
+            transaction builder but distributes the signing over all
+            cores. All transactions need to be on the same chain.
+
+            :param list txbuffers: Instances of :class:`TransactionBuilder`
+            :param int workers: Number of processes (defaults to the number
+                of CPUs)
+            :param concurrent.futures.Executor executor: Use this executor
+                instead of :func:`peerplaysbase.signedtransactions.shared_pool`
+            :returns: The signed transactions in the given order
+        """
+        txbuffers = [x for x in txbuffers if x.prepare_signing()]
+        if not txbuffers:
+            return []
+        chain = txbuffers[0].blockchain.chain_params
+        if any(
+            x.blockchain.chain_params["chain_id"] != chain["chain_id"]
+            for x in txbuffers
+        ):
+            raise ValueError("All transactions need to be on the same chain")
+        Signed_Transaction.sign_many(
+            [x.tx for x in txbuffers],
+            [list(x.wifs) for x in txbuffers],
+            chain=chain,
+            workers=workers,
+            executor=executor,
+        )
+        for txbuffer in txbuffers:
+            txbuffer["signatures"].extend(txbuffer.tx.json().get("signatures"))
+        return [x.tx for x in txbuffers]
+
+    def prepare_signing(self):
+        """ Construct the transaction and find the keys to sign it with
+            like :meth:`sign` does
+
+            :returns: ``False`` if the transaction has no operations
+        """
+        self.constructTx()
+
+        if "operations" not in self or not self["operations"]:
+            return False
+
+        # If we are doing a proposal, obtain the account from the proposer_id
+        if self.blockchain.proposer:
+            proposer = self.account_class(
+                self.blockchain.proposer, blockchain_instance=self.blockchain
+            )
+            self.wifs = set()
+            self.signing_accounts = list()
+            self.appendSigner(proposer["id"], "active")
+
+        # We need to set the default prefix, otherwise pubkeys are
+        # presented wrongly!
+        if self.blockchain.rpc:
+            self.operations.default_prefix = self.blockchain.rpc.chain_params["prefix"]
+        elif "blockchain" in self:
+            self.operations.default_prefix = self["blockchain"]["prefix"]
+
+        if not any(self.wifs):
+            raise MissingKeyError
+        return True
+
+
+class TransactionBatcher:
+    """ Packs operations into as few transactions as possible
+
+        Operations are queued in a :class:`TransactionBuilder` which is
+        signed and broadcast once adding another operation would exceed
+        the chain's maximum transaction size or ``max_ops``, once the
+        oldest queued operation is older than ``interval`` seconds, or if
+        a different fee asset is requested.
+
+        :param instance blockchain_instance: Blockchain instance
+        :param int max_ops: Maximum number of operations per transaction
+        :param int max_size: Maximum serialized size of a transaction in
+            bytes (defaults to ``maximum_transaction_size`` from the
+            global properties)
+        :param float interval: Maximum number of seconds an operation
+            is queued; checked whenever operations are added and by
+            :meth:`poll`, which callers that add operations irregularly
+            need to call periodically
+
+        .. code-block:: python
+
+            batcher = TransactionBatcher(peerplays, max_ops=50)
+            for op in ops:
+                batcher.append(op, "init0", "active")
+            batcher.flush()
+
+    """
+
+    #: Serialized size of a transaction without operations and signatures
+    tx_overhead = 2 + 4 + 4 + 3 + 1 + 1
+
+    #: Serialized size of a signature
+    signature_size = 65
+
+    def __init__(self, blockchain_instance, max_ops=None, max_size=None, interval=None):
+        self.blockchain = blockchain_instance
+        self.max_ops = max_ops
+        self.interval = interval
+        self._max_size = max_size
+        self._new_txbuffer()
+
+    @property
+    def max_size(self):
+        if self._max_size is None:
+            tapos = getattr(self.blockchain, "tapos", None)
+            properties = (
+                tapos and tapos.global_properties
+            ) or self.blockchain.rpc.get_global_properties()
+            self._max_size = properties["parameters"]["maximum_transaction_size"]
+        return self._max_size
+
+    def _new_txbuffer(self):
+        self.txbuffer = self.blockchain.transactionbuilder_class(
+            blockchain_instance=self.blockchain
+        )
+        self.size = 0
+        self.fee_asset = None
+        self.started = None
+
+    def __len__(self):
+        return len(self.txbuffer.ops)
+
+    def estimated_size(self, signatures=0):
+        """ Serialized size of the queued transaction (upper bound)
+
+            :param int signatures: Number of signatures in addition to the
+                keys that have been added already
+        """
+        return (
+            self.tx_overhead
+            + self.size
+            + self.signature_size * (len(self.txbuffer.wifs) + signatures)
+        )
+
+    def append(self, ops, account, permission, fee_asset=None):
+        """ Queue operation(s) that are signed by ``account`` with
+            ``permission``
+
+            :returns: Results of the transactions that were broadcast
+                as a consequence (if any)
+        """
+        if not isinstance(ops, list) or isinstance(ops, Operation):
+            ops = [ops]
+        results = []
+        for op in ops:
+            if not isinstance(op, Operation):
+                op = self.txbuffer.operation_class(op)
+            size = len(bytes(op))
+            if len(self) and (
+                fee_asset != self.fee_asset
+                or (self.max_ops and len(self) >= self.max_ops)
+                or self.estimated_size(signatures=1) + size > self.max_size
+            ):
+                results.extend(self.flush())
+            if not len(self):
+                self.started = time.time()
+                self.fee_asset = fee_asset
+                if fee_asset:
+                    self.txbuffer.set_fee_asset(fee_asset)
+            self.txbuffer.appendOps([op])
+            self.txbuffer.appendSigner(account, permission)
+            self.size += size
+
+        if len(self) and self.max_ops and len(self) >= self.max_ops:
+            results.extend(self.flush())
+        results.extend(self.poll())
+        return results
+
+    def flush_due(self):
+        """ Have the queued operations been queued for ``interval``
+            seconds?
+        """
+        return bool(
+            len(self)
+            and self.interval is not None
+            and time.time() - self.started >= self.interval
+        )
+
+    def poll(self):
+        """ Broadcast the queued operations if they are due (see
+            :meth:`flush_due`)
+
+            :returns: List with the result of the broadcast (if any)
+        """
+        if self.flush_due():
+            return self.flush()
+        return []
+
+    def flush(self):
+        """ Sign and broadcast the queued operations
+
+            :returns: List with the result of the broadcast (if any)
+        """
+        if not len(self):
+            return []
+        txbuffer = self.txbuffer
+        self._new_txbuffer()
+        return [txbuffer.broadcast()]
@@ -46,3 +46,22 @@ def dList2Dict(l):
 
 def dict2dList(l):
     return [[k, v] for k, v in l.items()]
+
+
+def scale_to_int(values, factor):
+    """ Multiply all ``values`` by ``factor`` and round them to integers
+
+        NumPy arrays (or pandas series) are converted in one vectorized
+        operation, other iterables element by element.
+
+        :raises ValueError: if a value is not finite
+    """
+    if hasattr(values, "dtype"):
+        scaled = (values * factor).round()
+        if not (abs(scaled) < float("inf")).all():
+            raise ValueError("Values need to be finite")
+        return scaled.astype("int64").tolist()
+    try:
+        return [int(round(x * factor)) for x in values]
+    except OverflowError:
+        raise ValueError("Values need to be finite")
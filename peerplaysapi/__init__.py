@@ -1,4 +1,5 @@
 __all__ = [
+    "aio",
     "exceptions",
     "node",
     "websocket"
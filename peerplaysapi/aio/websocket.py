@@ -0,0 +1,234 @@
+import asyncio
+import json
+import logging
+import traceback
+import websockets
+from grapheneapi.exceptions import RPCError
+from ..exceptions import NumRetriesReached
+from ..heartbeat import Heartbeat
+from ..websocket import PeerPlaysWebsocket as SyncPeerPlaysWebsocket
+
+log = logging.getLogger(__name__)
+
+
+class PeerPlaysWebsocket(SyncPeerPlaysWebsocket):
+    """ Asyncio variant of :class:`peerplaysapi.websocket.PeerPlaysWebsocket`
+
+        Other than the synchronous class, RPC calls can be awaited over the
+        very same connection that receives the push notifications. Every
+        request is registered with its request id in a table of pending
+        futures that are resolved once the node replies. Notices are
+        dispatched to the ``on_tx``, ``on_object``, ``on_block``,
+        ``on_account`` and ``on_market`` slots exactly as in the synchronous
+        class.
+
+        .. code-block:: python
+
+            async def main():
+                ws = PeerPlaysWebsocket(
+                    "wss://node.testnet.peerplays.eu",
+                    objects=["1.25.x"],
+                    on_object=print,
+                )
+                listener = asyncio.ensure_future(ws.run_forever())
+                await ws.connected.wait()
+                print(await ws.get_objects(["2.0.0"]))
+
+            asyncio.get_event_loop().run_until_complete(main())
+
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._pending = dict()
+        self._keepalive_task = None
+        self._closing = False
+        super().__init__(*args, **kwargs)
+
+    def _make_event(self):
+        return asyncio.Event()
+
+    async def on_open(self, ws):
+        """ Login, register to the database api and subscribe to the
+            objects defined if there is a callback/slot available
+        """
+        await self.login(self.user, self.password, api_id=1)
+        await self.database(api_id=1)
+        await self.cancel_all_subscriptions()
+
+        if len(self.on_object) or self.subscription_objects.has_callbacks:
+            await self.set_subscribe_callback(
+                self.__events__.index("on_object"), False
+            )
+
+        if len(self.on_tx):
+            await self.set_pending_transaction_callback(self.__events__.index("on_tx"))
+
+        if len(self.on_block) or self.coalesce_notices:
+            await self.set_block_applied_callback(self.__events__.index("on_block"))
+
+        if self.subscription_accounts and self.on_account:
+            self.accounts = await self.get_full_accounts(
+                self.subscription_accounts, True
+            )
+
+        if self.subscription_markets and self.on_market:
+            for market in self.subscription_markets:
+                await self.subscribe_to_market(
+                    self.__events__.index("on_market"), market[0], market[1]
+                )
+
+        self.stop_keepalive()
+        self.keepalive = Heartbeat(self.keep_alive)
+        self._keepalive_task = asyncio.ensure_future(self._keepalive(self.keepalive))
+
+    async def _keepalive(self, heartbeat):
+        """ Keep the connetion alive if it has been idle for a while. This
+            runs as task on the connection's event loop.
+        """
+        while not heartbeat.stopped:
+            remaining = heartbeat.remaining()
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+                continue
+            log.debug("Sending ping")
+            try:
+                await self.ping()
+            except Exception as e:
+                log.warning("Heartbeat failed: {}".format(str(e)))
+            heartbeat.touch()
+
+    async def ping(self):
+        if self.heartbeat == "ping":
+            await self.ws.ping()
+        else:
+            await self.get_objects(["2.8.0"])
+
+    def stop_keepalive(self):
+        super().stop_keepalive()
+        if self._keepalive_task:
+            self._keepalive_task.cancel()
+            self._keepalive_task = None
+
+    def on_message(self, ws, reply, *args):
+        """ Resolve the pending future for replies that carry a request id
+            and hand notices over to ``process_message``
+        """
+        log.debug("Received message: %s", reply)
+        if self.keepalive:
+            self.keepalive.touch()
+        if self.process_raw_notice(reply):
+            return
+        try:
+            data = self.decoder(reply)
+        except ValueError:
+            raise ValueError("API node returned invalid format. Expected JSON!")
+
+        if "id" in data:
+            future = self._pending.pop(data["id"], None)
+            if future is None or future.done():
+                log.warning("Received reply for unknown request %s", data["id"])
+            elif "error" in data:
+                future.set_exception(RPCError(self._error_message(data["error"])))
+            else:
+                future.set_result(data.get("result"))
+        else:
+            self.process_message(data)
+
+    @staticmethod
+    def _error_message(error):
+        if "detail" in error:
+            return error["detail"]
+        elif error.get("message") == "Execution error":
+            stack = error["data"]["stack"][0]
+            return stack["format"].replace("${", "{").format(**stack["data"])
+        return error.get("message")
+
+    def on_close(self, ws):
+        """ Called when websocket connection is closed. All requests that
+            are still awaiting a reply are failed with ``ConnectionError``.
+        """
+        log.debug("Closing WebSocket connection with {}".format(self.url))
+        self.connected.clear()
+        self.stop_keepalive()
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Websocket connection closed"))
+        self._pending.clear()
+
+    async def _read_messages(self):
+        async for message in self.ws:
+            self.on_message(self.ws, message)
+
+    async def run_forever(self):
+        """ Connect, subscribe and read messages until :meth:`close` is
+            called. Lost connections are re-established with the next url.
+        """
+        cnt = 0
+        self._closing = False
+        while not self._closing:
+            cnt += 1
+            self.url = self.next_url()
+            log.debug("Trying to connect to node %s", self.url)
+            try:
+                self.ws = await websockets.connect(self.url, max_size=None)
+                reader = asyncio.ensure_future(self._read_messages())
+                try:
+                    await self.on_open(self.ws)
+                    self.connected.set()
+                    cnt = 0
+                    await reader
+                finally:
+                    reader.cancel()
+                    self.on_close(self.ws)
+                    await self.ws.close()
+
+            except (OSError, websockets.exceptions.WebSocketException) as exc:
+                if self._closing:
+                    break
+                self.url_failed()
+                if self.num_retries >= 0 and cnt > self.num_retries:
+                    raise NumRetriesReached()
+
+                sleeptime = (cnt - 1) * 2 if cnt < 10 else 10
+                if sleeptime:
+                    log.warning(
+                        "Lost connection to node during wsconnect(): %s (%d/%d) "
+                        % (self.url, cnt, self.num_retries)
+                        + "Retrying in %d seconds" % sleeptime
+                    )
+                    await asyncio.sleep(sleeptime)
+
+            except Exception as e:
+                log.critical("{}\n\n{}".format(str(e), traceback.format_exc()))
+
+    async def close(self):
+        """ Stop :meth:`run_forever` and close the connection
+        """
+        self._closing = True
+        if self.ws:
+            await self.ws.close()
+
+    """ RPC Calls
+    """
+
+    async def rpcexec(self, payload):
+        """ Send the payload and wait for the reply with the same id
+
+            :param dict payload: Payload data
+            :raises RPCError: if the server returns an error
+            :raises ConnectionError: if the connection is lost before the
+                reply arrives
+        """
+        if not self.ws:
+            raise ConnectionError("Websocket is not connected")
+        log.debug("Sending: %s", payload)
+        if self.keepalive:
+            self.keepalive.touch()
+        future = asyncio.get_event_loop().create_future()
+        self._pending[payload["id"]] = future
+        try:
+            await self.ws.send(json.dumps(payload, ensure_ascii=False))
+        except Exception:
+            self._pending.pop(payload["id"], None)
+            raise
+        return await future
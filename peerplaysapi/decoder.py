@@ -0,0 +1,55 @@
+import re
+import json
+import logging
+
+log = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    FAST_DECODER = "orjson"
+    _fast_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        FAST_DECODER = "ujson"
+        _fast_loads = ujson.loads
+    except ImportError:
+        FAST_DECODER = None
+        _fast_loads = None
+        log.debug(
+            "To speed up decoding of notices install \n" "    pip install orjson"
+        )
+
+_notice_re = re.compile(r'\s*\{\s*"method"\s*:\s*"notice"\s*,\s*"params"\s*:\s*\[\s*(\d+)')
+_notice_re_bytes = re.compile(_notice_re.pattern.encode("ascii"))
+
+
+def loads(data):
+    """ Decode a JSON message with orjson or ujson if installed and fall
+        back to the (non-strict) standard library decoder otherwise.
+
+        :param str data: JSON encoded message (str or bytes)
+    """
+    if _fast_loads:
+        try:
+            return _fast_loads(data)
+        except ValueError:
+            # The fast decoders are strict about control characters
+            pass
+    return json.loads(data, strict=False)
+
+
+def notice_id(data):
+    """ Return the callback id of a notice without decoding the entire
+        message, or ``None`` if ``data`` does not look like a notice.
+
+        :param str data: JSON encoded message (str or bytes)
+    """
+    if isinstance(data, (bytes, bytearray)):
+        match = _notice_re_bytes.match(data)
+    else:
+        match = _notice_re.match(data)
+    if match:
+        return int(match.group(1))
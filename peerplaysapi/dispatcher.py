@@ -0,0 +1,191 @@
+import logging
+import threading
+import traceback
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+
+log = logging.getLogger(__name__)
+
+
+class Channel:
+    """ Bounded queue of the calls for one event type. The calls are
+        executed one after another by the channel's own thread which
+        guarantees their order.
+    """
+
+    def __init__(self, name, dispatcher):
+        self.name = name
+        self.dispatcher = dispatcher
+        self.queue = deque()
+        self.keys = dict()
+        self.busy = False
+        self.dropped = 0
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self._run, name="dispatch-" + name)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def put(self, callback, args, key=None):
+        """ Queue a call. ``key`` identifies calls that can be coalesced.
+        """
+        overflow = self.dispatcher.overflow
+        with self.condition:
+            if key is not None and key in self.keys:
+                # Replace the queued notice with the more recent one
+                self.keys[key][1] = args
+                return
+            while len(self.queue) >= self.dispatcher.max_queue:
+                if overflow == "drop_oldest":
+                    _, _, dropped_key = self.queue.popleft()
+                    self.keys.pop(dropped_key, None)
+                    self.dropped += 1
+                    log.warning("Dispatch queue %s is full, dropping oldest", self.name)
+                else:
+                    self.condition.wait()
+            entry = [callback, args, key]
+            self.queue.append(entry)
+            if key is not None:
+                self.keys[key] = entry
+            self.condition.notify_all()
+
+    def join(self):
+        """ Wait until all queued calls have been executed
+        """
+        with self.condition:
+            while self.queue or self.busy:
+                self.condition.wait()
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while not self.queue and not self.dispatcher.stopped:
+                    self.condition.wait()
+                if not self.queue:
+                    return
+                callback, args, key = self.queue.popleft()
+                self.keys.pop(key, None)
+                self.busy = True
+                self.condition.notify_all()
+            try:
+                self.dispatcher.execute(callback, args)
+            except Exception as e:
+                log.critical(
+                    "Error in {}: {}\n\n{}".format(
+                        self.name, str(e), traceback.format_exc()
+                    )
+                )
+            finally:
+                with self.condition:
+                    self.busy = False
+                    self.condition.notify_all()
+
+
+class Dispatcher:
+    """ Executes notification callbacks away from the websocket's thread
+
+        Every event type (``on_block``, ``on_object``, ...) has its own
+        bounded queue. Callbacks of the same event type are called in the
+        order the notices were received, while different event types are
+        processed concurrently.
+
+        :param int max_queue: Maximum number of queued notices per event type
+        :param str overflow: What to do if a queue is full:
+
+            * ``block``: wait for the callbacks to catch up (default)
+            * ``drop_oldest``: discard the oldest queued notice
+            * ``coalesce``: only keep the latest queued notice for an object
+              id and wait if the queue is full nonetheless
+
+        :param executor: Run the callbacks in the dispatcher's threads
+            (``thread``, default), in a pool of processes (``process``) or
+            in an instance of :class:`concurrent.futures.Executor`. Callbacks
+            that run in other processes need to be picklable.
+        :param int workers: Number of processes for ``executor="process"``
+
+        .. code-block:: python
+
+            ws = PeerPlaysWebsocket(
+                "wss://node.testnet.peerplays.eu",
+                on_block=store_block,
+                dispatcher=Dispatcher(max_queue=100, overflow="drop_oldest"),
+            )
+
+    """
+
+    overflow_policies = ["block", "drop_oldest", "coalesce"]
+
+    def __init__(self, max_queue=1000, overflow="block", executor="thread", workers=None):
+        if overflow not in self.overflow_policies:
+            raise ValueError(
+                "overflow needs to be one of {}".format(self.overflow_policies)
+            )
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.stopped = False
+        self.channels = dict()
+        self._lock = threading.Lock()
+        if executor == "thread":
+            self.executor = None
+        elif executor == "process":
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        elif isinstance(executor, Executor):
+            self.executor = executor
+        else:
+            raise ValueError("Unknown executor {}".format(executor))
+
+    def channel(self, name):
+        if name not in self.channels:
+            with self._lock:
+                if name not in self.channels:
+                    self.channels[name] = Channel(name, self)
+        return self.channels[name]
+
+    def submit(self, name, callback, *args):
+        """ Queue a call of ``callback`` for the event type ``name``
+
+            :param str name: Event type, e.g. ``on_block``
+            :param fnt callback: Callable or event slot to call
+        """
+        if self.stopped:
+            raise RuntimeError("Dispatcher has been shut down")
+        key = None
+        if self.overflow == "coalesce" and args:
+            notice = args[0]
+            if isinstance(notice, dict) and "id" in notice:
+                key = (callback, notice["id"])
+        self.channel(name).put(callback, args, key)
+
+    def execute(self, callback, args):
+        if self.executor is None:
+            callback(*args)
+        else:
+            # Event slots can't be sent to other processes, their
+            # targets can
+            for target in getattr(callback, "targets", [callback]):
+                self.executor.submit(target, *args).result()
+
+    @property
+    def dropped(self):
+        """ Number of notices dropped due to full queues
+        """
+        return sum(channel.dropped for channel in list(self.channels.values()))
+
+    def join(self):
+        """ Wait until all queued notices have been processed
+        """
+        for channel in list(self.channels.values()):
+            channel.join()
+
+    def shutdown(self, wait=True):
+        """ Stop the dispatcher after the queued notices have been processed
+
+            :param bool wait: Wait for the queues to be processed
+        """
+        self.stopped = True
+        for channel in list(self.channels.values()):
+            with channel.condition:
+                channel.condition.notify_all()
+            if wait:
+                channel.thread.join()
+        if self.executor:
+            self.executor.shutdown(wait=wait)
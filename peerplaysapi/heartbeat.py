@@ -0,0 +1,37 @@
+import time
+import threading
+
+
+class Heartbeat:
+    """ Keeps track of the idleness of a connection so that a ping is only
+        sent once it has been idle for ``interval`` seconds. Traffic
+        reported through :meth:`touch` postpones the next ping. The ping
+        itself is scheduled by the connection (see
+        :meth:`peerplaysapi.aio.websocket.PeerPlaysWebsocket._keepalive`).
+
+        :param int interval: Seconds of idleness before a ping is sent
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.last_activity = time.time()
+        self._stopped = threading.Event()
+
+    def touch(self):
+        """ Report traffic on the connection
+        """
+        self.last_activity = time.time()
+
+    def remaining(self):
+        """ Seconds until the next ping is due
+        """
+        return self.interval - (time.time() - self.last_activity)
+
+    @property
+    def stopped(self):
+        return self._stopped.is_set()
+
+    def stop(self):
+        """ Stop pinging
+        """
+        self._stopped.set()
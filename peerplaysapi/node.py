@@ -1,7 +1,17 @@
 import re
+import json
+import time
+import logging
+import threading
+import traceback
 from grapheneapi.api import Api as Original_Api
+from grapheneapi.exceptions import HttpInvalidStatusCode, RPCError
+from grapheneapi.http import Http
 from peerplaysbase.chains import known_chains
 from . import exceptions
+from .nodepool import NodePool
+
+log = logging.getLogger(__name__)
 
 
 class Api(Original_Api):
@@ -20,12 +30,85 @@ class Api(Original_Api):
 
 
 class PeerPlaysNodeRPC(Api):
+    """ RPC connection to a PeerPlays node
+
+        :param list urls: Node url or list of urls
+        :param str user: Username for Authentication
+        :param str password: Password for Authentication
+        :param int pool_size: If set, keep this many warm connections in a
+            :class:`peerplaysapi.nodepool.NodePool` and send every call to
+            the best scoring node (defaults to ``0``, i.e. no pool)
+
+        Calls are serialized through :attr:`lock`, which :class:`RPCBatch`
+        holds while its pipelined requests are in flight so that no other
+        thread reads their replies.
+    """
+
+    def __init__(self, urls, user=None, password=None, *args, pool_size=0, **kwargs):
+        self.lock = threading.RLock()
+        #: The node urls in the order given
+        self.node_urls = list(urls) if isinstance(urls, (list, tuple)) else [urls]
+        #: Urls of the http nodes that do not accept JSON-RPC batches
+        self.unbatched_urls = set()
+        self.pool = None
+        if pool_size:
+            self.pool = NodePool(
+                urls,
+                size=pool_size,
+                on_connect=self.register_apis,
+                lock=self.lock,
+                user=user,
+                password=password,
+                **kwargs
+            )
+        super().__init__(urls, user, password, *args, **kwargs)
+
+    @property
+    def connection(self):
+        if not self.pool:
+            return Original_Api.connection.fget(self)
+        self.url = self.pool.select()
+        return self.pool.connection(self.url)
+
+    def connect(self):
+        if not self.pool:
+            return super().connect()
+        # Selecting a node connects it and registers the apis
+        self.connection
+
+    def error_url(self):
+        if self.pool:
+            self.pool.record(self.url, error=True)
+        super().error_url()
+
+    def next(self):
+        if not self.pool:
+            return super().next()
+        self.connect()
 
-    def register_apis(self):
-        self.login("", "", api_id=1)
-        self.api_id["database"] = self.database(api_id=1)
-        self.api_id["history"] = self.history(api_id=1)
-        self.api_id["network_broadcast"] = self.network_broadcast(api_id=1)
+    def __getattr__(self, name):
+        func = super().__getattr__(name)
+        lock = self.__dict__["lock"]
+        pool = self.__dict__.get("pool")
+
+        def call(*args, **kwargs):
+            with lock:
+                start = time.time()
+                ret = func(*args, **kwargs)
+                if pool:
+                    pool.record(self.url, latency=time.time() - start)
+            return ret
+
+        return call
+
+    def register_apis(self, connection=None):
+        connection = connection or self
+        connection.login("", "", api_id=1)
+        connection.api_id["database"] = connection.database(api_id=1)
+        connection.api_id["history"] = connection.history(api_id=1)
+        connection.api_id["network_broadcast"] = connection.network_broadcast(
+            api_id=1
+        )
 
     def get_account(self, name, **kwargs):
         """ Get full account details from account name or id
@@ -54,6 +137,19 @@ class PeerPlaysNodeRPC(Api):
         """
         return self.get_objects([o], **kwargs)[0]
 
+    def batch(self, raise_exceptions=True, max_pipeline=100):
+        """ Queue many calls and send them in as few round trips as
+            possible. See :class:`RPCBatch`.
+
+            :param bool raise_exceptions: Raise the first error once all
+                calls have been processed (defaults to ``True``). If
+                ``False``, exceptions are returned in place of the result.
+            :param int max_pipeline: Number of requests in flight at once
+        """
+        return RPCBatch(
+            self, raise_exceptions=raise_exceptions, max_pipeline=max_pipeline
+        )
+
     def get_network(self):
         """ Identify the connected network. This call returns a
             dictionary with keys chain_id, core_symbol and prefix
@@ -64,3 +160,233 @@ class PeerPlaysNodeRPC(Api):
             if v["chain_id"] == chain_id:
                 return v
         raise Exception("Connecting to unknown network!")
+
+
+class BatchResult:
+    """ Placeholder for the result of a call queued in an :class:`RPCBatch`
+    """
+
+    def __init__(self, name, args, kwargs, postprocess=None):
+        self.name = name
+        self.args = args
+        self.kwargs = kwargs
+        self.postprocess = postprocess
+        self.done = False
+        self._result = None
+        self._exception = None
+
+    def set_result(self, result):
+        if self.postprocess:
+            result = self.postprocess(result)
+        self._result = result
+        self.done = True
+
+    def set_exception(self, exception):
+        self._exception = exception
+        self.done = True
+
+    def result(self):
+        """ Return the result of the call or raise its exception
+        """
+        if not self.done:
+            raise ValueError("Batch has not been executed yet")
+        if self._exception:
+            raise self._exception
+        return self._result
+
+
+class RPCBatch:
+    """ Queue calls to :class:`PeerPlaysNodeRPC` and send them as pipelined
+        websocket frames (or as a single JSON-RPC batch over http) instead of
+        waiting out one round trip per call. Results are returned in the order
+        the calls were queued. Errors are mapped through
+        :meth:`Api.post_process_exception` for every call individually.
+        Http nodes that reject JSON-RPC batches are sent the calls one by
+        one from then on.
+
+        .. code-block:: python
+
+            with peerplays.rpc.batch() as batch:
+                for name in ["init0", "init1"]:
+                    batch.get_account(name)
+            accounts = batch.results()
+    """
+
+    def __init__(self, rpc, raise_exceptions=True, max_pipeline=100):
+        self.rpc = rpc
+        self.raise_exceptions = raise_exceptions
+        self.max_pipeline = max_pipeline
+        self.calls = []
+        self._executed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.execute()
+
+    def __len__(self):
+        return len(self.calls)
+
+    def queue(self, name, *args, postprocess=None, **kwargs):
+        """ Queue the call ``name`` with arguments ``args``
+        """
+        call = BatchResult(name, args, kwargs, postprocess=postprocess)
+        self.calls.append(call)
+        self._executed = False
+        return call
+
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+
+        def method(*args, **kwargs):
+            return self.queue(name, *args, **kwargs)
+
+        return method
+
+    def get_account(self, name, **kwargs):
+        """ Batched :meth:`PeerPlaysNodeRPC.get_account`
+        """
+        if len(name.split(".")) == 3:
+            return self.queue("get_objects", [name], postprocess=_first)
+        else:
+            return self.queue("get_account_by_name", name, **kwargs)
+
+    def get_asset(self, name, **kwargs):
+        """ Batched :meth:`PeerPlaysNodeRPC.get_asset`
+        """
+        if len(name.split(".")) == 3:
+            return self.queue("get_objects", [name], postprocess=_first, **kwargs)
+        else:
+            return self.queue(
+                "lookup_asset_symbols", [name], postprocess=_first, **kwargs
+            )
+
+    def get_object(self, o, **kwargs):
+        """ Batched :meth:`PeerPlaysNodeRPC.get_object`
+        """
+        return self.queue("get_objects", [o], postprocess=_first, **kwargs)
+
+    def _payload(self, connection, call):
+        kwargs = call.kwargs
+        if "api_id" in kwargs:
+            api_id = kwargs["api_id"]
+        elif "api" in kwargs:
+            api_id = connection.api_id.get(kwargs["api"]) or kwargs["api"]
+        else:
+            api_id = 0
+        return {
+            "method": "call",
+            "params": [api_id, call.name, list(call.args)],
+            "jsonrpc": "2.0",
+            "id": connection.get_request_id(),
+        }
+
+    def _exchange(self, connection, calls):
+        """ Send the calls and return their payloads and the replies indexed
+            by request id
+        """
+        if isinstance(connection, Http):
+            return self._exchange_http(connection, calls)
+
+        if not connection.ws:
+            connection.connect()
+        # Hold the lock while allocating the request ids and until all
+        # replies are read, so no other thread can use the same ids or read
+        # the replies to our pipelined requests
+        with self.rpc.lock:
+            payloads = [self._payload(connection, call) for call in calls]
+            for payload in payloads:
+                connection.ws.send(
+                    json.dumps(payload, ensure_ascii=False).encode("utf8")
+                )
+            pending = set(payload["id"] for payload in payloads)
+            replies = dict()
+            while pending:
+                reply = json.loads(connection.ws.recv(), strict=False)
+                if reply.get("id") in pending:
+                    pending.remove(reply["id"])
+                    replies[reply["id"]] = reply
+                else:
+                    log.debug("Dropping unexpected message: %s", reply)
+        return payloads, replies
+
+    def _exchange_http(self, connection, calls):
+        with self.rpc.lock:
+            payloads = [self._payload(connection, call) for call in calls]
+        unbatched_urls = self.rpc.unbatched_urls
+        replies = None
+        if connection.url not in unbatched_urls:
+            try:
+                replies = json.loads(connection.rpcexec(payloads), strict=False)
+            except (HttpInvalidStatusCode, ValueError):
+                pass
+            if not isinstance(replies, list):
+                log.info("%s does not accept batches of calls", connection.url)
+                unbatched_urls.add(connection.url)
+                replies = None
+        if replies is None:
+            replies = [
+                json.loads(connection.rpcexec(payload), strict=False)
+                for payload in payloads
+            ]
+        return payloads, {r.get("id"): r for r in replies}
+
+    def _execute_chunk(self, calls):
+        while True:
+            connection = self.rpc.connection
+            try:
+                payloads, replies = self._exchange(connection, calls)
+                self.rpc.reset_counter()
+                break
+            except KeyboardInterrupt:
+                raise
+            except Exception as e:
+                log.debug(traceback.format_exc())
+                log.warning(str(e))
+                log.warning("Reconnecting ...")
+                self.rpc.error_url()
+                self.rpc.next()
+
+        for call, payload in zip(calls, payloads):
+            try:
+                reply = replies.get(payload["id"])
+                if reply is None:
+                    raise RPCError("No reply for call {}".format(call.name))
+                try:
+                    result = connection.parse_response(reply, log_on_debug=False)
+                except RPCError as e:
+                    self.rpc.post_process_exception(e)
+                call.set_result(result)
+            except Exception as e:
+                call.set_exception(e)
+
+    def execute(self):
+        """ Send all queued calls and return their results in order
+        """
+        if not self._executed:
+            for i in range(0, len(self.calls), self.max_pipeline):
+                self._execute_chunk(self.calls[i : i + self.max_pipeline])
+            self._executed = True
+        return self.results()
+
+    def results(self):
+        """ Results of all queued calls in the order they were queued
+        """
+        if not self._executed:
+            return self.execute()
+        ret = []
+        for call in self.calls:
+            try:
+                ret.append(call.result())
+            except Exception as e:
+                if self.raise_exceptions:
+                    raise
+                ret.append(e)
+        return ret
+
+
+def _first(result):
+    return result[0]
@@ -0,0 +1,274 @@
+import time
+import logging
+import threading
+from grapheneapi.websocket import Websocket
+from grapheneapi.http import Http
+
+log = logging.getLogger(__name__)
+
+
+class NodeStats:
+    """ Health statistics of a single node
+
+        :param str url: Node url
+        :param float alpha: Weight of the latest sample in the moving averages
+    """
+
+    def __init__(self, url, alpha=0.2):
+        self.url = url
+        self.alpha = alpha
+        self.latency = None
+        self.error_rate = 0.0
+        self.head_block_lag = 0
+        self.head_block_number = None
+        self.ejected_until = 0
+
+    def record(self, latency=None, error=False):
+        """ Add a sample to the moving averages
+        """
+        if latency is not None:
+            if self.latency is None:
+                self.latency = latency
+            else:
+                self.latency += self.alpha * (latency - self.latency)
+        self.error_rate += self.alpha * (float(error) - self.error_rate)
+
+    @property
+    def ejected(self):
+        return time.time() < self.ejected_until
+
+    def eject(self, seconds):
+        self.ejected_until = time.time() + seconds
+
+    def score(self, block_interval=3):
+        """ Lower is better. Unknown latency counts as one block interval.
+        """
+        latency = block_interval if self.latency is None else self.latency
+        return (latency + self.head_block_lag * block_interval) * (
+            1 + 10 * self.error_rate
+        )
+
+    def __repr__(self):
+        return "<NodeStats {} latency={} errors={:.2f} lag={}>".format(
+            self.url, self.latency, self.error_rate, self.head_block_lag
+        )
+
+
+class NodePool:
+    """ Keep ``size`` warm connections to the best scoring nodes
+
+        Every node is scored from its call latency, error rate and the lag
+        of its head block compared to the other nodes (as reported by
+        ``get_dynamic_global_properties``). Nodes that lag behind by more
+        than ``max_head_lag`` blocks or keep failing are ejected for
+        ``eject_time`` seconds and replaced by the next candidate. The last
+        node that is not ejected is never ejected, and if all nodes are
+        ejected anyway, the least bad one is used.
+
+        Probing the nodes and connecting the warm ones happens in a
+        background thread that is started by the first :meth:`select`, so
+        calls never wait for a probe.
+
+        :param list urls: Node urls
+        :param int size: Number of warm connections
+        :param int max_head_lag: Eject nodes lagging more blocks than this
+        :param float max_error_rate: Eject nodes with a higher error rate
+        :param int eject_time: Seconds an ejected node is not used
+        :param int probe_interval: Seconds between head block probes
+        :param fnt on_connect: Called with every newly connected connection
+        :param bool background: Probe in a background thread (defaults to
+            ``True``). Otherwise, :meth:`refresh` needs to be called.
+        :param lock: Lock held while probing a connection, e.g. to not
+            interleave with calls from other threads on the same connection
+    """
+
+    def __init__(
+        self,
+        urls,
+        size=3,
+        max_head_lag=3,
+        max_error_rate=0.5,
+        eject_time=60,
+        probe_interval=30,
+        on_connect=None,
+        background=True,
+        lock=None,
+        **kwargs
+    ):
+        if not isinstance(urls, (list, tuple)):
+            urls = [urls]
+        self.size = size
+        self.max_head_lag = max_head_lag
+        self.max_error_rate = max_error_rate
+        self.eject_time = eject_time
+        self.probe_interval = probe_interval
+        self.on_connect = on_connect
+        self.stats = {url: NodeStats(url) for url in urls}
+        self._kwargs = kwargs
+        self._connections = dict()
+        self._lock = threading.RLock()
+        self._call_lock = lock or threading.RLock()
+        self._background = background
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def urls(self):
+        return list(self.stats.keys())
+
+    def new_connection(self, url):
+        if url[:2] == "ws":
+            return Websocket(url, **self._kwargs)
+        elif url[:4] == "http":
+            return Http(url, **self._kwargs)
+        else:
+            raise ValueError("Only support http(s) and ws(s) connections!")
+
+    def connection(self, url):
+        """ Return the (connected) connection to ``url``
+        """
+        with self._lock:
+            if url not in self._connections:
+                connection = self.new_connection(url)
+                try:
+                    connection.connect()
+                    if self.on_connect:
+                        self.on_connect(connection)
+                except Exception:
+                    self.stats[url].record(error=True)
+                    self.eject(url, "unreachable")
+                    raise
+                self._connections[url] = connection
+            return self._connections[url]
+
+    def drop(self, url):
+        """ Close and forget the connection to ``url``
+        """
+        with self._lock:
+            connection = self._connections.pop(url, None)
+        if connection:
+            connection.disconnect()
+
+    def warm(self):
+        """ The nodes that are kept connected, best first
+        """
+        with self._lock:
+            candidates = sorted(
+                (s for s in self.stats.values() if not s.ejected),
+                key=lambda s: s.score(),
+            )
+            warm = candidates[: self.size]
+            for url in list(self._connections):
+                if url not in [s.url for s in warm]:
+                    self.drop(url)
+            return warm
+
+    def eject(self, url, reason):
+        """ Stop using ``url`` for :attr:`eject_time` seconds unless it is
+            the last node that is not ejected
+        """
+        with self._lock:
+            stats = self.stats[url]
+            others = [s for s in self.stats.values() if s is not stats]
+            if all(s.ejected for s in others):
+                log.warning("Keeping %s node %s, it is the last one" % (reason, url))
+                return
+            log.warning("Ejecting %s node %s" % (reason, url))
+            stats.eject(self.eject_time)
+            self.drop(url)
+
+    def select(self):
+        """ Return the url of the best scoring node, or of the least bad
+            node if all are ejected
+        """
+        if self._background:
+            self.start()
+        warm = self.warm()
+        if warm:
+            return warm[0].url
+        with self._lock:
+            return min(
+                self.stats.values(), key=lambda s: (s.ejected_until, s.score())
+            ).url
+
+    def record(self, url, latency=None, error=False):
+        """ Record the outcome of a call to ``url``
+        """
+        with self._lock:
+            stats = self.stats.get(url)
+            if not stats:
+                return
+            stats.record(latency=latency, error=error)
+            if error:
+                self.drop(url)
+                if stats.error_rate > self.max_error_rate:
+                    self.eject(url, "failing")
+
+    def start(self):
+        """ Start probing in the background (see :meth:`refresh`)
+        """
+        with self._lock:
+            if self._thread is None:
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="NodePool", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self):
+        """ Stop probing in the background
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread:
+            self._stopped.set()
+            thread.join()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                log.warning("Refreshing the node pool failed: %s" % str(e))
+            self._stopped.wait(self.probe_interval)
+
+    def refresh(self):
+        """ Probe the warm nodes and connect the ones that replace ejected
+            nodes
+        """
+        self.probe()
+        for stats in self.warm():
+            try:
+                with self._call_lock:
+                    self.connection(stats.url)
+            except Exception as e:
+                log.warning("Connecting to %s failed: %s" % (stats.url, str(e)))
+
+    def probe(self):
+        """ Obtain the head block of every warm node and eject the
+            ones that lag behind
+        """
+        heads = dict()
+        for stats in self.warm():
+            try:
+                with self._call_lock:
+                    start = time.time()
+                    connection = self.connection(stats.url)
+                    props = connection.get_dynamic_global_properties()
+                self.record(stats.url, latency=time.time() - start)
+                heads[stats.url] = props["head_block_number"]
+            except Exception as e:
+                log.warning("Probing %s failed: %s" % (stats.url, str(e)))
+                self.record(stats.url, error=True)
+        if not heads:
+            return
+        best = max(heads.values())
+        with self._lock:
+            for url, head in heads.items():
+                stats = self.stats[url]
+                stats.head_block_number = head
+                stats.head_block_lag = best - head
+                if stats.head_block_lag > self.max_head_lag:
+                    self.eject(
+                        url, "lagging ({} blocks)".format(stats.head_block_lag)
+                    )
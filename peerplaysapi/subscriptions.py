@@ -0,0 +1,85 @@
+class SubscriptionMatcher:
+    """ Matches object ids of notices against the subscribed objects
+
+        Exact ids (``1.25.120``) are looked up in a hash table and
+        wildcards (``1.25.x``) in a table indexed by space and type, so
+        matching does not depend on the number of subscriptions.
+
+        Every subscription can carry callbacks that are called instead of
+        the general ``on_object`` slot.
+
+        :param objects: list of object ids (wildcards allowed) or dictionary
+            that maps object ids to a callback or a list of callbacks
+    """
+
+    def __init__(self, objects=[]):
+        self.exact = dict()
+        self.wildcards = dict()
+        if isinstance(objects, dict):
+            for id, callbacks in objects.items():
+                if not isinstance(callbacks, (list, tuple)):
+                    callbacks = [callbacks]
+                self.add(id)
+                for callback in callbacks:
+                    self.add(id, callback)
+        else:
+            for id in objects:
+                self.add(id)
+
+    def _table(self, id):
+        space_type, _, instance = id.rpartition(".")
+        if instance == "x":
+            return self.wildcards, space_type
+        return self.exact, id
+
+    def add(self, id, callback=None):
+        """ Subscribe to an object id or wildcard
+
+            :param str id: Object id, e.g. ``1.25.120`` or ``1.25.x``
+            :param fnt callback: Optional callback for this subscription
+        """
+        table, key = self._table(id)
+        callbacks = table.setdefault(key, [])
+        if callback and callback not in callbacks:
+            callbacks.append(callback)
+
+    def remove(self, id, callback=None):
+        """ Remove a callback or, if no callback is given, the entire
+            subscription
+        """
+        table, key = self._table(id)
+        if callback is None:
+            table.pop(key, None)
+        elif callback in table.get(key, []):
+            table[key].remove(callback)
+
+    def match(self, id):
+        """ Returns the list of callbacks for ``id`` (which is empty if the
+            subscription has no callbacks of its own) or ``None`` if ``id``
+            is not subscribed to. If the exact id has no callbacks, those
+            of a matching wildcard are returned.
+        """
+        callbacks = self.exact.get(id)
+        if not callbacks:
+            wildcard = self.wildcards.get(id.rpartition(".")[0])
+            if wildcard is not None:
+                callbacks = wildcard
+        return callbacks
+
+    @property
+    def has_callbacks(self):
+        """ Is there any subscription with a callback of its own?
+        """
+        return any(self.exact.values()) or any(self.wildcards.values())
+
+    def __contains__(self, id):
+        return self.match(id) is not None
+
+    def __len__(self):
+        return len(self.exact) + len(self.wildcards)
+
+    def __iter__(self):
+        for id in self.exact:
+            yield id
+        for space_type in self.wildcards:
+            yield space_type + ".x"
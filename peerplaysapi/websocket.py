@@ -1,13 +1,15 @@
 import traceback
-import threading
 import ssl
 import time
 import json
 import logging
 import websocket
-from itertools import cycle
-from threading import Thread
+from itertools import count, cycle
+from threading import Event, Thread
 from .exceptions import NumRetriesReached
+from .nodepool import NodePool
+from .decoder import loads, notice_id
+from .subscriptions import SubscriptionMatcher
 from events import Events
 
 log = logging.getLogger(__name__)
@@ -17,13 +19,33 @@ log = logging.getLogger(__name__)
 class PeerPlaysWebsocket(Events):
     """ Create a websocket connection and request push notifications
 
-        :param str urls: Either a single Websocket URL, or a list of URLs
+        :param str urls: Either a single Websocket URL, a list of URLs, or a
+            :class:`peerplaysapi.nodepool.NodePool` to pick the best node from
         :param str user: Username for Authentication
         :param str password: Password for Authentication
         :param list accounts: list of account names or ids to get push notifications for
         :param list markets: list of asset_ids, e.g. ``[['1.3.0', '1.3.121']]``
         :param list objects: list of objects id's you'd like to be notified when changing
-        :param int keep_alive: seconds between a ping to the backend (defaults to 25seconds)
+            or dictionary that maps object ids to the callback(s) to call
+            instead of ``on_object``
+        :param int keep_alive: seconds between the websocket ping frames
+            sent to the backend (defaults to 25seconds)
+        :param str heartbeat: Only used by the asyncio client
+            (:class:`peerplaysapi.aio.websocket.PeerPlaysWebsocket`), which
+            sends the ping as cheap RPC call (``rpc``, default) or as
+            websocket ping frame (``ping``)
+        :param fnt decoder: Callable used to decode received messages
+            (defaults to :func:`peerplaysapi.decoder.loads` which makes use
+            of ``orjson`` or ``ujson`` if installed)
+        :param list raw_notices: Names of slots (e.g. ``["on_block"]``) that
+            are handed the raw, undecoded message of their notices. This
+            saves decoding messages that are merely forwarded or stored.
+        :param peerplaysapi.dispatcher.Dispatcher dispatcher: Hand the
+            notices over to a dispatcher that calls the slots away from the
+            websocket's thread (defaults to calling them inline)
+        :param bool coalesce_notices: Buffer object notices until the next
+            block and only emit the latest state of every object once per
+            block
 
         After instanciating this class, you can add event slots for:
 
@@ -32,9 +54,15 @@ class PeerPlaysWebsocket(Events):
         * ``on_block``
         * ``on_account``
         * ``on_market``
+        * ``on_broadcast``
+        * ``on_response``
 
         which will be called accordingly with the notification
-        message received from the PeerPlays node:
+        message received from the PeerPlays node. ``on_broadcast`` receives
+        the confirmations of transactions broadcast with
+        ``broadcast_transaction_with_callback`` and ``on_response`` the
+        (decoded) replies to RPC calls, whose request id is returned by
+        the call:
 
         .. code-block:: python
 
@@ -88,9 +116,26 @@ class PeerPlaysWebsocket(Events):
 
                 ['1.7.68612']
 
+        * ``on_broadcast``:
+
+            .. code-block:: js
+
+                {'id': '6b1e6ea2b0c3e1e5b1f2b6e2b1b7d8e6e5e3d2c1',
+                 'block_num': 6484461,
+                 'trx_num': 0,
+                 'trx': {...}}
+
     """
 
-    __events__ = ["on_tx", "on_object", "on_block", "on_account", "on_market"]
+    __events__ = [
+        "on_tx",
+        "on_object",
+        "on_block",
+        "on_account",
+        "on_market",
+        "on_broadcast",
+        "on_response",
+    ]
 
     def __init__(
         self,
@@ -107,18 +152,35 @@ class PeerPlaysWebsocket(Events):
         on_account=None,
         on_market=None,
         keep_alive=25,
+        heartbeat="rpc",
+        decoder=None,
+        raw_notices=[],
+        dispatcher=None,
+        coalesce_notices=False,
         num_retries=-1,
         **kwargs
     ):
 
         self.num_retries = num_retries
         self.keepalive = None
-        self._request_id = 0
+        self._request_ids = count(1)
         self.ws = None
         self.user = user
         self.password = password
         self.keep_alive = keep_alive
-        if isinstance(urls, cycle):
+        self.heartbeat = heartbeat
+        self.decoder = decoder or loads
+        self.raw_notices = set(raw_notices)
+        self.dispatcher = dispatcher
+        self.coalesce_notices = coalesce_notices
+        self._coalesced_notices = dict()
+        self.running = False
+        self.connected = self._make_event()
+        self.pool = None
+        if isinstance(urls, NodePool):
+            self.pool = urls
+            self.urls = cycle(urls.urls)
+        elif isinstance(urls, cycle):
             self.urls = urls
         elif isinstance(urls, list):
             self.urls = cycle(urls)
@@ -132,7 +194,7 @@ class PeerPlaysWebsocket(Events):
         # Store the objects we are interested in
         self.subscription_accounts = accounts
         self.subscription_markets = markets
-        self.subscription_objects = objects
+        self.subscription_objects = SubscriptionMatcher(objects)
 
         if on_tx:
             self.on_tx += on_tx
@@ -145,6 +207,25 @@ class PeerPlaysWebsocket(Events):
         if on_market:
             self.on_market += on_market
 
+    @classmethod
+    def for_rpc(cls, rpc, **kwargs):
+        """ Open a websocket of its own to the nodes of ``rpc``
+
+            :param peerplaysapi.node.PeerPlaysNodeRPC rpc: Connection whose
+                node pool (if any) or websocket urls are used
+        """
+        urls = rpc.pool or [
+            url for url in rpc.node_urls if url.startswith(("ws://", "wss://"))
+        ]
+        if not urls:
+            raise ValueError("Need a websocket url (ws:// or wss://)")
+        return cls(urls, user=rpc.user, password=rpc.password, **kwargs)
+
+    def _make_event(self):
+        """ Event that is set while the connection is established
+        """
+        return Event()
+
     def cancel_subscriptions(self):
         self.cancel_all_subscriptions()
 
@@ -163,13 +244,13 @@ class PeerPlaysWebsocket(Events):
 
         # Subscribe to events on the Backend and give them a
         # callback number that allows us to identify the event
-        if len(self.on_object):
+        if len(self.on_object) or self.subscription_objects.has_callbacks:
             self.set_subscribe_callback(self.__events__.index("on_object"), False)
 
         if len(self.on_tx):
             self.set_pending_transaction_callback(self.__events__.index("on_tx"))
 
-        if len(self.on_block):
+        if len(self.on_block) or self.coalesce_notices:
             self.set_block_applied_callback(self.__events__.index("on_block"))
 
         if self.subscription_accounts and self.on_account:
@@ -185,15 +266,24 @@ class PeerPlaysWebsocket(Events):
                     self.__events__.index("on_market"), market[0], market[1]
                 )
 
-        # We keep the connetion alive by requesting a short object
-        def ping(self):
-            while 1:
-                log.debug("Sending ping")
-                self.get_objects(["2.8.0"])
-                time.sleep(self.keep_alive)
+        self.connected.set()
+
+    def stop_keepalive(self):
+        if self.keepalive:
+            self.keepalive.stop()
+            self.keepalive = None
+
+    def subscribe_object(self, id, callback=None):
+        """ Subscribe to notices for an object id (or wildcard such as
+            ``1.25.x``). Notices are handed to ``callback`` if provided and
+            to the ``on_object`` slot otherwise.
+        """
+        self.subscription_objects.add(id, callback)
 
-        self.keepalive = threading.Thread(target=ping, args=(self,))
-        self.keepalive.start()
+    def unsubscribe_object(self, id, callback=None):
+        """ Remove a callback or the entire subscription of an object id
+        """
+        self.subscription_objects.remove(id, callback)
 
     def process_notice(self, notice):
         """ This method is called on notices that need processing. Here,
@@ -201,17 +291,52 @@ class PeerPlaysWebsocket(Events):
         """
         id = notice["id"]
 
-        _a, _b, _ = id.split(".")
+        if self.coalesce_notices:
+            # Only the latest state is emitted with the next block
+            self._coalesced_notices[id] = notice
+            return
+
+        self.emit_notice(notice)
+
+    def flush_notices(self):
+        """ Emit the notices that have been buffered since the last block
+        """
+        notices, self._coalesced_notices = self._coalesced_notices, dict()
+        for notice in notices.values():
+            try:
+                self.emit_notice(notice)
+            except Exception as e:
+                log.critical(
+                    "Error in process_notice: {}\n\n{}".format(
+                        str(e), traceback.format_exc()
+                    )
+                )
+
+    def emit_notice(self, notice):
+        """ Call the slots subscribed to the object of the notice
+        """
+        id = notice["id"]
 
-        if id in self.subscription_objects:
-            self.on_object(notice)
+        callbacks = self.subscription_objects.match(id)
+        if callbacks:
+            for callback in callbacks:
+                self.dispatch("on_object", callback, notice)
 
-        elif ".".join([_a, _b, "x"]) in self.subscription_objects:
-            self.on_object(notice)
+        elif callbacks is not None:
+            self.dispatch("on_object", self.on_object, notice)
 
         elif id[:4] == "2.6.":
             # Treat account updates separately
-            self.on_account(notice)
+            self.dispatch("on_account", self.on_account, notice)
+
+    def dispatch(self, name, callback, *args):
+        """ Call the slot ``callback`` of event type ``name`` or queue the
+            call in the dispatcher if there is one
+        """
+        if self.dispatcher:
+            self.dispatcher.submit(name, callback, *args)
+        else:
+            callback(*args)
 
     def on_message(self, ws, reply, *args):
         """ This method is called by the websocket connection on every
@@ -219,13 +344,49 @@ class PeerPlaysWebsocket(Events):
             hand over post-processing and signalling of events to
             ``process_notice``.
         """
-        log.debug("Received message: %s" % str(reply))
+        log.debug("Received message: %s", reply)
+        if self.keepalive:
+            self.keepalive.touch()
+        if self.process_raw_notice(reply):
+            return
         data = {}
         try:
-            data = json.loads(reply, strict=False)
+            data = self.decoder(reply)
         except ValueError:
             raise ValueError("API node returned invalid format. Expected JSON!")
 
+        self.process_message(data)
+
+    def process_raw_notice(self, reply):
+        """ Hand the undecoded message over to the slot if it is a notice
+            for one of the slots in ``raw_notices``. Returns ``True`` if the
+            message has been dispatched.
+        """
+        if not self.raw_notices:
+            return False
+        id = notice_id(reply)
+        if id is None or id >= len(self.__events__):
+            return False
+        callbackname = self.__events__[id]
+        if callbackname not in self.raw_notices:
+            return False
+        if callbackname == "on_block" and self._coalesced_notices:
+            self.flush_notices()
+        try:
+            self.dispatch(callbackname, getattr(self.events, callbackname), reply)
+        except Exception as e:
+            log.critical(
+                "Error in {}: {}\n\n{}".format(
+                    callbackname, str(e), traceback.format_exc()
+                )
+            )
+        return True
+
+    def process_message(self, data):
+        """ Dispatch an already decoded message. Notices are handed over
+            to the corresponding slots (or ``process_notice`` for object
+            changes), everything else is ignored.
+        """
         if data.get("method") == "notice":
             id = data["params"][0]
 
@@ -251,10 +412,14 @@ class PeerPlaysWebsocket(Events):
                             )
                         )
             else:
+                if id == self.__events__.index("on_block") and self._coalesced_notices:
+                    self.flush_notices()
                 try:
                     callbackname = self.__events__[id]
-                    log.info("Patching through to call %s" % callbackname)
-                    [getattr(self.events, callbackname)(x) for x in data["params"][1]]
+                    log.info("Patching through to call %s", callbackname)
+                    slot = getattr(self.events, callbackname)
+                    for x in data["params"][1]:
+                        self.dispatch(callbackname, slot, x)
                 except Exception as e:
                     log.critical(
                         "Error in {}: {}\n\n{}".format(
@@ -262,6 +427,16 @@ class PeerPlaysWebsocket(Events):
                         )
                     )
 
+        elif "id" in data and len(self.on_response):
+            try:
+                self.dispatch("on_response", self.on_response, data)
+            except Exception as e:
+                log.critical(
+                    "Error in on_response: {}\n\n{}".format(
+                        str(e), traceback.format_exc()
+                    )
+                )
+
     def on_error(self, ws, error):
         """ Called on websocket errors
         """
@@ -271,9 +446,16 @@ class PeerPlaysWebsocket(Events):
         """ Called when websocket connection is closed
         """
         log.debug("Closing WebSocket connection with {}".format(self.url))
-        if self.keepalive and self.keepalive.is_alive():
-            self.keepalive.do_run = False
-            self.keepalive.join()
+        self.connected.clear()
+        self.stop_keepalive()
+
+    def close(self):
+        """ Close the connection and stop :meth:`run_forever`
+        """
+        self.running = False
+        if self.ws:
+            self.ws.keep_running = False
+            self.ws.close()
 
     def run_forever(self):
         """ This method is used to run the websocket app continuously.
@@ -281,10 +463,11 @@ class PeerPlaysWebsocket(Events):
             connected with the provided APIs
         """
         cnt = 0
-        while True:
+        self.running = True
+        while self.running:
             cnt += 1
-            self.url = next(self.urls)
-            log.debug("Trying to connect to node %s" % self.url)
+            self.url = self.next_url()
+            log.debug("Trying to connect to node %s", self.url)
             try:
                 # websocket.enableTrace(True)
                 self.ws = websocket.WebSocketApp(
@@ -295,8 +478,11 @@ class PeerPlaysWebsocket(Events):
                     on_close=self.on_close,
                     on_open=self.on_open,
                 )
-                self.ws.run_forever()
+                # websocket-client keeps the connection alive with ping
+                # frames from its own loop
+                self.ws.run_forever(ping_interval=self.keep_alive)
             except websocket.WebSocketException as exc:
+                self.url_failed()
                 if self.num_retries >= 0 and cnt > self.num_retries:
                     raise NumRetriesReached()
 
@@ -316,9 +502,24 @@ class PeerPlaysWebsocket(Events):
             except Exception as e:
                 log.critical("{}\n\n{}".format(str(e), traceback.format_exc()))
 
+    def next_url(self):
+        """ The url to connect to next. If a node pool is used, this is the
+            best scoring node.
+        """
+        if self.pool:
+            return self.pool.select()
+        return next(self.urls)
+
+    def url_failed(self):
+        """ Let the node pool know that the connection to ``url`` failed
+        """
+        if self.pool:
+            self.pool.record(self.url, error=True)
+
     def get_request_id(self):
-        self._request_id += 1
-        return self._request_id
+        # Calls from other threads (e.g. broadcasts) allocate ids
+        # concurrently, next() of a count is atomic
+        return next(self._request_ids)
 
     """ RPC Calls
     """
@@ -329,9 +530,13 @@ class PeerPlaysWebsocket(Events):
             :param dict payload: Payload data
             :raises ValueError: if the server does not respond in proper JSON format
             :raises RPCError: if the server returns an error
+            :returns: the request id, the reply is dispatched to ``on_response``
         """
-        log.debug(json.dumps(payload))
+        log.debug("Sending: %s", payload)
+        if self.keepalive:
+            self.keepalive.touch()
         self.ws.send(json.dumps(payload, ensure_ascii=False).encode("utf8"))
+        return payload["id"]
 
     def __getattr__(self, name):
         """ Map all methods to RPC calls and pass through the arguments
@@ -365,7 +570,6 @@ class PeerPlaysWebsocket(Events):
                 "jsonrpc": "2.0",
                 "id": self.get_request_id(),
             }
-            r = self.rpcexec(query)
-            return r
+            return self.rpcexec(query)
 
         return method
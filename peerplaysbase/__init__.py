@@ -1,10 +1,13 @@
 __all__ = [
     "account",
     "chains",
+    "fees",
     "objects",
     "objecttypes",
     "operationids",
     "operations",
+    "schemas",
+    "serializer",
     "signedtransactions",
     "transactions",
     "memo",
@@ -0,0 +1,145 @@
+""" Computation of operation fees from the fee schedule of the chain
+
+    .. code-block:: python
+
+        from peerplaysbase.fees import FeeSchedule
+
+        properties = rpc.get_global_properties()
+        schedule = FeeSchedule(properties["parameters"]["current_fees"])
+        fees = schedule.calculate(ops)
+
+    Fees are computed the way the node computes them: the fee parameters of
+    the operation type, plus a fee per kilobyte of serialized data where the
+    fee parameters have a ``price_per_kbyte``, scaled by the schedule's
+    ``scale``. Operations whose fees depend on more than that are not
+    computed (``None``) and need to be obtained from the API.
+"""
+from graphenebase.objects import Operation as GrapheneOperation
+
+from . import schemas
+from .operationids import operations, ops as operation_names
+from .serializer import default_prefix, encode, encode_operation, write_varint
+
+GRAPHENE_100_PERCENT = 10000
+GRAPHENE_MAX_SHARE_SUPPLY = 1000000000000000
+
+
+def data_fee(size, price_per_kbyte):
+    """ Fee for ``size`` bytes of data
+    """
+    return size * price_per_kbyte // 1024
+
+
+def is_cheap_name(name):
+    """ Account names with a digit, a separator or without vowels are
+        registered at the basic fee
+    """
+    if any(c.isdigit() or c in ".-/" for c in name):
+        return True
+    return not any(c in "aeiouy" for c in name)
+
+
+def _default_fee(params, payload, size, prefix):
+    if not set(params) <= {"fee", "price_per_kbyte"}:
+        return None
+    return params["fee"] + data_fee(size(), params.get("price_per_kbyte", 0))
+
+
+def _memo_fee(params, payload, size, prefix):
+    fee = params["fee"]
+    if payload.get("memo"):
+        # The node charges the memo as optional field, i.e. with its flag
+        memo = encode(schemas.optional(schemas.memo), payload["memo"], prefix=prefix)
+        fee += data_fee(len(memo), params.get("price_per_kbyte", 0))
+    return fee
+
+
+def _account_create_fee(params, payload, size, prefix):
+    if is_cheap_name(payload["name"]):
+        fee = params["basic_fee"]
+    else:
+        fee = params["premium_fee"]
+    return fee + data_fee(size(), params["price_per_kbyte"])
+
+
+def _account_upgrade_fee(params, payload, size, prefix):
+    if payload["upgrade_to_lifetime_member"]:
+        return params["membership_lifetime_fee"]
+    return params["membership_annual_fee"]
+
+
+def _asset_create_fee(params, payload, size, prefix):
+    fee = {3: params["symbol3"], 4: params["symbol4"]}.get(
+        len(payload["symbol"]), params["long_symbol"]
+    )
+    return fee + data_fee(size(), params["price_per_kbyte"])
+
+
+#: Operations that are not charged by :func:`_default_fee`. Proposals are
+#: left to the API as their proposed operations are charged as well.
+fee_rules = {
+    "transfer": _memo_fee,
+    "asset_issue": _memo_fee,
+    "override_transfer": _memo_fee,
+    "account_create": _account_create_fee,
+    "account_upgrade": _account_upgrade_fee,
+    "asset_create": _asset_create_fee,
+    "proposal_create": None,
+}
+
+
+class FeeSchedule(dict):
+    """ Fee schedule as found in ``current_fees`` of the chain parameters
+
+        :param dict schedule: Fee schedule with ``parameters`` and ``scale``
+    """
+
+    def __init__(self, schedule):
+        dict.__init__(self, schedule)
+        self.parameters = {op_id: params for op_id, params in self["parameters"]}
+        self.scale = self.get("scale", GRAPHENE_100_PERCENT)
+
+    def core_fee(self, op, prefix=default_prefix):
+        """ Fee of an operation in the core asset
+
+            :param op: Operation as ``[id or name, payload]`` or
+                :class:`peerplaysbase.objects.Operation`
+            :param str prefix: Prefix of the public keys
+            :returns: The amount or ``None`` if the fee cannot be computed
+                locally
+        """
+        if isinstance(op, GrapheneOperation):
+            op_id, payload = op.id, op.json()[1]
+        else:
+            op_id, payload = op
+            op_id = operations.get(op_id, op_id)
+        params = self.parameters.get(op_id)
+        rule = fee_rules.get(operation_names[op_id], _default_fee)
+        if params is None or rule is None:
+            return None
+
+        def size():
+            # Serialized size of the operation without its type
+            if isinstance(op, GrapheneOperation):
+                data = bytes(op)
+            else:
+                data = encode_operation(op, prefix=prefix)
+            tag = bytearray()
+            write_varint(tag, op_id)
+            return len(data) - len(tag)
+
+        fee = rule(params, payload, size, prefix)
+        if fee is None:
+            return None
+        return min(fee * self.scale // GRAPHENE_100_PERCENT, GRAPHENE_MAX_SHARE_SUPPLY)
+
+    def calculate(self, ops, prefix=default_prefix):
+        """ Fees of many operations in the core asset
+
+            :returns: List of amounts, or ``None`` if any of the fees cannot
+                be computed locally
+        """
+        fees = [self.core_fee(op, prefix=prefix) for op in ops]
+        if any(fee is None for fee in fees):
+            return None
+        return fees
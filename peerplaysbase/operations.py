@@ -1615,7 +1615,15 @@ class Nft_mint(GrapheneObject):
                         ("nft_metadata_id", ObjectId(kwargs["nft_metadata_id"])),
                         ("owner", ObjectId(kwargs["owner"], "account")),
                         ("approved", ObjectId(kwargs["approved"], "account")),
-                        ("approved_operators", Set([])),
+                        (
+                            "approved_operators",
+                            Array(
+                                [
+                                    ObjectId(x, "account")
+                                    for x in kwargs.get("approved_operators", [])
+                                ]
+                            ),
+                        ),
                         ("token_uri", String(kwargs["token_uri"])),
                         ("extensions", Set([])),
                     ]
@@ -0,0 +1,570 @@
+""" Declarative wire format of transactions and operations
+
+    Every schema describes the fields of a graphene object in the order in
+    which they are serialized. Types are either the name of a primitive
+    type (e.g. ``"uint32"``) or a tuple created with the helpers below.
+    The schemas are used by :mod:`peerplaysbase.serializer` to decode (and
+    encode) the binary representation of transactions.
+"""
+from .objects import (
+    BetType,
+    BettingMarketResolution,
+    BettingMarketGroupStatus,
+    EventStatus,
+    Rock_paper_scissors_gesture,
+)
+from .objecttypes import object_type
+from .operationids import operations
+
+
+def struct(*fields):
+    return ("struct", fields)
+
+
+def optional(type):
+    return ("optional", type)
+
+
+def array(type, sort=False):
+    """ :param bool sort: Items are serialized uniquely and in canonical order
+    """
+    return ("array", type, sort)
+
+
+def mapping(key, value, sort=False):
+    """ :param bool sort: Items are serialized in the canonical order of
+        their keys
+    """
+    return ("map", key, value, sort)
+
+
+def object_id(type, space=1):
+    """ Protocol id that is serialized as its instance only
+    """
+    if not isinstance(type, int):
+        type = object_type[type]
+    return ("object_id", space, type)
+
+
+def enum(klass):
+    return ("enum", tuple(klass.options))
+
+
+def static_variant(*types):
+    return ("static_variant", types)
+
+
+#: Extensions are not supported and need to be empty
+extensions = ("extensions",)
+
+#: Placeholder for types that this library cannot serialize
+unsupported = ("unsupported",)
+
+account = object_id("account")
+asset_id = object_id("asset")
+# The ``bet`` type is missing from objecttypes due to a typo
+bet = object_id(26)
+full_object_id = "full_object_id"
+names = mapping("string", "string", sort=True)
+
+asset = struct(("amount", "int64"), ("asset_id", asset_id))
+
+price = struct(("base", asset), ("quote", asset))
+
+memo = struct(
+    ("from", "public_key"),
+    ("to", "public_key"),
+    ("nonce", "uint64"),
+    ("message", "bytes"),
+)
+
+authority = struct(
+    ("weight_threshold", "uint32"),
+    ("account_auths", mapping(account, "uint16")),
+    ("key_auths", mapping("public_key", "uint16", sort=True)),
+    ("address_auths", extensions),
+)
+
+account_options = struct(
+    ("memo_key", "public_key"),
+    ("voting_account", account),
+    ("num_witness", "uint16"),
+    ("num_committee", "uint16"),
+    ("votes", array("vote_id", sort=True)),
+    ("extensions", extensions),
+)
+
+asset_options = struct(
+    ("max_supply", "int64"),
+    ("market_fee_percent", "uint16"),
+    ("max_market_fee", "int64"),
+    ("issuer_permissions", "uint16"),
+    ("flags", "uint16"),
+    ("core_exchange_rate", price),
+    ("whitelist_authorities", array(account)),
+    ("blacklist_authorities", array(account)),
+    ("whitelist_markets", array(asset_id)),
+    ("blacklist_markets", array(asset_id)),
+    ("description", "string"),
+    ("extensions", extensions),
+)
+
+bitasset_options = struct(
+    ("feed_lifetime_sec", "uint32"),
+    ("minimum_feeds", "uint8"),
+    ("force_settlement_delay_sec", "uint32"),
+    ("force_settlement_offset_percent", "uint16"),
+    ("maximum_force_settlement_volume", "uint16"),
+    ("short_backing_asset", asset_id),
+    ("extensions", extensions),
+)
+
+game_specific_options = static_variant(
+    # rock_paper_scissors_game_options
+    struct(
+        ("insurance_enabled", "bool"),
+        ("time_per_commit_move", "uint32"),
+        ("time_per_reveal_move", "uint32"),
+        ("number_of_gestures", "uint8"),
+    )
+)
+
+game_specific_moves = static_variant(
+    # rock_paper_scissors_throw_commit
+    struct(("nonce1", "uint64"), ("throw_hash", "sha256")),
+    # rock_paper_scissors_throw_reveal
+    struct(("nonce2", "uint64"), ("gesture", enum(Rock_paper_scissors_gesture))),
+)
+
+tournament_options = struct(
+    ("registration_deadline", "time"),
+    ("number_of_players", "uint32"),
+    ("buy_in", asset),
+    ("whitelist", array(account)),
+    ("start_time", optional("time")),
+    ("start_delay", optional("uint32")),
+    ("round_delay", "uint32"),
+    ("number_of_wins", "uint32"),
+    ("meta", optional(unsupported)),
+    ("game_options", game_specific_options),
+)
+
+#: Fields of the operations by operation name
+operation_schemas = {
+    "transfer": struct(
+        ("fee", asset),
+        ("from", account),
+        ("to", account),
+        ("amount", asset),
+        ("memo", optional(memo)),
+        ("extensions", extensions),
+    ),
+    "limit_order_create": struct(
+        ("fee", asset),
+        ("seller", account),
+        ("amount_to_sell", asset),
+        ("min_to_receive", asset),
+        ("expiration", "time"),
+        ("fill_or_kill", "bool"),
+        ("extensions", extensions),
+    ),
+    "limit_order_cancel": struct(
+        ("fee", asset),
+        ("fee_paying_account", account),
+        ("order", object_id("limit_order")),
+        ("extensions", extensions),
+    ),
+    "account_create": struct(
+        ("fee", asset),
+        ("registrar", account),
+        ("referrer", account),
+        ("referrer_percent", "uint16"),
+        ("name", "string"),
+        ("owner", authority),
+        ("active", authority),
+        ("options", account_options),
+        ("extensions", extensions),
+    ),
+    "account_update": struct(
+        ("fee", asset),
+        ("account", account),
+        ("owner", optional(authority)),
+        ("active", optional(authority)),
+        ("new_options", optional(account_options)),
+        ("extensions", extensions),
+    ),
+    "account_upgrade": struct(
+        ("fee", asset),
+        ("account_to_upgrade", account),
+        ("upgrade_to_lifetime_member", "bool"),
+        ("extensions", extensions),
+    ),
+    "asset_create": struct(
+        ("fee", asset),
+        ("issuer", account),
+        ("symbol", "string"),
+        ("precision", "uint8"),
+        ("common_options", asset_options),
+        ("bitasset_opts", optional(bitasset_options)),
+        ("is_prediction_market", "bool"),
+        ("extensions", extensions),
+    ),
+    "asset_update": struct(
+        ("fee", asset),
+        ("issuer", account),
+        ("asset_to_update", asset_id),
+        ("new_issuer", optional(account)),
+        ("new_options", asset_options),
+        ("extensions", extensions),
+    ),
+    "asset_update_bitasset": struct(
+        ("fee", asset),
+        ("issuer", account),
+        ("asset_to_update", asset_id),
+        ("new_options", bitasset_options),
+        ("extensions", extensions),
+    ),
+    "asset_issue": struct(
+        ("fee", asset),
+        ("issuer", account),
+        ("asset_to_issue", asset),
+        ("issue_to_account", account),
+        ("memo", optional(memo)),
+        ("extensions", extensions),
+    ),
+    "proposal_create": struct(
+        ("fee", asset),
+        ("fee_paying_account", account),
+        ("expiration_time", "time"),
+        ("proposed_ops", array(struct(("op", "operation")))),
+        ("review_period_seconds", optional("uint32")),
+        ("extensions", extensions),
+    ),
+    "proposal_update": struct(
+        ("fee", asset),
+        ("fee_paying_account", account),
+        ("proposal", object_id("proposal")),
+        ("active_approvals_to_add", array(account)),
+        ("active_approvals_to_remove", array(account)),
+        ("owner_approvals_to_add", array(account)),
+        ("owner_approvals_to_remove", array(account)),
+        ("key_approvals_to_add", array("public_key")),
+        ("key_approvals_to_remove", array("public_key")),
+        ("extensions", extensions),
+    ),
+    "proposal_delete": struct(
+        ("fee", asset),
+        ("fee_paying_account", account),
+        ("using_owner_authority", "bool"),
+        ("proposal", object_id("proposal")),
+        ("extensions", extensions),
+    ),
+    "balance_claim": struct(
+        ("fee", asset),
+        ("deposit_to_account", account),
+        ("balance_to_claim", object_id("balance")),
+        ("balance_owner_key", "public_key"),
+        ("total_claimed", asset),
+    ),
+    "tournament_create": struct(
+        ("fee", asset),
+        ("creator", account),
+        ("options", tournament_options),
+        ("extensions", extensions),
+    ),
+    "tournament_join": struct(
+        ("fee", asset),
+        ("payer_account_id", account),
+        ("player_account_id", account),
+        ("tournament_id", object_id("tournament")),
+        ("buy_in", asset),
+        ("extensions", extensions),
+    ),
+    "game_move": struct(
+        ("fee", asset),
+        ("game_id", object_id("game")),
+        ("player_account_id", account),
+        ("move", game_specific_moves),
+        ("extensions", extensions),
+    ),
+    "tournament_leave": struct(
+        ("fee", asset),
+        ("canceling_account_id", account),
+        ("player_account_id", account),
+        ("tournament_id", object_id("tournament")),
+        ("extensions", extensions),
+    ),
+    "sport_create": struct(
+        ("fee", asset), ("name", names), ("extensions", extensions)
+    ),
+    "sport_update": struct(
+        ("fee", asset),
+        ("sport_id", object_id("sport")),
+        ("new_name", optional(names)),
+        ("extensions", extensions),
+    ),
+    "sport_delete": struct(
+        ("fee", asset), ("sport_id", object_id("sport")), ("extensions", extensions)
+    ),
+    "event_group_create": struct(
+        ("fee", asset),
+        ("name", names),
+        ("sport_id", full_object_id),
+        ("extensions", extensions),
+    ),
+    "event_group_update": struct(
+        ("fee", asset),
+        ("new_sport_id", optional(full_object_id)),
+        ("new_name", optional(names)),
+        ("event_group_id", object_id("event_group")),
+        ("extensions", extensions),
+    ),
+    "event_group_delete": struct(
+        ("fee", asset),
+        ("event_group_id", object_id("event_group")),
+        ("extensions", extensions),
+    ),
+    "event_create": struct(
+        ("fee", asset),
+        ("name", names),
+        ("season", names),
+        ("start_time", optional("time")),
+        ("event_group_id", full_object_id),
+        ("extensions", extensions),
+    ),
+    "event_update": struct(
+        ("fee", asset),
+        ("event_id", object_id("event")),
+        ("new_event_group_id", optional(full_object_id)),
+        ("new_name", optional(names)),
+        ("new_season", optional(names)),
+        ("new_start_time", optional("time")),
+        ("new_status", optional(enum(EventStatus))),
+        ("extensions", extensions),
+    ),
+    "event_update_status": struct(
+        ("fee", asset),
+        ("event_id", object_id("event")),
+        ("status", enum(EventStatus)),
+        ("scores", array("string")),
+        ("extensions", extensions),
+    ),
+    "betting_market_rules_create": struct(
+        ("fee", asset),
+        ("name", names),
+        ("description", names),
+        ("extensions", extensions),
+    ),
+    "betting_market_rules_update": struct(
+        ("fee", asset),
+        ("new_name", optional(names)),
+        ("new_description", optional(names)),
+        ("extensions", extensions),
+        ("betting_market_rules_id", object_id("betting_market_rules")),
+    ),
+    "betting_market_group_create": struct(
+        ("fee", asset),
+        ("description", names),
+        ("event_id", full_object_id),
+        ("rules_id", full_object_id),
+        ("asset_id", asset_id),
+        ("never_in_play", "bool"),
+        ("delay_before_settling", "uint32"),
+        ("extensions", extensions),
+    ),
+    "betting_market_group_update": struct(
+        ("fee", asset),
+        ("betting_market_group_id", object_id("betting_market_group")),
+        ("new_description", optional(names)),
+        ("new_rules_id", optional(full_object_id)),
+        ("status", optional(enum(BettingMarketGroupStatus))),
+        ("extensions", extensions),
+    ),
+    "betting_market_create": struct(
+        ("fee", asset),
+        ("group_id", full_object_id),
+        ("description", names),
+        ("payout_condition", names),
+        ("extensions", extensions),
+    ),
+    "betting_market_update": struct(
+        ("fee", asset),
+        ("betting_market_id", object_id("betting_market")),
+        ("new_group_id", optional(full_object_id)),
+        ("new_description", optional(names)),
+        ("new_payout_condition", optional(names)),
+        ("extensions", extensions),
+    ),
+    "betting_market_group_resolve": struct(
+        ("fee", asset),
+        ("betting_market_group_id", object_id("betting_market_group")),
+        (
+            "resolutions",
+            mapping(
+                object_id("betting_market"), enum(BettingMarketResolution), sort=True
+            ),
+        ),
+        ("extensions", extensions),
+    ),
+    "bet_place": struct(
+        ("fee", asset),
+        ("bettor_id", account),
+        ("betting_market_id", object_id("betting_market")),
+        ("amount_to_bet", asset),
+        ("backer_multiplier", "uint32"),
+        ("back_or_lay", enum(BetType)),
+        ("extensions", extensions),
+    ),
+    "bet_cancel": struct(
+        ("fee", asset),
+        ("bettor_id", account),
+        ("bet_to_cancel", bet),
+        ("extensions", extensions),
+    ),
+    "custom_permission_create": struct(
+        ("fee", asset),
+        ("owner_account", account),
+        ("permission_name", "string"),
+        ("auth", authority),
+        ("extensions", extensions),
+    ),
+    "custom_permission_update": struct(
+        ("fee", asset),
+        ("permission_id", object_id("custom_permission")),
+        ("new_auth", optional(authority)),
+        ("owner_account", account),
+        ("extensions", extensions),
+    ),
+    "custom_permission_delete": struct(
+        ("fee", asset),
+        ("permission_id", object_id("custom_permission")),
+        ("owner_account", account),
+        ("extensions", extensions),
+    ),
+    "custom_account_authority_create": struct(
+        ("fee", asset),
+        ("permission_id", object_id("custom_permission")),
+        ("operation_type", "uint32"),
+        ("valid_from", "time"),
+        ("valid_to", "time"),
+        ("owner_account", account),
+        ("extensions", extensions),
+    ),
+    "custom_account_authority_update": struct(
+        ("fee", asset),
+        ("auth_id", object_id("custom_account_authority")),
+        ("new_valid_from", optional("time")),
+        ("new_valid_to", optional("time")),
+        ("owner_account", account),
+        ("extensions", extensions),
+    ),
+    "custom_account_authority_delete": struct(
+        ("fee", asset),
+        ("auth_id", object_id("custom_account_authority")),
+        ("owner_account", account),
+        ("extensions", extensions),
+    ),
+    "offer": struct(
+        ("fee", asset),
+        ("item_ids", array(object_id("nft_object_type"))),
+        ("issuer", account),
+        ("minimum_price", asset),
+        ("maximum_price", asset),
+        ("buying_item", "bool"),
+        ("offer_expiration_date", "time"),
+        ("memo", optional(memo)),
+        ("extensions", extensions),
+    ),
+    "bid": struct(
+        ("fee", asset),
+        ("bidder", account),
+        ("bid_price", asset),
+        ("offer_id", object_id("offer_object_type")),
+        ("extensions", extensions),
+    ),
+    "cancel_offer": struct(
+        ("fee", asset),
+        ("issuer", account),
+        ("offer_id", object_id("offer_object_type")),
+        ("extensions", extensions),
+    ),
+    "nft_metadata_create": struct(
+        ("fee", asset),
+        ("owner", account),
+        ("name", "string"),
+        ("symbol", "string"),
+        ("base_uri", "string"),
+        ("revenue_partner", optional(account)),
+        ("revenue_split", optional("uint16")),
+        ("is_transferable", "bool"),
+        ("is_sellable", "bool"),
+        ("role_id", optional(unsupported)),
+        ("max_supply", optional("int64")),
+        ("lottery_options", optional(unsupported)),
+        ("extensions", extensions),
+    ),
+    "nft_metadata_update": struct(
+        ("fee", asset),
+        ("owner", account),
+        ("nft_metadata_id", object_id("nft_metadata_type")),
+        ("name", optional("string")),
+        ("symbol", optional("string")),
+        ("base_uri", optional("string")),
+        ("revenue_partner", optional(account)),
+        ("revenue_split", optional("uint16")),
+        ("is_transferable", optional("bool")),
+        ("is_sellable", optional("bool")),
+        ("role_id", optional(unsupported)),
+        ("extensions", extensions),
+    ),
+    "nft_mint": struct(
+        ("fee", asset),
+        ("payer", account),
+        ("nft_metadata_id", object_id("nft_metadata_type")),
+        ("owner", account),
+        ("approved", account),
+        ("approved_operators", array(account)),
+        ("token_uri", "string"),
+        ("extensions", extensions),
+    ),
+    "nft_safe_transfer_from": struct(
+        ("fee", asset),
+        ("operator_", account),
+        ("from", account),
+        ("to", account),
+        ("token_id", object_id("nft_object_type")),
+        ("data", "string"),
+        ("extensions", extensions),
+    ),
+    "nft_approve": struct(
+        ("fee", asset),
+        ("operator_", account),
+        ("approved", account),
+        ("token_id", object_id("nft_object_type")),
+        ("extensions", extensions),
+    ),
+    "nft_set_approval_for_all": struct(
+        ("fee", asset),
+        ("owner", account),
+        ("operator_", account),
+        ("approved", "bool"),
+        ("extensions", extensions),
+    ),
+}
+
+#: Fields of the operations by operation id
+operation_schemas_by_id = {
+    operations[name]: schema for name, schema in operation_schemas.items()
+}
+
+transaction = struct(
+    ("ref_block_num", "uint16"),
+    ("ref_block_prefix", "uint32"),
+    ("expiration", "time"),
+    ("operations", array("operation")),
+    ("extensions", extensions),
+)
+
+signed_transaction = struct(
+    *(transaction[1] + (("signatures", array("signature")),))
+)
@@ -0,0 +1,639 @@
+""" Binary (de)serialization driven by the schemas in
+    :mod:`peerplaysbase.schemas`
+
+    .. code-block:: python
+
+        from peerplaysbase.serializer import decode_transaction
+
+        tx = decode_transaction(rpc.get_transaction_hex(tx))
+        print(tx["operations"])
+
+    Readers and writers are compiled once per schema (and key prefix) into
+    nested closures, so (de)serialization does not need to interpret the
+    schema again. Writers append to a single ``bytearray`` instead of
+    building the wrapper objects of :mod:`peerplaysbase.operations`.
+
+    Some optional fields (the ``role_id`` and ``lottery_options`` of NFT
+    metadata and the ``meta`` of tournaments) are not supported, neither
+    here nor in :mod:`peerplaysbase.operations`. Data where they are set
+    raises :class:`UnsupportedTypeError`.
+"""
+import struct
+import time
+from binascii import hexlify, unhexlify
+from calendar import timegm
+from .account import PublicKey
+from .objects import Operation
+from .operationids import operations
+from .schemas import (
+    operation_schemas,
+    operation_schemas_by_id,
+    signed_transaction,
+    transaction,
+)
+
+default_prefix = "PPY"
+
+_uint8 = struct.Struct("<B")
+_uint16 = struct.Struct("<H")
+_uint32 = struct.Struct("<I")
+_uint64 = struct.Struct("<Q")
+_int16 = struct.Struct("<h")
+_int64 = struct.Struct("<q")
+_double = struct.Struct("<d")
+
+#: Marks optional fields that are not present
+_absent = object()
+
+
+class UnsupportedTypeError(ValueError):
+    """ The data contains a value of a type that cannot be (de)serialized
+    """
+
+    pass
+
+
+def read_varint(buf, pos):
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if not b & 0x80:
+            return result, pos
+        shift += 7
+
+
+def _fixed(packer):
+    size = packer.size
+    unpack_from = packer.unpack_from
+
+    def read(buf, pos):
+        return unpack_from(buf, pos)[0], pos + size
+
+    return read
+
+
+def _read_bool(buf, pos):
+    return bool(buf[pos]), pos + 1
+
+
+def _read_string(buf, pos):
+    length, pos = read_varint(buf, pos)
+    return bytes(buf[pos : pos + length]).decode("utf-8"), pos + length
+
+
+def _read_bytes(buf, pos):
+    length, pos = read_varint(buf, pos)
+    return hexlify(buf[pos : pos + length]).decode("ascii"), pos + length
+
+
+def _hex(size):
+    def read(buf, pos):
+        return hexlify(buf[pos : pos + size]).decode("ascii"), pos + size
+
+    return read
+
+
+def _read_time(buf, pos):
+    value = _uint32.unpack_from(buf, pos)[0]
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(value)), pos + 4
+
+
+def _read_vote_id(buf, pos):
+    value = _uint32.unpack_from(buf, pos)[0]
+    return "%d:%d" % (value & 0xFF, value >> 8), pos + 4
+
+
+def _read_full_object_id(buf, pos):
+    value = _uint64.unpack_from(buf, pos)[0]
+    return (
+        "%d.%d.%d" % (value >> 56, (value >> 48) & 0xFF, value & 0xFFFFFFFFFFFF),
+        pos + 8,
+    )
+
+
+def _read_extensions(buf, pos):
+    count, pos = read_varint(buf, pos)
+    if count:
+        raise ValueError("Extensions are not supported")
+    return [], pos
+
+
+def _read_unsupported(buf, pos):
+    raise UnsupportedTypeError("Type can not be deserialized")
+
+
+def _public_key(prefix):
+    def read(buf, pos):
+        key = hexlify(buf[pos : pos + 33]).decode("ascii")
+        return str(PublicKey(key, prefix=prefix)), pos + 33
+
+    return read
+
+
+_primitives = {
+    "uint8": _fixed(_uint8),
+    "uint16": _fixed(_uint16),
+    "uint32": _fixed(_uint32),
+    "uint64": _fixed(_uint64),
+    "int16": _fixed(_int16),
+    "int64": _fixed(_int64),
+    "double": _fixed(_double),
+    "varint32": read_varint,
+    "bool": _read_bool,
+    "string": _read_string,
+    "bytes": _read_bytes,
+    "sha256": _hex(32),
+    "signature": _hex(65),
+    "time": _read_time,
+    "vote_id": _read_vote_id,
+    "full_object_id": _read_full_object_id,
+}
+
+_readers = dict()
+
+
+def reader(schema, prefix=default_prefix):
+    """ Returns a function ``read(buf, pos) -> (value, pos)`` that decodes
+        ``schema`` from ``buf`` at position ``pos``
+    """
+    key = (schema, prefix)
+    if key not in _readers:
+        _readers[key] = _compile_reader(schema, prefix)
+    return _readers[key]
+
+
+def _compile_reader(schema, prefix):
+    if isinstance(schema, str):
+        if schema == "public_key":
+            return _public_key(prefix)
+        if schema == "operation":
+            return _operation_reader(prefix)
+        return _primitives[schema]
+
+    kind = schema[0]
+    if kind == "extensions":
+        return _read_extensions
+
+    elif kind == "unsupported":
+        return _read_unsupported
+
+    elif kind == "object_id":
+        prefix_id = "%d.%d." % (schema[1], schema[2])
+
+        def read(buf, pos):
+            instance, pos = read_varint(buf, pos)
+            return prefix_id + str(instance), pos
+
+        return read
+
+    elif kind == "enum":
+        options = schema[1]
+
+        def read(buf, pos):
+            value, pos = read_varint(buf, pos)
+            # zigzag decoding
+            return options[(value >> 1) ^ -(value & 1)], pos
+
+        return read
+
+    elif kind == "optional":
+        read_value = reader(schema[1], prefix)
+
+        def read(buf, pos):
+            if not buf[pos]:
+                return _absent, pos + 1
+            return read_value(buf, pos + 1)
+
+        return read
+
+    elif kind == "array":
+        read_item = reader(schema[1], prefix)
+
+        def read(buf, pos):
+            count, pos = read_varint(buf, pos)
+            items = []
+            for _ in range(count):
+                item, pos = read_item(buf, pos)
+                items.append(item)
+            return items, pos
+
+        return read
+
+    elif kind == "map":
+        read_key = reader(schema[1], prefix)
+        read_value = reader(schema[2], prefix)
+
+        def read(buf, pos):
+            count, pos = read_varint(buf, pos)
+            items = []
+            for _ in range(count):
+                key, pos = read_key(buf, pos)
+                value, pos = read_value(buf, pos)
+                items.append([key, value])
+            return items, pos
+
+        return read
+
+    elif kind == "static_variant":
+        read_types = [reader(x, prefix) for x in schema[1]]
+
+        def read(buf, pos):
+            type_id, pos = read_varint(buf, pos)
+            if type_id >= len(read_types):
+                raise ValueError("Unknown static variant {}".format(type_id))
+            value, pos = read_types[type_id](buf, pos)
+            return [type_id, value], pos
+
+        return read
+
+    elif kind == "struct":
+        fields = [(name, reader(type, prefix)) for name, type in schema[1]]
+
+        def read(buf, pos):
+            obj = dict()
+            for name, read_field in fields:
+                value, pos = read_field(buf, pos)
+                if value is not _absent:
+                    obj[name] = value
+            return obj, pos
+
+        return read
+
+    raise ValueError("Unknown schema {}".format(schema))
+
+
+def _operation_reader(prefix):
+    read_ops = dict()
+
+    def read(buf, pos):
+        op_id, pos = read_varint(buf, pos)
+        if op_id not in read_ops:
+            if op_id not in operation_schemas_by_id:
+                raise ValueError("Operation {} is not supported".format(op_id))
+            read_ops[op_id] = reader(operation_schemas_by_id[op_id], prefix)
+        op, pos = read_ops[op_id](buf, pos)
+        return [op_id, op], pos
+
+    return read
+
+
+def decode(schema, data, prefix=default_prefix):
+    """ Decode ``data`` (bytes or hex string) according to ``schema``
+
+        :raises ValueError: if the data does not match the schema
+        :raises UnsupportedTypeError: if the data contains a value that
+            cannot be deserialized
+    """
+    if isinstance(data, str):
+        data = unhexlify(data)
+    buf = memoryview(data)
+    try:
+        value, pos = reader(schema, prefix)(buf, 0)
+    except (IndexError, KeyError, struct.error) as e:
+        raise ValueError("Data does not match the schema: {}".format(str(e)))
+    if pos != len(buf):
+        raise ValueError("{} trailing bytes".format(len(buf) - pos))
+    return value
+
+
+def decode_operation(data, prefix=default_prefix):
+    """ Decode a serialized operation into ``[id, payload]``
+    """
+    return decode("operation", data, prefix=prefix)
+
+
+def decode_transaction(data, prefix=default_prefix, signed=True):
+    """ Decode a serialized (signed) transaction into the same dictionary
+        the API returns for it
+
+        :param data: Serialized transaction as bytes or hex string
+        :param str prefix: Prefix of the public keys
+        :param bool signed: The data contains signatures
+    """
+    return decode(signed_transaction if signed else transaction, data, prefix=prefix)
+
+
+# Writers
+
+
+def write_varint(out, value):
+    value = int(value)
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _pack(packer):
+    pack = packer.pack
+
+    def write(out, value):
+        out += pack(value)
+
+    return write
+
+
+def _pack_int(packer):
+    pack = packer.pack
+
+    def write(out, value):
+        out += pack(int(value))
+
+    return write
+
+
+def _write_bool(out, value):
+    out.append(1 if value else 0)
+
+
+def _write_string(out, value):
+    value = value.encode("utf-8")
+    write_varint(out, len(value))
+    out += value
+
+
+def _write_bytes(out, value):
+    value = unhexlify(value)
+    write_varint(out, len(value))
+    out += value
+
+
+def _write_hex(out, value):
+    out += unhexlify(value)
+
+
+def _write_time(out, value):
+    out += _uint32.pack(timegm(time.strptime(value + "UTC", "%Y-%m-%dT%H:%M:%S%Z")))
+
+
+def _write_vote_id(out, value):
+    type, instance = value.split(":")
+    out += _uint32.pack((int(type) & 0xFF) | (int(instance) << 8))
+
+
+def _write_full_object_id(out, value):
+    space, type, instance = value.split(".")
+    out += _uint64.pack(int(space) << 56 | int(type) << 48 | int(instance))
+
+
+def _write_extensions(out, value):
+    # Like the operation classes, extensions are always serialized empty
+    out.append(0)
+
+
+def _write_unsupported(out, value):
+    raise UnsupportedTypeError("Type can not be serialized")
+
+
+def _write_public_key(prefix):
+    keys = dict()
+
+    def write(out, value):
+        if value not in keys:
+            keys[value] = bytes(PublicKey(value, prefix=prefix))
+        out += keys[value]
+
+    return write
+
+
+_primitive_writers = {
+    "uint8": _pack_int(_uint8),
+    "uint16": _pack_int(_uint16),
+    "uint32": _pack_int(_uint32),
+    "uint64": _pack_int(_uint64),
+    "int16": _pack_int(_int16),
+    "int64": _pack_int(_int64),
+    "double": _pack(_double),
+    "varint32": write_varint,
+    "bool": _write_bool,
+    "string": _write_string,
+    "bytes": _write_bytes,
+    "sha256": _write_hex,
+    "signature": _write_hex,
+    "time": _write_time,
+    "vote_id": _write_vote_id,
+    "full_object_id": _write_full_object_id,
+}
+
+_writers = dict()
+
+
+def writer(schema, prefix=default_prefix):
+    """ Returns a function ``write(out, value)`` that appends ``value``
+        serialized according to ``schema`` to the bytearray ``out``
+    """
+    key = (schema, prefix)
+    if key not in _writers:
+        _writers[key] = _compile_writer(schema, prefix)
+    return _writers[key]
+
+
+def _sort_key(schema, prefix):
+    """ Canonical order of items as established by the operation classes
+    """
+    if schema == "public_key":
+        return lambda x: repr(PublicKey(x, prefix=prefix).address)
+    elif schema == "vote_id":
+        return lambda x: float(x.split(":")[1])
+    elif schema[0] == "object_id":
+        return lambda x: int(x.split(".")[2])
+    return repr
+
+
+def _compile_writer(schema, prefix):
+    if isinstance(schema, str):
+        if schema == "public_key":
+            return _write_public_key(prefix)
+        if schema == "operation":
+            return _operation_writer(prefix)
+        return _primitive_writers[schema]
+
+    kind = schema[0]
+    if kind == "extensions":
+        return _write_extensions
+
+    elif kind == "unsupported":
+        return _write_unsupported
+
+    elif kind == "object_id":
+        prefix_id = "%d.%d." % (schema[1], schema[2])
+        offset = len(prefix_id)
+
+        def write(out, value):
+            if not value.startswith(prefix_id):
+                raise ValueError(
+                    "Object id {} needs to start with {}".format(value, prefix_id)
+                )
+            write_varint(out, value[offset:])
+
+        return write
+
+    elif kind == "enum":
+        options = dict((option, i) for i, option in enumerate(schema[1]))
+
+        def write(out, value):
+            if value not in options:
+                raise ValueError(
+                    "Options are {}. Given '{}'".format(list(schema[1]), value)
+                )
+            # zigzag encoding
+            i = options[value]
+            write_varint(out, (i >> 31) ^ (i << 1))
+
+        return write
+
+    elif kind == "optional":
+        write_value = writer(schema[1], prefix)
+
+        def write(out, value):
+            if value is None:
+                out.append(0)
+            else:
+                out.append(1)
+                write_value(out, value)
+
+        return write
+
+    elif kind == "array":
+        write_item = writer(schema[1], prefix)
+        sort_key = _sort_key(schema[1], prefix) if schema[2:] and schema[2] else None
+
+        def write(out, value):
+            if sort_key:
+                value = sorted(set(value), key=sort_key)
+            write_varint(out, len(value))
+            for item in value:
+                write_item(out, item)
+
+        return write
+
+    elif kind == "map":
+        write_key = writer(schema[1], prefix)
+        write_value = writer(schema[2], prefix)
+        sort_key = _sort_key(schema[1], prefix) if schema[3:] and schema[3] else None
+
+        def write(out, value):
+            if isinstance(value, dict):
+                value = list(value.items())
+            if sort_key:
+                value = sorted(value, key=lambda x: sort_key(x[0]))
+            write_varint(out, len(value))
+            for key, item in value:
+                write_key(out, key)
+                write_value(out, item)
+
+        return write
+
+    elif kind == "static_variant":
+        write_types = [writer(x, prefix) for x in schema[1]]
+
+        def write(out, value):
+            type_id, item = value
+            write_varint(out, type_id)
+            write_types[type_id](out, item)
+
+        return write
+
+    elif kind == "struct":
+        fields = [
+            (name, writer(type, prefix), type[0] in ("optional", "extensions"))
+            if isinstance(type, tuple)
+            else (name, writer(type, prefix), False)
+            for name, type in schema[1]
+        ]
+
+        def write(out, value):
+            for name, write_field, omittable in fields:
+                if omittable:
+                    write_field(out, value.get(name))
+                else:
+                    write_field(out, value[name])
+
+        return write
+
+    raise ValueError("Unknown schema {}".format(schema))
+
+
+def _operation_writer(prefix):
+    def write(out, value):
+        op_id, op = value
+        if not isinstance(op_id, int):
+            op_id = operations[op_id]
+        if op_id not in operation_schemas_by_id:
+            raise ValueError("Operation {} is not supported".format(op_id))
+        write_varint(out, op_id)
+        writer(operation_schemas_by_id[op_id], prefix)(out, op)
+
+    return write
+
+
+def encode(schema, value, prefix=default_prefix):
+    """ Serialize ``value`` according to ``schema``
+
+        :raises ValueError: if the value does not match the schema
+        :raises UnsupportedTypeError: if the value contains a field that
+            cannot be serialized
+    """
+    out = bytearray()
+    try:
+        writer(schema, prefix)(out, value)
+    except (KeyError, TypeError, struct.error) as e:
+        raise ValueError("Value does not match the schema: {}".format(str(e)))
+    return bytes(out)
+
+
+def encode_operation(op, prefix=default_prefix):
+    """ Serialize an operation given as ``[id or name, payload]``
+    """
+    return encode("operation", op, prefix=prefix)
+
+
+def encode_transaction(tx, prefix=default_prefix, signed=True):
+    """ Serialize a transaction given as the dictionary the API uses
+    """
+    return encode(signed_transaction if signed else transaction, tx, prefix=prefix)
+
+
+class CompiledOperation(Operation):
+    """ Operation that is serialized by a compiled writer rather than the
+        classes in :mod:`peerplaysbase.operations`. It can be used in place
+        of :class:`peerplaysbase.objects.Operation` in transactions.
+
+        .. code-block:: python
+
+            op = CompiledOperation(["bet_place", {"fee": ..., ...}])
+
+        :param list op: ``[id or name, payload]``
+        :param str prefix: Prefix of the public keys
+    """
+
+    def __init__(self, op, prefix=None):
+        identifier, payload = op
+        payload = dict(payload)
+        prefix = payload.pop("prefix", None) or prefix or default_prefix
+        if isinstance(identifier, int):
+            self.name = self.getOperationNameForId(identifier)
+        else:
+            self.name = identifier
+        if self.name not in operation_schemas:
+            raise ValueError("Operation {} is not supported".format(self.name))
+        list.__init__(self, [self.getOperationIdForName(self.name), payload])
+        self.prefix = prefix
+        self._write = writer(operation_schemas[self.name], prefix)
+
+    def __bytes__(self):
+        out = bytearray()
+        write_varint(out, self.id)
+        try:
+            self._write(out, self.op)
+        except (KeyError, TypeError, struct.error) as e:
+            raise ValueError("Invalid {} operation: {}".format(self.name, str(e)))
+        return bytes(out)
+
+    def __json__(self):
+        return [self.id, self.op]
+
+    toJson = __json__
+    json = __json__
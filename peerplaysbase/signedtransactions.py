@@ -1,11 +1,143 @@
+import atexit
+import hashlib
+import threading
+from binascii import hexlify, unhexlify
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from graphenebase.ecdsa import sign_message, verify_message
 from graphenebase.signedtransactions import (
     Signed_Transaction as GrapheneSigned_Transaction,
 )
+from graphenebase.types import Array, Signature
 
+from .account import PublicKey
 from .operations import Operation
 from .chains import known_chains
 
 
+class _Digest:
+    """ Stands in for ``hashlib.sha256`` in :func:`sign_message` and
+        :func:`verify_message` if the digest of the message is known
+    """
+
+    def __init__(self, digest):
+        self._digest = digest
+
+    def __call__(self, message):
+        return self
+
+    def digest(self):
+        return self._digest
+
+
+def _sign_messages(message, digest, wifs):
+    hashfn = _Digest(digest)
+    return [sign_message(message, wif, hashfn=hashfn) for wif in wifs]
+
+
+def _recover_pubkeys(message, digest, signatures):
+    """ Public keys recovered from ``signatures``, ``None`` for signatures
+        that cannot be verified
+    """
+    hashfn = _Digest(digest)
+    pubkeys = []
+    for signature in signatures:
+        try:
+            pubkeys.append(verify_message(message, signature, hashfn=hashfn))
+        except Exception:
+            # Malformed signatures raise anything from TypeError to the
+            # errors of the ecdsa backends
+            pubkeys.append(None)
+    return pubkeys
+
+
+#: Batches of fewer transactions are processed in the calling process,
+#: as they are done before a pool of processes would have started
+parallel_threshold = 16
+
+_pools = dict()
+_pools_lock = threading.Lock()
+
+
+def shared_pool(workers=None):
+    """ The pool of ``workers`` processes that signs and verifies
+        transactions. It is created on first use and kept until
+        :func:`shutdown_pools` is called or the interpreter exits.
+    """
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ProcessPoolExecutor(max_workers=workers)
+        return _pools[workers]
+
+
+@atexit.register
+def shutdown_pools():
+    """ Shut down the pools of processes created by :func:`shared_pool`
+    """
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown()
+
+
+def _map(fn, args, workers=None, executor=None):
+    """ Call ``fn`` for all ``args`` in a pool of processes and return
+        the results in order
+    """
+    if workers == 1 or (executor is None and len(args) < parallel_threshold):
+        return [fn(*x) for x in args]
+    pool = executor or shared_pool(workers)
+    return list(
+        pool.map(
+            fn,
+            *zip(*args),
+            chunksize=max(1, len(args) // (4 * (workers or 4))),
+        )
+    )
+
+
+class VerificationResult(
+    namedtuple("VerificationResult", ["signers", "missing", "invalid"])
+):
+    """ Result of the verification of one transaction
+
+        :param list signers: Public keys that signed the transaction
+        :param list missing: Required public keys that did not sign it
+        :param list invalid: Positions of the signatures that could not be
+            verified
+
+        A transaction is :attr:`valid` if it has at least one signature,
+        all of its signatures can be verified and none of the required
+        keys is missing.
+    """
+
+    @property
+    def valid(self):
+        return bool(self.signers) and not self.missing and not self.invalid
+
+
+class ChainParameters(dict):
+    """ Parameters of a chain (``chain_id``, ``prefix``, ...) together
+        with the decoded chain id and a sha256 hasher that has already
+        consumed it. Transactions signed with it only need to hash their
+        own body, and the signing uses that digest rather than hashing the
+        message again.
+    """
+
+    def __init__(self, params):
+        dict.__init__(self, params)
+        self.chain_id = unhexlify(self["chain_id"])
+        self.hasher = hashlib.sha256(self.chain_id)
+
+    def digest(self, data):
+        """ sha256 of the chain id followed by ``data``
+        """
+        hasher = self.hasher.copy()
+        hasher.update(data)
+        return hasher.digest()
+
+
 class Signed_Transaction(GrapheneSigned_Transaction):
     """ Create a signed transaction and offer method to create the
         signature
@@ -19,3 +151,207 @@ class Signed_Transaction(GrapheneSigned_Transaction):
     known_chains = known_chains
     default_prefix = "PPY"
     operation_klass = Operation
+
+    @classmethod
+    def from_bytes(cls, data, prefix=None):
+        """ Load a transaction from its wire format (bytes or hex string,
+            e.g. as returned by ``get_transaction_hex``)
+        """
+        from .serializer import decode_transaction
+
+        return cls(**decode_transaction(data, prefix=prefix or cls.default_prefix))
+
+    #: Resolved chain parameters by chain identifier
+    resolved_chains = dict()
+
+    @classmethod
+    def resolve_chain(cls, chain):
+        """ Obtain the chain parameters from an identifier, the chain id,
+            the prefix or a dict of parameters
+
+            :rtype: ChainParameters
+        """
+        if isinstance(chain, ChainParameters):
+            return chain
+        if isinstance(chain, dict):
+            key = tuple(sorted(chain.items()))
+        else:
+            key = chain
+        if key not in cls.resolved_chains:
+            cls.resolved_chains[key] = ChainParameters(cls._find_chain(chain))
+        return cls.resolved_chains[key]
+
+    @classmethod
+    def _find_chain(cls, chain):
+        for _id, params in cls.known_chains.items():
+            if _id == chain or chain in params.values():
+                chain_params = params
+                break
+        else:
+            if isinstance(chain, dict):
+                chain_params = chain
+            else:
+                raise ValueError("sign() only takes a string or a dict as chain!")
+        if "chain_id" not in chain_params:
+            raise ValueError("sign() needs a 'chain_id' in chain params!")
+        return chain_params
+
+    def getChainParams(self, chain):
+        return self.resolve_chain(chain)
+
+    def deriveDigest(self, chain):
+        chain_params = self.resolve_chain(chain)
+        # Chain ID
+        self.chainid = chain_params["chain_id"]
+
+        # Do not serialize signatures
+        sigs = self.data["signatures"]
+        self.data["signatures"] = []
+        body = bytes(self)
+        self.data["signatures"] = sigs
+
+        self.message = chain_params.chain_id + body
+        self.digest = chain_params.digest(body)
+
+    def sign(self, wifkeys, chain=None):
+        """ Sign the transaction with the provided private keys.
+
+            :param array wifkeys: Array of wif keys
+            :param str chain: identifier for the chain
+        """
+        self.deriveDigest(chain or self.get_default_prefix())
+
+        # Get Unique private keys
+        self.privkeys = []
+        for item in wifkeys:
+            if item not in self.privkeys:
+                self.privkeys.append(item)
+
+        sigs = _sign_messages(self.message, self.digest, self.privkeys)
+        self.data["signatures"] = Array([Signature(sig) for sig in sigs])
+        return self
+
+    @staticmethod
+    def sign_many(transactions, wifkeys, chain=None, workers=None, executor=None):
+        """ Sign many transactions at once in a pool of processes
+
+            The transactions are serialized in the calling process, only
+            the signing itself is distributed, over a pool of processes that
+            is kept for later calls. Fewer than :data:`parallel_threshold`
+            transactions are signed in the calling process unless an
+            ``executor`` is given. Every transaction is signed
+            exactly as :meth:`sign` would do it, the transactions are
+            returned in the order they were given.
+
+            :param list transactions: Instances of :class:`Signed_Transaction`
+            :param list wifkeys: Wif keys to sign all transactions with, or
+                one list of wif keys per transaction
+            :param str chain: identifier for the chain
+            :param int workers: Number of processes (defaults to the number
+                of CPUs)
+            :param concurrent.futures.Executor executor: Use this executor
+                instead of the :func:`shared_pool`
+        """
+        transactions = list(transactions)
+        if wifkeys and all(isinstance(wif, str) for wif in wifkeys):
+            wifkeys = [wifkeys] * len(transactions)
+        if len(wifkeys) != len(transactions):
+            raise ValueError("Need one list of wif keys per transaction")
+
+        for tx, wifs in zip(transactions, wifkeys):
+            tx.deriveDigest(chain or tx.get_default_prefix())
+            # Get Unique private keys
+            tx.privkeys = []
+            for wif in wifs:
+                if wif not in tx.privkeys:
+                    tx.privkeys.append(wif)
+
+        signatures = _map(
+            _sign_messages,
+            [(tx.message, tx.digest, tx.privkeys) for tx in transactions],
+            workers=workers,
+            executor=executor,
+        )
+        for tx, sigs in zip(transactions, signatures):
+            tx.data["signatures"] = Array([Signature(sig) for sig in sigs])
+        return transactions
+
+    @classmethod
+    def verify_many(
+        cls, transactions, pubkeys=[], chain=None, workers=None, executor=None
+    ):
+        """ Verify the signatures of many transactions at once in a pool
+            of processes (see :meth:`sign_many`)
+
+            :param list transactions: Instances of :class:`Signed_Transaction`
+                or transactions as returned by the API (e.g. from
+                :meth:`peerplays.blockchain.Blockchain.blocks`)
+            :param list pubkeys: Public keys that need to have signed all
+                transactions, or one list of public keys per transaction
+            :param str chain: identifier for the chain
+            :param int workers: Number of processes (defaults to the number
+                of CPUs)
+            :param concurrent.futures.Executor executor: Use this executor
+                instead of the :func:`shared_pool`
+            :returns: One :class:`VerificationResult` per transaction in
+                the given order. Signatures that cannot be verified make
+                their transaction invalid rather than failing the batch.
+        """
+        from .serializer import encode_transaction
+
+        chain_params = cls.resolve_chain(chain or cls.default_prefix)
+        prefix = chain_params["prefix"]
+
+        jobs = []
+        for tx in transactions:
+            if isinstance(tx, GrapheneSigned_Transaction):
+                tx.deriveDigest(chain_params)
+                signatures = [bytes(sig) for sig in tx.data["signatures"].data]
+                jobs.append((tx.message, tx.digest, signatures))
+            else:
+                body = encode_transaction(tx, prefix=prefix, signed=False)
+                message = chain_params.chain_id + body
+                signatures = [unhexlify(sig) for sig in tx.get("signatures", [])]
+                jobs.append((message, chain_params.digest(body), signatures))
+
+        if pubkeys and all(isinstance(x, (str, PublicKey)) for x in pubkeys):
+            pubkeys = [pubkeys] * len(jobs)
+        elif not pubkeys:
+            pubkeys = [[]] * len(jobs)
+        if len(pubkeys) != len(jobs):
+            raise ValueError("Need one list of public keys per transaction")
+
+        # Parse every public key only once
+        keys = dict()
+
+        def parse(pubkey):
+            if pubkey not in keys:
+                if isinstance(pubkey, PublicKey):
+                    keys[pubkey] = repr(pubkey)
+                else:
+                    keys[pubkey] = repr(PublicKey(pubkey, prefix=prefix))
+            return keys[pubkey]
+
+        signers = dict()
+
+        def format_signer(recovered):
+            if recovered not in signers:
+                signers[recovered] = str(
+                    PublicKey(hexlify(recovered).decode("ascii"), prefix=prefix)
+                )
+            return signers[recovered]
+
+        results = []
+        recovered = _map(_recover_pubkeys, jobs, workers=workers, executor=executor)
+        for found, required in zip(recovered, pubkeys):
+            invalid = [i for i, x in enumerate(found) if x is None]
+            found = [x for x in found if x is not None]
+            found_hex = set(hexlify(x).decode("ascii") for x in found)
+            results.append(
+                VerificationResult(
+                    [format_signer(x) for x in found],
+                    [str(x) for x in required if parse(x) not in found_hex],
+                    invalid,
+                )
+            )
+        return results
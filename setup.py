@@ -36,7 +36,7 @@ setup(
     maintainer_email="info@pbsa.info",
     url="https://gitlab.com/PBSA/tools-libs/python-peerplays",
     keywords=["peerplays", "library", "api", "rpc"],
-    packages=["peerplays", "peerplays.cli", "peerplaysapi", "peerplaysbase"],
+    packages=["peerplays", "peerplays.cli", "peerplaysapi", "peerplaysapi.aio", "peerplaysbase"],
     classifiers=[
         "License :: OSI Approved :: MIT License",
         "Operating System :: OS Independent",
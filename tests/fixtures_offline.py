@@ -0,0 +1,155 @@
+""" Fakes for the test cases that run without a node """
+import threading
+from peerplaysbase.account import PrivateKey
+from peerplaysbase.chains import known_chains
+from peerplaysbase.objects import Operation
+from peerplaysbase.signedtransactions import Signed_Transaction
+
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+wif2 = "5HwoXVkHoRM8sL2KmNRS217n1g8mPPBomrY7yehCuXC1115WWsh"
+
+
+def bet_place(amount):
+    return Operation(
+        [
+            "bet_place",
+            {
+                "fee": {"amount": 0, "asset_id": "1.3.0"},
+                "bettor_id": "1.2.1241",
+                "betting_market_id": "1.25.1",
+                "amount_to_bet": {"amount": amount, "asset_id": "1.3.1"},
+                "backer_multiplier": 20000,
+                "back_or_lay": "lay",
+            },
+        ]
+    )
+
+
+def transaction(amount):
+    return Signed_Transaction(
+        ref_block_num=34294,
+        ref_block_prefix=3707022213,
+        expiration="2016-04-06T08:29:27",
+        operations=[bet_place(amount)],
+    )
+
+
+class FakeRPC:
+    chain_params = known_chains["BEATRICE"]
+
+    def get_required_fees(self, ops, asset_id):
+        return [{"amount": 0, "asset_id": asset_id} for op in ops]
+
+    def get_dynamic_global_properties(self):
+        return {"last_irreversible_block_num": 34294}
+
+    def get_block_header(self, num):
+        return {"previous": "000085f685abf4dce7c804570100000000000000"}
+
+
+pubkey = format(PrivateKey(wif).pubkey, "PPY")
+authority = {"weight_threshold": 1, "account_auths": [], "key_auths": [[pubkey, 1]]}
+
+accounts = {
+    "init0": {
+        "id": "1.2.100",
+        "name": "init0",
+        "owner": authority,
+        "active": authority,
+        "options": {"memo_key": pubkey},
+    },
+    "init1": {"id": "1.2.101", "name": "init1"},
+}
+
+assets = {
+    "PPY": {
+        "id": "1.3.0",
+        "symbol": "PPY",
+        "precision": 5,
+        "options": {"issuer_permissions": 0, "flags": 0, "description": ""},
+    }
+}
+
+
+class NameRPC(FakeRPC):
+    def __init__(self):
+        self.calls = []
+
+    def get_account(self, name):
+        self.calls.append(name)
+        return accounts.get(name)
+
+    def get_asset(self, name):
+        self.calls.append(name)
+        for asset in assets.values():
+            if name in (asset["id"], asset["symbol"]):
+                return asset
+
+    def get_objects(self, ids):
+        self.calls.extend(ids)
+        return [None for id in ids]
+
+
+def block_id(num):
+    return "%08x" % num + "ab" * 16
+
+
+class FakeBatch:
+    def __init__(self, rpc):
+        self.rpc = rpc
+        self.calls = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def get_block(self, num):
+        self.calls.append(num)
+
+    def results(self):
+        with self.rpc.lock:
+            self.rpc.round_trips += 1
+        return [self.rpc.get_block(num) for num in self.calls]
+
+
+class BlockchainRPC:
+    node_urls = ["ws://localhost"]
+    pool = None
+    user = ""
+    password = ""
+
+    def __init__(self, head):
+        self.head = head
+        self.requested = []
+        self.round_trips = 0
+        self.lock = threading.Lock()
+
+    def batch(self, **kwargs):
+        return FakeBatch(self)
+
+    def get_object(self, id, **kwargs):
+        return {"parameters": {"block_interval": 3}}
+
+    def get_dynamic_global_properties(self, **kwargs):
+        return {
+            "head_block_number": self.head,
+            "last_irreversible_block_num": self.head,
+        }
+
+    def get_block(self, num, **kwargs):
+        if num > self.head:
+            return None
+        with self.lock:
+            self.requested.append(num)
+        return {
+            "block_id": block_id(num),
+            "previous": block_id(num - 1),
+            "timestamp": "2019-01-01T00:00:00",
+            "transaction_ids": ["%040x" % (num * 2), "%040x" % (num * 2 + 1)],
+            "transactions": [
+                {"operations": [[0, {"n": num}], [62, {"n": num}]]},
+                {"operations": [[63, {"n": num}]]},
+            ],
+        }
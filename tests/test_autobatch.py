@@ -0,0 +1,92 @@
+import time
+import unittest
+from peerplays import PeerPlays
+from peerplays.transactionbuilder import TransactionBatcher
+from peerplaysbase.account import PrivateKey, PublicKey
+from peerplaysbase.signedtransactions import Signed_Transaction
+from .fixtures_offline import FakeRPC, bet_place, wif
+
+
+class BatchRPC(FakeRPC):
+    def get_global_properties(self):
+        return {"parameters": {"maximum_transaction_size": 500}}
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True, nobroadcast=True, keys=[wif])
+        self.ppy.rpc = BatchRPC()
+        self.signer = PublicKey(format(PrivateKey(wif).pubkey, "PPY"))
+
+    def amounts(self, tx):
+        return [op[1]["amount_to_bet"]["amount"] for op in tx["operations"]]
+
+    def test_split_on_size(self):
+        batcher = TransactionBatcher(self.ppy)
+        results = batcher.append(
+            [bet_place(i) for i in range(20)], self.signer, "active"
+        )
+        results.extend(batcher.flush())
+        self.assertEqual(sum(len(x["operations"]) for x in results), 20)
+        self.assertGreater(len(results), 1)
+        self.assertEqual(
+            [amount for tx in results for amount in self.amounts(tx)], list(range(20))
+        )
+        for tx in results:
+            self.assertEqual(len(tx["signatures"]), 1)
+            self.assertLessEqual(len(bytes(Signed_Transaction(**tx))), 500)
+        self.assertEqual(batcher.flush(), [])
+
+    def test_max_ops(self):
+        batcher = TransactionBatcher(self.ppy, max_ops=3)
+        results = []
+        for i in range(7):
+            results.extend(batcher.append(bet_place(i), self.signer, "active"))
+        self.assertEqual([self.amounts(x) for x in results], [[0, 1, 2], [3, 4, 5]])
+        self.assertEqual(len(batcher), 1)
+
+    def test_interval(self):
+        batcher = TransactionBatcher(self.ppy, interval=0)
+        results = batcher.append(bet_place(1), self.signer, "active")
+        self.assertEqual(len(results), 1)
+
+    def test_poll(self):
+        batcher = TransactionBatcher(self.ppy, interval=0.05)
+        self.assertEqual(batcher.append(bet_place(1), self.signer, "active"), [])
+        self.assertFalse(batcher.flush_due())
+        self.assertEqual(batcher.poll(), [])
+        time.sleep(0.05)
+        self.assertTrue(batcher.flush_due())
+        self.assertEqual([self.amounts(x) for x in batcher.poll()], [[1]])
+        self.assertFalse(batcher.flush_due())
+
+    def test_size_estimate(self):
+        batcher = TransactionBatcher(self.ppy)
+        batcher.append([bet_place(i) for i in range(3)], self.signer, "active")
+        estimate = batcher.estimated_size()
+        size = len(bytes(Signed_Transaction(**batcher.flush()[0])))
+        # The fee is serialized with the queued operations, only the upper
+        # bound for the length of the operations is above the actual size
+        self.assertLessEqual(size, estimate)
+        self.assertLessEqual(estimate - size, 2)
+
+    def test_fee_asset(self):
+        batcher = TransactionBatcher(self.ppy)
+        self.assertEqual(batcher.append(bet_place(1), self.signer, "active"), [])
+        results = batcher.append(
+            bet_place(2), self.signer, "active", fee_asset="1.3.1"
+        )
+        self.assertEqual([self.amounts(x) for x in results], [[1]])
+        results = batcher.flush()
+        self.assertEqual(results[0]["operations"][0][1]["fee"]["asset_id"], "1.3.1")
+
+    def test_peerplays_autobatch(self):
+        self.ppy.autobatch = True
+        self.ppy.autobatch_max_ops = 2
+        self.assertEqual(
+            self.ppy.finalizeOp(bet_place(1), self.signer, "active"), []
+        )
+        results = self.ppy.finalizeOp(bet_place(2), self.signer, "active")
+        self.assertEqual([self.amounts(x) for x in results], [[1, 2]])
+        self.ppy.finalizeOp(bet_place(3), self.signer, "active")
+        self.assertEqual([self.amounts(x) for x in self.ppy.flush()], [[3]])
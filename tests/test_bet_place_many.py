@@ -0,0 +1,111 @@
+import unittest
+from peerplays import PeerPlays
+from peerplays.amount import Amount
+from peerplays.asset import Asset
+from peerplays.exceptions import BettingMarketDoesNotExistException
+from peerplays.utils import scale_to_int
+from .fixtures_offline import NameRPC, accounts, assets, wif
+
+# Other markets than in the other tests as the object cache is shared
+markets = ["1.25.{}".format(i) for i in range(3000, 3010)]
+
+
+class BulkRPC(NameRPC):
+    def get_objects(self, ids):
+        self.calls.append(ids)
+        objects = {x["id"]: x for x in accounts.values()}
+        objects.update({x: {"id": x, "group_id": "1.24.0"} for x in markets})
+        return [objects.get(x) for x in ids]
+
+    def get_dynamic_global_properties(self):
+        return {
+            "last_irreversible_block_num": 34294,
+            "next_maintenance_time": "2030-01-01T00:00:00",
+        }
+
+    def get_global_properties(self):
+        self.calls.append(["get_global_properties"])
+        return {
+            "parameters": {
+                "maximum_transaction_size": 500,
+                "min_bet_multiplier": 10100,
+                "max_bet_multiplier": 100000,
+            }
+        }
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True, nobroadcast=True, keys=[wif])
+        self.ppy.rpc = BulkRPC()
+
+    def lookups(self, space_type):
+        return [x for x in self.ppy.rpc.calls if x[0].startswith(space_type)]
+
+    def operations(self, txs):
+        return [op[1] for tx in txs for op in tx["operations"]]
+
+    def test_scale_to_int(self):
+        scaled = scale_to_int([1.5, 2.00004, 1.1], 10000)
+        self.assertEqual(scaled, [15000, 20000, 11000])
+        for value in [float("inf"), float("nan")]:
+            with self.assertRaises(ValueError):
+                scale_to_int([1, value], 10000)
+
+    def test_columns(self):
+        bets = {
+            "betting_market_id": [markets[i % 3] for i in range(20)],
+            "amount_to_bet": [1 + i / 10 for i in range(20)],
+            "backer_multiplier": [1.01 + i / 4 for i in range(20)],
+            "back_or_lay": ["back", "lay"] * 10,
+        }
+        txs = self.ppy.bet_place_many(bets, asset="PPY", account="1.2.100")
+        self.assertGreater(len(txs), 1)
+        ops = self.operations(txs)
+        self.assertEqual(
+            [op["betting_market_id"] for op in ops], bets["betting_market_id"]
+        )
+        amount = {"amount": 130000, "asset_id": "1.3.0"}
+        self.assertEqual(ops[3]["amount_to_bet"], amount)
+        self.assertEqual([op["backer_multiplier"] for op in ops[:2]], [10100, 12600])
+        self.assertEqual([op["back_or_lay"] for op in ops[:2]], ["back", "lay"])
+        # All betting markets are looked up at once
+        self.assertEqual(self.lookups("1.25."), [markets[:3]])
+
+        self.ppy.bet_place_many(bets, asset="PPY", account="1.2.100")
+        self.assertEqual(len(self.lookups("1.25.")), 1)
+        self.ppy.bet_place_many(bets, asset="PPY", account="1.2.100", validate="remote")
+        self.assertEqual(len(self.lookups("1.25.")), 2)
+
+    def test_tuples(self):
+        asset = Asset(assets["PPY"], blockchain_instance=self.ppy)
+        amount = Amount(2, asset, blockchain_instance=self.ppy)
+        bets = [(markets[5], amount, 2, "back")] * 4
+        txs = self.ppy.bet_place_many(bets, account="1.2.100", max_ops=3)
+        self.assertEqual([len(tx["operations"]) for tx in txs], [3, 1])
+        op = self.operations(txs)[0]
+        self.assertEqual(op["amount_to_bet"], {"amount": 200000, "asset_id": "1.3.0"})
+        self.assertEqual(op["backer_multiplier"], 20000)
+
+    def test_invalid(self):
+        def bet_place_many(market=markets[0], multiplier=2, side="back", **kwargs):
+            bets = [(markets[1], 1, 2, "back"), (market, 1, multiplier, side)]
+            return self.ppy.bet_place_many(
+                bets, asset="PPY", account="1.2.100", **kwargs
+            )
+
+        bet_place_many()
+        for multiplier in [1.001, 11, float("nan")]:
+            with self.assertRaises(ValueError):
+                bet_place_many(multiplier=multiplier)
+        with self.assertRaises(ValueError):
+            bet_place_many(side="both")
+        with self.assertRaises(ValueError):
+            bet_place_many(market="1.24.1", validate="none")
+        with self.assertRaises(ValueError):
+            bet_place_many(validate="always")
+        with self.assertRaises(BettingMarketDoesNotExistException):
+            bet_place_many(market="1.25.404")
+        bet_place_many(market="1.25.404", validate="none")
+        with self.assertRaises(ValueError):
+            self.ppy.bet_place_many([(markets[0], 1, 2, "back")], account="1.2.100")
@@ -0,0 +1,70 @@
+import unittest
+from peerplays import PeerPlays
+from peerplays.amount import Amount
+from peerplays.asset import Asset
+from peerplays.exceptions import BetDoesNotExistException
+from .fixtures_offline import NameRPC, accounts, assets, wif
+
+markets = ["1.25.{}".format(i) for i in range(2000, 2010)]
+bets = ["1.26.2000"]
+
+
+class BettingRPC(NameRPC):
+    def get_objects(self, ids):
+        self.calls.append(ids)
+        objects = {x["id"]: x for x in accounts.values()}
+        objects.update({x: {"id": x, "group_id": "1.24.0"} for x in markets + bets})
+        return [objects.get(x) for x in ids]
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True, nobroadcast=True, keys=[wif])
+        self.ppy.rpc = BettingRPC()
+        asset = Asset(assets["PPY"], blockchain_instance=self.ppy)
+        self.amount = Amount(1, asset, blockchain_instance=self.ppy)
+
+    def lookups(self, space_type):
+        return [x for x in self.ppy.rpc.calls if x[0].startswith(space_type)]
+
+    def bet_place(self, betting_market_id, validate):
+        tx = self.ppy.bet_place(
+            betting_market_id, self.amount, 2, "back", "1.2.100", validate=validate
+        )
+        return tx["operations"][0][1]["betting_market_id"]
+
+    def test_none(self):
+        self.assertEqual(self.bet_place(markets[0], "none"), markets[0])
+        self.assertEqual(self.lookups("1.25."), [])
+        for invalid in ["1.24.1", "1.25.", "1.25.x", "foo", None]:
+            with self.assertRaises(ValueError):
+                self.bet_place(invalid, "none")
+        with self.assertRaises(ValueError):
+            self.bet_place(markets[0], "always")
+
+    def test_cached_and_remote(self):
+        for i in range(3):
+            self.bet_place(markets[1], "cached")
+        self.assertEqual(self.lookups("1.25."), [[markets[1]]])
+        for i in range(2):
+            self.bet_place(markets[1], "remote")
+        self.assertEqual(self.lookups("1.25."), [[markets[1]]] * 3)
+
+    def test_prevalidate(self):
+        missing = self.ppy.prevalidate(markets[2:] + ["1.25.404", markets[2]])
+        self.assertEqual(missing, ["1.25.404"])
+        self.assertEqual(self.lookups("1.25."), [markets[2:] + ["1.25.404"]])
+        for market in markets[2:]:
+            self.bet_place(market, "cached")
+        self.assertEqual(self.ppy.prevalidate(markets[2:]), [])
+        self.assertEqual(len(self.lookups("1.25.")), 1)
+
+    def test_bet_cancel(self):
+        tx = self.ppy.bet_cancel("1.26.5000", "1.2.100", validate="none")
+        self.assertEqual(tx["operations"][0][1]["bet_to_cancel"], "1.26.5000")
+        self.assertEqual(self.lookups("1.26."), [])
+        with self.assertRaises(BetDoesNotExistException):
+            self.ppy.bet_cancel("1.26.5000", "1.2.100")
+        self.ppy.bet_cancel(bets[0], "1.2.100")
+        with self.assertRaises(ValueError):
+            self.ppy.bet_cancel(markets[0], "1.2.100", validate="none")
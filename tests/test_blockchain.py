@@ -0,0 +1,45 @@
+import unittest
+from peerplays import PeerPlays
+from peerplays.blockchain import Blockchain, OperationRecord
+from peerplays.exceptions import BlockDoesNotExistsException
+from .fixtures_offline import BlockchainRPC, block_id
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True)
+        self.ppy.rpc = BlockchainRPC(head=1000)
+
+    def test_block_range_in_order(self):
+        blockchain = Blockchain(blockchain_instance=self.ppy)
+        blocks = list(blockchain.block_range(10, 500, window=20, workers=4))
+        self.assertEqual([b["block_num"] for b in blocks], list(range(10, 501)))
+        self.assertEqual(blocks[1]["previous"], block_id(10))
+        self.assertEqual(self.ppy.rpc.round_trips, 25)
+
+    def test_block_range_head(self):
+        blockchain = Blockchain(blockchain_instance=self.ppy)
+        blocks = list(blockchain.block_range(990))
+        self.assertEqual(blocks[-1]["block_num"], 1000)
+        with self.assertRaises(BlockDoesNotExistsException):
+            list(blockchain.block_range(999, 1001))
+
+    def test_stream_operations(self):
+        blockchain = Blockchain(blockchain_instance=self.ppy)
+        ops = list(
+            blockchain.stream_operations(
+                ["bet_place", "betting_market_group_resolve"], start=10, stop=11
+            )
+        )
+        self.assertEqual(
+            ops[:2],
+            [
+                OperationRecord(10, 0, 1, "2019-01-01T00:00:00", "bet_place", {"n": 10}),
+                OperationRecord(
+                    10, 1, 0, "2019-01-01T00:00:00", "betting_market_group_resolve", {"n": 10}
+                ),
+            ],
+        )
+        self.assertEqual(len(ops), 4)
+        with self.assertRaises(ValueError):
+            list(blockchain.stream_operations(["foobar"], start=1, stop=2))
@@ -0,0 +1,71 @@
+import tempfile
+import unittest
+from peerplays import PeerPlays
+from peerplays.block import Block
+from peerplays.blockchain import Blockchain
+from peerplays.exceptions import BlockStoreIntegrityError
+from peerplays.storage import SqliteBlockStore
+from .fixtures_offline import BlockchainRPC, block_id
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True)
+        self.ppy.rpc = BlockchainRPC(head=100)
+        self.store = self.ppy.use_blockstore(data_dir=tempfile.mkdtemp())
+
+    def test_fetch_once(self):
+        blockchain = Blockchain(blockchain_instance=self.ppy)
+        list(blockchain.block_range(1, 50, window=10))
+        self.assertEqual(len(self.store), 50)
+        self.ppy.rpc.requested = []
+        blocks = list(blockchain.block_range(1, 60, window=10))
+        self.assertEqual(self.ppy.rpc.requested, list(range(51, 61)))
+        self.assertEqual([b["block_num"] for b in blocks], list(range(1, 61)))
+        self.assertEqual(Block(20, blockchain_instance=self.ppy)["previous"], block_id(19))
+        self.assertEqual(self.ppy.rpc.requested, list(range(51, 61)))
+        self.assertEqual(self.store.verify(), [])
+
+    def test_integrity(self):
+        self.store.add(10, {"previous": block_id(9)})
+        self.store.add(11, {"previous": block_id(10)})
+        self.store.add(12, {"previous": block_id(11)})
+        with self.assertRaises(BlockStoreIntegrityError):
+            self.store.add(12, {"previous": "0000000b" + "cd" * 16})
+        with self.assertRaises(BlockStoreIntegrityError):
+            self.store.add(13, {"previous": block_id(5)})
+        # Corrupt the stored id of block 10
+        self.store._connection.execute(
+            "UPDATE blocks SET block_id=? WHERE block_num=10", ("0000000a" + "ff" * 16,)
+        )
+        self.assertEqual(self.store.verify(), [11])
+
+    def test_payload(self):
+        blockchain = Blockchain(blockchain_instance=self.ppy)
+        list(blockchain.block_range(1, 20, window=10))
+        self.assertEqual(self.store.verify(), [])
+        with self.assertRaises(BlockStoreIntegrityError):
+            self.store.add(21, dict(self.ppy.rpc.get_block(21), transaction_ids=[]))
+
+        def replace(block_num, checksum=False, **kwargs):
+            block = dict(self.store.get(block_num), **kwargs)
+            data = self.store.encode(block)
+            self.store._connection.execute(
+                "UPDATE blocks SET data=? WHERE block_num=?", (data, block_num)
+            )
+            if checksum:
+                self.store._connection.execute(
+                    "UPDATE blocks SET checksum=? WHERE block_num=?",
+                    (self.store.checksum(data), block_num),
+                )
+
+        # Changed payload
+        replace(5, timestamp="2019-01-01T00:00:03")
+        # Changed payload with a matching checksum
+        replace(7, checksum=True, transaction_ids=["00" * 20] * 2)
+        replace(9, checksum=True, block_id=block_id(9)[:-2] + "00")
+        self.assertEqual(self.store.verify(), [5, 7, 9])
+        for block_num in [5, 7, 9]:
+            with self.assertRaises(BlockStoreIntegrityError):
+                self.store.get(block_num)
+        self.assertEqual(self.store.get(6)["block_id"], block_id(6))
@@ -0,0 +1,107 @@
+import threading
+import unittest
+from peerplays import PeerPlays
+from peerplays.broadcast import BroadcastQueue, transaction_id
+from peerplays.exceptions import TransactionExpired
+from peerplaysapi.exceptions import RPCError
+from peerplaysapi.websocket import PeerPlaysWebsocket
+from .fixtures_offline import FakeRPC, transaction, wif
+
+
+def signed(amount, expiration="2016-04-06T08:29:27"):
+    tx = transaction(amount)
+    tx.data["expiration"] = type(tx.data["expiration"])(expiration)
+    return tx.sign([wif], chain="TEST")
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.ws = PeerPlaysWebsocket("ws://localhost")
+        self.ws.rpcexec = self.rpcexec
+        self.ws.connected.set()
+        ppy = PeerPlays(offline=True)
+        ppy.rpc = FakeRPC()
+        self.queue = BroadcastQueue(websocket=self.ws, blockchain_instance=ppy)
+
+    def rpcexec(self, payload):
+        self.sent.append(payload)
+        return payload["id"]
+
+    def notice(self, id, *params):
+        self.ws.process_message({"method": "notice", "params": [id, list(params)]})
+
+    def test_transaction_id(self):
+        tx = signed(1)
+        self.assertEqual(transaction_id(tx.json(), prefix="TEST"), tx.id)
+
+    def test_confirmation(self):
+        futures = [
+            self.queue.submit(signed(i, "2100-01-01T00:00:00").json())
+            for i in range(3)
+        ]
+        self.assertEqual(len(self.sent), 3)
+        self.assertEqual(len(self.queue), 3)
+        self.assertEqual(
+            self.sent[0]["params"][:2],
+            ["network_broadcast", "broadcast_transaction_with_callback"],
+        )
+        self.assertEqual(self.sent[0]["params"][2][0], 5)
+
+        # accepted, then included
+        self.ws.process_message({"id": self.sent[1]["id"], "result": None})
+        self.notice(5, {"id": futures[1].tx_id, "block_num": 10, "trx_num": 0})
+        self.assertEqual(futures[1].result(0)["block_num"], 10)
+        self.assertFalse(futures[0].done())
+
+        # rejected
+        self.ws.process_message(
+            {"id": self.sent[2]["id"], "error": {"message": "duplicate"}}
+        )
+        with self.assertRaises(RPCError):
+            futures[2].result(0)
+        self.assertEqual(len(self.queue), 1)
+
+    def test_expiration(self):
+        future = self.queue.submit(signed(1).json())
+        alive = self.queue.submit(signed(2, "2100-01-01T00:00:00").json())
+        self.notice(2, "00000001" + "00" * 16)
+        with self.assertRaises(TransactionExpired):
+            future.result(0)
+        self.assertFalse(alive.done())
+
+    def test_interleaved_calls(self):
+        # Another thread (e.g. a heartbeat) calls the same websocket while
+        # transactions are submitted
+        stop = threading.Event()
+
+        def heartbeat():
+            while not stop.is_set():
+                self.ws.get_objects(["2.8.0"])
+
+        thread = threading.Thread(target=heartbeat)
+        thread.start()
+        try:
+            futures = [
+                self.queue.submit(signed(i, "2100-01-01T00:00:00").json())
+                for i in range(20)
+            ]
+        finally:
+            stop.set()
+            thread.join()
+
+        ids = [payload["id"] for payload in self.sent]
+        self.assertEqual(len(ids), len(set(ids)))
+        broadcasts = [
+            payload
+            for payload in self.sent
+            if payload["params"][1] == "broadcast_transaction_with_callback"
+        ]
+        self.assertEqual(len(broadcasts), 20)
+        # Reject every other transaction by the id of its request
+        for payload in broadcasts[::2]:
+            self.ws.process_message(
+                {"id": payload["id"], "error": {"message": "rejected"}}
+            )
+        self.assertEqual([future.done() for future in futures], [True, False] * 10)
+        self.assertEqual(len(self.queue), 10)
@@ -0,0 +1,56 @@
+import threading
+import unittest
+from peerplaysapi.dispatcher import Dispatcher
+from peerplaysapi.websocket import PeerPlaysWebsocket
+
+
+class Testcases(unittest.TestCase):
+    def test_ordering(self):
+        blocks = []
+        dispatcher = Dispatcher(max_queue=5)
+        for i in range(50):
+            dispatcher.submit("on_block", blocks.append, i)
+        dispatcher.join()
+        self.assertEqual(blocks, list(range(50)))
+        dispatcher.shutdown()
+
+    def test_drop_oldest(self):
+        started, release = threading.Event(), threading.Event()
+        blocks = []
+        dispatcher = Dispatcher(max_queue=2, overflow="drop_oldest")
+        dispatcher.submit(
+            "on_block", lambda x: started.set() or release.wait(1), None
+        )
+        started.wait(1)
+        for i in range(5):
+            dispatcher.submit("on_block", blocks.append, i)
+        release.set()
+        dispatcher.join()
+        self.assertEqual(blocks, [3, 4])
+        self.assertEqual(dispatcher.dropped, 3)
+        dispatcher.shutdown()
+
+    def test_coalesce(self):
+        release = threading.Event()
+        objects = []
+        dispatcher = Dispatcher(overflow="coalesce")
+        dispatcher.submit("on_object", lambda x: release.wait(1), {})
+        for i in range(5):
+            dispatcher.submit("on_object", objects.append, {"id": "1.26.1", "n": i})
+            dispatcher.submit("on_object", objects.append, {"id": "1.26.2", "n": i})
+        release.set()
+        dispatcher.join()
+        self.assertEqual(
+            objects, [{"id": "1.26.1", "n": 4}, {"id": "1.26.2", "n": 4}]
+        )
+        dispatcher.shutdown()
+
+    def test_websocket_dispatch(self):
+        blocks = []
+        dispatcher = Dispatcher()
+        ws = PeerPlaysWebsocket(
+            "ws://localhost", on_block=blocks.append, dispatcher=dispatcher
+        )
+        ws.process_message({"method": "notice", "params": [2, ["00000001", "00000002"]]})
+        dispatcher.shutdown()
+        self.assertEqual(blocks, ["00000001", "00000002"])
@@ -0,0 +1,141 @@
+import unittest
+from peerplays import PeerPlays
+from peerplays.transactionbuilder import TransactionBuilder
+from peerplaysbase.account import PrivateKey
+from peerplaysbase.fees import FeeSchedule
+from peerplaysbase.objects import Operation
+from peerplaysbase.operationids import operations
+from peerplaysbase.serializer import CompiledOperation
+from .fixtures_offline import FakeRPC, bet_place, wif
+
+pubkey = format(PrivateKey(wif).pubkey, "PPY")
+
+schedule = {
+    "parameters": [
+        [operations["transfer"], {"fee": 2000, "price_per_kbyte": 1024}],
+        [
+            operations["account_create"],
+            {"basic_fee": 500, "premium_fee": 20000, "price_per_kbyte": 1024},
+        ],
+        [operations["bet_place"], {"fee": 10}],
+        [operations["proposal_create"], {"fee": 100, "price_per_kbyte": 10}],
+    ],
+    "scale": 10000,
+}
+
+
+def transfer(memo=None):
+    payload = {
+        "fee": {"amount": 0, "asset_id": "1.3.0"},
+        "from": "1.2.0",
+        "to": "1.2.1",
+        "amount": {"amount": 1000000, "asset_id": "1.3.4"},
+        "prefix": "PPY",
+    }
+    if memo:
+        payload["memo"] = {
+            "from": pubkey,
+            "to": pubkey,
+            "nonce": 5862723643998573708,
+            "message": memo,
+        }
+    return Operation(["transfer", payload])
+
+
+def account_create(name):
+    authority = {"weight_threshold": 1, "account_auths": [], "key_auths": []}
+    return [
+        "account_create",
+        {
+            "fee": {"amount": 0, "asset_id": "1.3.0"},
+            "registrar": "1.2.0",
+            "referrer": "1.2.0",
+            "referrer_percent": 0,
+            "name": name,
+            "owner": authority,
+            "active": authority,
+            "options": {
+                "memo_key": pubkey,
+                "voting_account": "1.2.5",
+                "num_witness": 0,
+                "num_committee": 0,
+                "votes": [],
+                "extensions": [],
+            },
+            "extensions": {},
+        },
+    ]
+
+
+class FeeRPC(FakeRPC):
+    def __init__(self):
+        self.calls = []
+
+    def get_required_fees(self, ops, asset_id):
+        self.calls.append("get_required_fees")
+        return super().get_required_fees(ops, asset_id)
+
+    def get_dynamic_global_properties(self):
+        self.calls.append("get_dynamic_global_properties")
+        return {
+            "last_irreversible_block_num": 34294,
+            "next_maintenance_time": "2030-01-01T00:00:00",
+        }
+
+    def get_global_properties(self):
+        self.calls.append("get_global_properties")
+        return {"parameters": {"current_fees": schedule}}
+
+
+class Testcases(unittest.TestCase):
+    def test_core_fee(self):
+        fees = FeeSchedule(schedule)
+        self.assertEqual(fees.core_fee(bet_place(1)), 10)
+        self.assertEqual(fees.core_fee(transfer()), 2000)
+        # The memo is charged by its size at one unit per byte
+        memo_size = 1 + 2 * 33 + 8 + 1 + 16
+        self.assertEqual(fees.core_fee(transfer("aa" * 16)), 2000 + memo_size)
+        compiled = CompiledOperation(transfer("aa" * 16).json())
+        self.assertEqual(fees.core_fee(compiled), 2000 + memo_size)
+
+        size = len(bytes(CompiledOperation(account_create("init0")))) - 1
+        self.assertEqual(fees.core_fee(account_create("init0")), 500 + size)
+        self.assertEqual(fees.core_fee(account_create("peerplays")), 20000 + size + 4)
+
+        half = FeeSchedule(dict(schedule, scale=5000))
+        self.assertEqual(half.calculate([bet_place(1), transfer()]), [5, 1000])
+
+    def test_not_computed(self):
+        fees = FeeSchedule(schedule)
+        self.assertIsNone(fees.core_fee(["proposal_create", {}]))
+        self.assertIsNone(fees.core_fee(["bet_cancel", {}]))
+        self.assertIsNone(fees.calculate([bet_place(1), ["bet_cancel", {}]]))
+
+    def test_local_fees(self):
+        ppy = PeerPlays(offline=True, nobroadcast=True, local_fees=True)
+        ppy.rpc = FeeRPC()
+        for op in [bet_place(1), CompiledOperation(bet_place(2).json())]:
+            tx = TransactionBuilder(blockchain_instance=ppy)
+            tx.appendOps([op, transfer()])
+            tx.constructTx()
+            fees = [x[1]["fee"] for x in tx["operations"]]
+            self.assertEqual(
+                fees,
+                [
+                    {"amount": 10, "asset_id": "1.3.0"},
+                    {"amount": 2000, "asset_id": "1.3.0"},
+                ],
+            )
+        self.assertNotIn("get_required_fees", ppy.rpc.calls)
+        self.assertEqual(ppy.rpc.calls.count("get_global_properties"), 1)
+
+        fee_schedule = ppy.fee_schedule
+        ppy._next_maintenance = 0
+        self.assertIsNot(ppy.fee_schedule, fee_schedule)
+        self.assertEqual(ppy.rpc.calls.count("get_global_properties"), 2)
+
+        tx = TransactionBuilder(blockchain_instance=ppy)
+        tx.appendOps([bet_place(1)])
+        tx.set_fee_asset("1.3.1")
+        tx.constructTx()
+        self.assertIn("get_required_fees", ppy.rpc.calls)
@@ -0,0 +1,91 @@
+import time
+import unittest
+from peerplays import PeerPlays
+from peerplays.exceptions import AccountDoesNotExistsException
+from peerplaysbase import operations
+from peerplaysbase.objects import Operation
+from peerplaysbase.serializer import decode_operation
+from .fixtures_offline import NameRPC, wif
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True, nobroadcast=True, keys=[wif])
+        self.ppy.rpc = NameRPC()
+
+    def test_resolve(self):
+        cache = self.ppy.namecache
+        self.assertEqual(cache.account_id("init0"), "1.2.100")
+        self.assertEqual(cache.account_id("init0"), "1.2.100")
+        self.assertEqual(cache.account_id("1.2.5"), "1.2.5")
+        self.assertEqual(cache.asset_id("PPY"), "1.3.0")
+        self.assertEqual(cache.asset_id("1.3.1"), "1.3.1")
+        self.assertEqual(self.ppy.rpc.calls, ["init0", "PPY"])
+        with self.assertRaises(AccountDoesNotExistsException):
+            cache.account_id("nobody")
+
+        self.ppy.config["default_account"] = "init0"
+        self.assertEqual(self.ppy.resolve_account(), "1.2.100")
+
+    def test_expiration(self):
+        cache = self.ppy.namecache
+        cache.ttl = 0.01
+        cache.account_id("init0")
+        time.sleep(0.02)
+        cache.account_id("init0")
+        self.assertEqual(self.ppy.rpc.calls, ["init0", "init0"])
+
+    def test_invalidate(self):
+        cache = self.ppy.namecache
+        cache.account_id("init0")
+        cache.account_id("init1")
+        cache.process_notice({"id": "1.2.100", "name": "init0"})
+        self.assertEqual(len(cache), 1)
+        cache.invalidate("init1")
+        self.assertEqual(len(cache), 0)
+        cache.account_id("init0")
+        cache.invalidate()
+        cache.account_id("init0")
+        self.assertEqual(self.ppy.rpc.calls, ["init0", "init1", "init0", "init0"])
+
+    def test_transfer(self):
+        for i in range(10):
+            tx = self.ppy.transfer("init1", 1, "PPY", account="init0")
+            op = tx["operations"][0][1]
+            self.assertEqual(op["from"], "1.2.100")
+            self.assertEqual(op["to"], "1.2.101")
+            self.assertEqual(op["amount"], {"amount": 100000, "asset_id": "1.3.0"})
+            self.assertEqual(len(tx["signatures"]), 1)
+        self.assertEqual(self.ppy.rpc.calls, ["init0", "init1", "PPY"])
+
+        self.ppy.rpc.calls = []
+        self.ppy.transfer("1.2.101", 1, "1.3.0", account="1.2.100")
+        self.assertEqual(self.ppy.rpc.calls, ["1.3.0"])
+
+    def test_other_builders(self):
+        self.ppy.config["default_account"] = "init0"
+        for i in range(3):
+            tx = self.ppy.cancel("1.7.1")
+            self.assertEqual(tx["operations"][0][1]["fee_paying_account"], "1.2.100")
+            tx = self.ppy.nft_approve("init0", "init1", "1.31.0")
+            self.assertEqual(tx["operations"][0][1]["approved"], "1.2.101")
+        self.assertEqual(self.ppy.rpc.calls, ["init0", "init1"])
+
+    def test_no_default_account(self):
+        # Unlike cancel(), these builders need the account to be given
+        self.ppy.config["default_account"] = "init0"
+        with self.assertRaises(ValueError):
+            self.ppy.custom_permission_create("perm", weight_threshold=1)
+        with self.assertRaises(ValueError):
+            self.ppy.nft_approve(None, "init1", "1.31.0")
+
+    def test_nft_mint_operators(self):
+        for operators, ids in [
+            (["init1", "1.2.102"], ["1.2.101", "1.2.102"]),
+            ("init1", ["1.2.101"]),
+        ]:
+            tx = self.ppy.nft_mint("init0", "1.30.0", "init0", "init1", operators, "")
+            op = tx["operations"][0]
+            self.assertEqual(op[1]["approved_operators"], ids)
+            data = bytes(Operation(operations.Nft_mint(**op[1])))
+            self.assertEqual(decode_operation(data)[1]["approved_operators"], ids)
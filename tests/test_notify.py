@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from peerplays import PeerPlays
+from peerplays.notify import Notify
+from .fixtures_offline import BlockchainRPC, block_id
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True)
+        self.ppy.rpc = BlockchainRPC(head=10)
+        self.blocks = []
+
+    def test_backfill_and_duplicates(self):
+        notify = Notify(
+            on_block=self.blocks.append, start_block=4, peerplays_instance=self.ppy
+        )
+        notify.process_block(block_id(8))
+        notify.process_block(block_id(7))
+        notify.process_block(block_id(9))
+        self.assertEqual(self.blocks, [block_id(x) for x in range(5, 10)])
+        self.assertEqual(self.ppy.rpc.requested, [6, 7, 8])
+
+    def test_checkpoint(self):
+        checkpoint = os.path.join(tempfile.mkdtemp(), "checkpoint")
+        notify = Notify(
+            on_block=self.blocks.append,
+            checkpoint=checkpoint,
+            peerplays_instance=self.ppy,
+        )
+        notify.process_block(block_id(5))
+        self.assertEqual(notify.current_block, 5)
+        notify = Notify(
+            on_block=self.blocks.append,
+            checkpoint=checkpoint,
+            peerplays_instance=self.ppy,
+        )
+        self.assertEqual(notify.last_block, 5)
+        notify.process_block(block_id(5))
+        notify.process_block(block_id(7))
+        self.assertEqual(self.blocks, [block_id(5), block_id(6), block_id(7)])
+        with open(checkpoint) as fp:
+            self.assertEqual(fp.read(), "7")
+
+    def test_at_least_once(self):
+        checkpoint = os.path.join(tempfile.mkdtemp(), "checkpoint")
+
+        def on_block(block_id):
+            if notify.current_block == 6 and not self.blocks[-1:] == ["crash"]:
+                self.blocks.append("crash")
+                raise KeyboardInterrupt
+            self.blocks.append(notify.current_block)
+
+        notify = Notify(
+            on_block=on_block, checkpoint=checkpoint, peerplays_instance=self.ppy
+        )
+        notify.process_block(block_id(5))
+        with self.assertRaises(KeyboardInterrupt):
+            notify.process_block(block_id(6))
+        # Block 6 is handed over again after a restart
+        notify = Notify(
+            on_block=on_block, checkpoint=checkpoint, peerplays_instance=self.ppy
+        )
+        notify.process_block(block_id(7))
+        self.assertEqual(self.blocks, [5, "crash", 6, 7])
@@ -0,0 +1,96 @@
+import threading
+import time
+import unittest
+from peerplays import PeerPlays
+from peerplays.event import Event
+from peerplays.eventgroup import EventGroup
+from peerplays.instance import set_shared_peerplays_instance
+
+
+class FakeRPC:
+    def __init__(self):
+        self.calls = []
+        self.sending = threading.Event()
+        self.reply = threading.Event()
+        self.reply.set()
+
+    def get_objects(self, ids, **kwargs):
+        self.calls.append(list(ids))
+        self.sending.set()
+        self.reply.wait(1)
+        return [{"id": x, "name": x} for x in ids]
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True)
+        self.ppy.rpc = FakeRPC()
+        self.results = dict()
+        set_shared_peerplays_instance(self.ppy)
+
+    def test_prefetch(self):
+        ids = ["1.22.%d" % i for i in range(5)]
+        with self.ppy.prefetch(ids):
+            events = [Event(x) for x in ids]
+            groups = [EventGroup("1.21.%d" % i, lazy=True) for i in range(3)]
+            self.assertEqual([g["name"] for g in groups], ["1.21.0", "1.21.1", "1.21.2"])
+        self.assertEqual(events[4]["id"], "1.22.4")
+        self.assertEqual(
+            self.ppy.rpc.calls, [ids, ["1.21.0", "1.21.1", "1.21.2"]]
+        )
+
+    def test_window(self):
+        self.ppy.objectloader.window = 0.2
+        results = dict()
+
+        def load(id):
+            results[id] = self.ppy.objectloader.load(id)
+
+        threads = [
+            threading.Thread(target=load, args=("1.25.%d" % i,)) for i in range(4)
+        ]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        self.assertEqual(len(self.ppy.rpc.calls), 1)
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results["1.25.2"]["id"], "1.25.2")
+
+
+    def start(self, ids):
+        def load(id):
+            self.results[id] = self.ppy.objectloader.load(id)
+
+        threads = [threading.Thread(target=load, args=(id,)) for id in ids]
+        [t.start() for t in threads]
+        return threads
+
+    def wait_for_batch(self, size):
+        for _ in range(100):
+            if len(self.ppy.objectloader._batch.ids) == size:
+                return
+            time.sleep(0.01)
+        self.fail("Lookups did not join the batch")
+
+    def test_coalesce_while_in_flight(self):
+        rpc = self.ppy.rpc
+        rpc.reply.clear()
+        threads = self.start(["1.25.100"])
+        rpc.sending.wait(1)
+        ids = ["1.25.%d" % i for i in range(101, 104)]
+        threads += self.start(ids)
+        self.wait_for_batch(3)
+        rpc.reply.set()
+        [t.join() for t in threads]
+        self.assertEqual(rpc.calls, [["1.25.100"], ids])
+        self.assertEqual(self.results["1.25.103"]["id"], "1.25.103")
+
+    def test_leave_prefetch_while_loading(self):
+        self.ppy.objectloader.window = 0.2
+        with self.ppy.prefetch():
+            threads = self.start(["1.25.200"])
+            self.wait_for_batch(1)
+            threads += self.start(["1.25.201"])
+            self.wait_for_batch(2)
+        [t.join() for t in threads]
+        self.assertEqual(self.ppy.rpc.calls, [["1.25.200", "1.25.201"]])
+        self.assertEqual(self.results["1.25.201"]["id"], "1.25.201")
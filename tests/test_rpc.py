@@ -0,0 +1,190 @@
+import json
+import time
+import unittest
+from grapheneapi.http import Http
+from grapheneapi.websocket import Websocket
+from peerplaysapi.node import PeerPlaysNodeRPC
+from peerplaysapi.exceptions import NoMethodWithName
+from peerplaysapi.nodepool import NodePool
+
+
+class FakeSocket:
+    """ Answers ``get_objects`` calls in reverse order of the requests
+    """
+
+    def __init__(self):
+        self.sent = []
+        self.replies = []
+
+    def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def recv(self):
+        if not self.replies:
+            for payload in reversed(self.sent):
+                api, name, args = payload["params"]
+                if name == "get_objects":
+                    result = [{"id": x} for x in args[0]]
+                    reply = {"id": payload["id"], "result": result}
+                else:
+                    reply = {
+                        "id": payload["id"],
+                        "error": {"message": "no method with name '%s'" % name},
+                    }
+                self.replies.append(json.dumps(reply))
+            self.sent = []
+        return self.replies.pop(0)
+
+
+class UnbatchedHttp(Http):
+    """ Answers ``get_objects`` calls but rejects JSON-RPC batches
+    """
+
+    def rpcexec(self, payload):
+        self.sent.append(payload)
+        if isinstance(payload, list):
+            return json.dumps({"id": None, "error": {"message": "Invalid request"}})
+        args = payload["params"][2]
+        return json.dumps({"id": payload["id"], "result": [{"id": args[0][0]}]})
+
+
+def fake_rpc(connection=None):
+    rpc = PeerPlaysNodeRPC("ws://localhost", connect=False)
+    if connection is None:
+        connection = Websocket("ws://localhost")
+        connection.ws = FakeSocket()
+    rpc._active_connection = connection
+    rpc._active_url = rpc.url
+    return rpc
+
+
+class Testcases(unittest.TestCase):
+    def test_batch_in_order(self):
+        rpc = fake_rpc()
+        with rpc.batch(max_pipeline=3) as batch:
+            handles = [batch.get_object("1.2.%d" % i) for i in range(10)]
+            batch.get_account("1.2.100")
+        results = batch.results()
+        self.assertEqual(len(results), 11)
+        ids = ["1.2.%d" % i for i in range(10)]
+        self.assertEqual([x["id"] for x in results[:10]], ids)
+        self.assertEqual(results[10], {"id": "1.2.100"})
+        self.assertEqual(handles[3].result(), {"id": "1.2.3"})
+
+    def test_batch_errors(self):
+        rpc = fake_rpc()
+        with rpc.batch(raise_exceptions=False) as batch:
+            batch.get_object("1.2.0")
+            batch.get_foobar()
+        results = batch.results()
+        self.assertEqual(results[0], {"id": "1.2.0"})
+        self.assertIsInstance(results[1], NoMethodWithName)
+
+        batch.raise_exceptions = True
+        with self.assertRaises(NoMethodWithName):
+            batch.results()
+
+    def test_batch_http_fallback(self):
+        connection = UnbatchedHttp("http://unbatched")
+        connection.sent = []
+        rpc = fake_rpc(connection)
+        for i in range(2):
+            with rpc.batch() as batch:
+                batch.get_object("1.2.0")
+                batch.get_object("1.2.1")
+            results = batch.results()
+            self.assertEqual([x["id"] for x in results], ["1.2.0", "1.2.1"])
+        # The batch is only tried once
+        batches = [isinstance(x, list) for x in connection.sent]
+        self.assertEqual(batches, [True] + [False] * 4)
+        self.assertEqual(rpc.unbatched_urls, {"http://unbatched"})
+        self.assertEqual(fake_rpc().unbatched_urls, set())
+
+    def test_batch_unexpected_replies(self):
+        rpc = fake_rpc()
+        socket = rpc._active_connection.ws
+        # A stale reply and a notification ahead of the replies to the batch
+        socket.replies = [
+            json.dumps({"id": 1000, "result": [{"id": "1.2.1000"}]}),
+            json.dumps({"method": "notice", "params": [0, []]}),
+        ]
+        with rpc.batch() as batch:
+            batch.get_object("1.2.0")
+            batch.get_object("1.2.1")
+        self.assertEqual([x["id"] for x in batch.results()], ["1.2.0", "1.2.1"])
+
+
+class FakeNode:
+    heads = {"ws://a": 100, "ws://b": 90, "ws://c": 100}
+
+    def __init__(self, url):
+        self.url = url
+        self.api_id = {}
+
+    def connect(self):
+        pass
+
+    def disconnect(self):
+        pass
+
+    def get_dynamic_global_properties(self):
+        return {"head_block_number": self.heads[self.url]}
+
+
+class FakePool(NodePool):
+    def new_connection(self, url):
+        return FakeNode(url)
+
+
+class PoolTestcases(unittest.TestCase):
+    def test_eject_lagging_node(self):
+        pool = FakePool(["ws://a", "ws://b", "ws://c"], size=3, background=False)
+        pool.refresh()
+        self.assertTrue(pool.stats["ws://b"].ejected)
+        self.assertNotIn("ws://b", [s.url for s in pool.warm()])
+        # The nodes are connected before they are selected
+        self.assertEqual(sorted(pool._connections), ["ws://a", "ws://c"])
+
+    def test_route_by_latency_and_errors(self):
+        pool = FakePool(["ws://a", "ws://c"], size=2, background=False)
+        pool.refresh()
+        pool.record("ws://a", latency=0.5)
+        pool.record("ws://c", latency=0.01)
+        self.assertEqual(pool.select(), "ws://c")
+        for _ in range(5):
+            pool.record("ws://c", error=True)
+        self.assertTrue(pool.stats["ws://c"].ejected)
+        self.assertEqual(pool.select(), "ws://a")
+
+    def test_keep_last_node(self):
+        pool = FakePool(["ws://a", "ws://c"], size=2, background=False)
+        for _ in range(5):
+            pool.record("ws://a", error=True)
+            pool.record("ws://c", error=True)
+        self.assertTrue(pool.stats["ws://a"].ejected)
+        self.assertFalse(pool.stats["ws://c"].ejected)
+        self.assertEqual(pool.select(), "ws://c")
+
+        pool = FakePool(["ws://a"], size=1, background=False)
+        for _ in range(10):
+            pool.record("ws://a", error=True)
+        self.assertEqual(pool.select(), "ws://a")
+
+    def test_least_bad_node(self):
+        pool = FakePool(["ws://a", "ws://c"], size=2, background=False)
+        pool.stats["ws://a"].eject(60)
+        pool.stats["ws://c"].eject(30)
+        self.assertEqual(pool.select(), "ws://c")
+
+    def test_background(self):
+        pool = FakePool(["ws://a", "ws://b", "ws://c"], size=3, probe_interval=0.01)
+        pool.select()
+        try:
+            for _ in range(100):
+                if pool.stats["ws://b"].ejected:
+                    break
+                time.sleep(0.01)
+            self.assertTrue(pool.stats["ws://b"].ejected)
+        finally:
+            pool.stop()
+        self.assertIsNone(pool._thread)
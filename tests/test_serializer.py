@@ -0,0 +1,190 @@
+import unittest
+from binascii import hexlify
+
+from peerplaysbase import operations
+from peerplaysbase.objects import Operation
+from peerplaysbase.serializer import (
+    CompiledOperation,
+    UnsupportedTypeError,
+    decode,
+    decode_operation,
+    decode_transaction,
+    encode,
+    encode_operation,
+    encode_transaction,
+)
+from peerplaysbase.signedtransactions import Signed_Transaction
+
+prefix = "TEST"
+wif = "5KQwrPbwdL6PhXujxW37FSSQZ1JiwsST4cqQzDeyXtP79zkvFD3"
+pub = "TEST6MRyAjQq8ud7hVNYcfnVPJqcVpscN5So8BhtHuGYqET5GDW5CV"
+bet_place = (
+    "f68585abf4dce7c80457013e000000000000000000d909"
+    "01e80300000000000001204e0000020000011f2255c9c3"
+    "47ca766db54cbbece1243f3b3f4958ae94fb215c8e504e"
+    "780329098d622782c809b28cb9094dfbd17d919a15c202"
+    "837baf0844605b56ea4a48510de0"
+)
+
+
+class Testcases(unittest.TestCase):
+    def test_decode_transaction(self):
+        tx = decode_transaction(bet_place, prefix=prefix)
+        self.assertEqual(tx["ref_block_num"], 34294)
+        self.assertEqual(tx["ref_block_prefix"], 3707022213)
+        self.assertEqual(tx["expiration"], "2016-04-06T08:29:27")
+        self.assertEqual(
+            tx["operations"],
+            [
+                [
+                    62,
+                    {
+                        "fee": {"amount": 0, "asset_id": "1.3.0"},
+                        "bettor_id": "1.2.1241",
+                        "betting_market_id": "1.25.1",
+                        "amount_to_bet": {"amount": 1000, "asset_id": "1.3.1"},
+                        "backer_multiplier": 20000,
+                        "back_or_lay": "lay",
+                        "extensions": [],
+                    },
+                ]
+            ],
+        )
+        self.assertEqual(len(tx["signatures"]), 1)
+
+    def test_from_bytes(self):
+        tx = Signed_Transaction.from_bytes(bet_place, prefix=prefix)
+        self.assertEqual(hexlify(bytes(tx)).decode("ascii"), bet_place)
+
+    def test_roundtrip_operations(self):
+        ops = [
+            operations.Transfer(
+                **{
+                    "fee": {"amount": 0, "asset_id": "1.3.0"},
+                    "from": "1.2.0",
+                    "to": "1.2.1",
+                    "amount": {"amount": 1000000, "asset_id": "1.3.4"},
+                    "memo": {
+                        "from": pub,
+                        "to": pub,
+                        "nonce": 5862723643998573708,
+                        "message": "fa5b6e83079a878e499e2e52a76a7739",
+                    },
+                    "prefix": prefix,
+                }
+            ),
+            operations.Transfer(
+                **{
+                    "fee": {"amount": 0, "asset_id": "1.3.0"},
+                    "from": "1.2.0",
+                    "to": "1.2.1",
+                    "amount": {"amount": 1, "asset_id": "1.3.0"},
+                    "prefix": prefix,
+                }
+            ),
+            operations.Bet_cancel(
+                **{
+                    "fee": {"amount": 0, "asset_id": "1.3.0"},
+                    "bettor_id": "1.2.5555",
+                    "bet_to_cancel": "1.26.1111",
+                    "prefix": prefix,
+                }
+            ),
+        ]
+        for op in ops:
+            data = bytes(Operation(op))
+            decoded = decode_operation(data, prefix=prefix)
+            self.assertEqual(
+                bytes(Operation([decoded[0], dict(decoded[1], prefix=prefix)])),
+                data,
+            )
+
+    def test_invalid_data(self):
+        with self.assertRaises(ValueError):
+            decode_transaction(bet_place + "00", prefix=prefix)
+        with self.assertRaises(ValueError):
+            decode_transaction(bet_place[:-10], prefix=prefix)
+        with self.assertRaises(ValueError):
+            decode_operation("ff01")
+        self.assertEqual(decode(("array", "uint16"), "020100ffff"), [1, 65535])
+
+    def test_unsupported_types(self):
+        op = {
+            "fee": {"amount": 0, "asset_id": "1.3.0"},
+            "owner": "1.2.100",
+            "name": "NFT",
+            "symbol": "NFT",
+            "base_uri": "",
+            "is_transferable": True,
+            "is_sellable": True,
+        }
+        data = encode_operation(["nft_metadata_create", op])
+        self.assertEqual(decode_operation(data)[1]["name"], "NFT")
+        with self.assertRaises(UnsupportedTypeError):
+            encode_operation(["nft_metadata_create", dict(op, role_id="1.32.0")])
+        compiled = CompiledOperation(["nft_metadata_create", dict(op, role_id="1")])
+        with self.assertRaises(UnsupportedTypeError):
+            bytes(compiled)
+        # A role_id flagged as present in the serialized data
+        with self.assertRaises(UnsupportedTypeError):
+            decode_operation(data[:-4] + b"\x01" + data[-3:])
+
+    def test_encode_transaction(self):
+        tx = decode_transaction(bet_place, prefix=prefix)
+        self.assertEqual(
+            hexlify(encode_transaction(tx, prefix=prefix)).decode("ascii"), bet_place
+        )
+        self.assertEqual(
+            encode(("array", "uint16"), [1, 65535]), b"\x02\x01\x00\xff\xff"
+        )
+
+    def test_compiled_operation(self):
+        ops = [
+            [
+                "sport_create",
+                {
+                    "fee": {"amount": 0, "asset_id": "1.3.0"},
+                    "name": [["en", "Football"], ["de", "Fussball"]],
+                },
+            ],
+            [
+                "bet_place",
+                {
+                    "fee": {"amount": 0, "asset_id": "1.3.0"},
+                    "bettor_id": "1.2.1241",
+                    "betting_market_id": "1.25.1",
+                    "amount_to_bet": {"amount": 1000, "asset_id": "1.3.1"},
+                    "backer_multiplier": 20000,
+                    "back_or_lay": "lay",
+                },
+            ],
+        ]
+        for name, payload in ops:
+            op = CompiledOperation([name, payload], prefix=prefix)
+            self.assertEqual(bytes(op), bytes(Operation([name, dict(payload)])))
+
+        with self.assertRaises(ValueError):
+            bytes(CompiledOperation(["bet_place", {"bettor_id": "1.2.1"}]))
+        with self.assertRaises(ValueError):
+            bytes(
+                CompiledOperation(
+                    ["bet_cancel", dict(ops[1][1], bet_to_cancel="1.2.0")]
+                )
+            )
+
+    def test_sign_compiled_operations(self):
+        def sign(ops):
+            tx = Signed_Transaction(
+                ref_block_num=34294,
+                ref_block_prefix=3707022213,
+                expiration="2016-04-06T08:29:27",
+                operations=ops,
+            )
+            return tx.sign([wif], chain=prefix)
+
+        tx = decode_transaction(bet_place, prefix=prefix)
+        signed = sign([CompiledOperation(op) for op in tx["operations"]])
+        self.assertEqual(
+            hexlify(bytes(signed)).decode("ascii")[:-130], bet_place[:-130]
+        )
+        self.assertEqual(signed.json()["operations"], tx["operations"])
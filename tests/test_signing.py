@@ -0,0 +1,153 @@
+import hashlib
+import unittest
+from binascii import hexlify
+
+from graphenebase.ecdsa import verify_message
+from peerplays import PeerPlays
+from peerplays.transactionbuilder import TransactionBuilder
+from peerplaysbase.account import PrivateKey
+from peerplaysbase.chains import known_chains
+from peerplaysbase import signedtransactions
+from peerplaysbase.signedtransactions import Signed_Transaction, _sign_messages
+from .fixtures_offline import FakeRPC, bet_place, transaction, wif, wif2
+
+prefix = "TEST"
+
+
+class Testcases(unittest.TestCase):
+    def test_sign_many(self):
+        pubkeys = [PrivateKey(wif).pubkey, PrivateKey(wif2).pubkey]
+        for workers in [1, 2]:
+            txs = Signed_Transaction.sign_many(
+                [transaction(i) for i in range(1, 6)],
+                [wif, wif2, wif],
+                chain=prefix,
+                workers=workers,
+            )
+            for i, tx in enumerate(txs):
+                self.assertEqual(tx.json()["operations"], [bet_place(i + 1).json()])
+                self.assertEqual(len(tx.json()["signatures"]), 2)
+                tx.verify(pubkeys, prefix)
+
+        with self.assertRaises(ValueError):
+            Signed_Transaction.sign_many(
+                [transaction(1), transaction(2)], [[wif]], chain=prefix
+            )
+
+    def test_shared_pool(self):
+        threshold = signedtransactions.parallel_threshold
+        signedtransactions.parallel_threshold = 2
+        try:
+            pool = signedtransactions.shared_pool(2)
+            for i in range(2):
+                txs = Signed_Transaction.sign_many(
+                    [transaction(i) for i in range(1, 4)], [wif], workers=2
+                )
+                self.assertIs(signedtransactions.shared_pool(2), pool)
+            results = Signed_Transaction.verify_many(txs, workers=2)
+            self.assertTrue(all(x.valid for x in results))
+        finally:
+            signedtransactions.parallel_threshold = threshold
+            signedtransactions.shutdown_pools()
+        self.assertIsNot(signedtransactions.shared_pool(2), pool)
+        signedtransactions.shutdown_pools()
+
+    def test_verify_many(self):
+        txs = Signed_Transaction.sign_many(
+            [transaction(i) for i in range(1, 5)], [wif], chain=prefix
+        )
+        pubkey = format(PrivateKey(wif).pubkey, prefix)
+        pubkey2 = format(PrivateKey(wif2).pubkey, prefix)
+        txs.append(transaction(5).sign([wif2], chain=prefix))
+
+        # API representation with a modified operation
+        tampered = txs[0].json()
+        tampered["operations"][0][1]["amount_to_bet"]["amount"] = 1000
+        txs.append(tampered)
+
+        for workers in [1, 2]:
+            results = Signed_Transaction.verify_many(
+                txs, [pubkey], chain=prefix, workers=workers
+            )
+            self.assertEqual(
+                [x.valid for x in results], [True, True, True, True, False, False]
+            )
+            self.assertEqual(results[0].signers, [pubkey])
+            self.assertEqual(results[4].signers, [pubkey2])
+            self.assertEqual(results[4].missing, [pubkey])
+
+        results = Signed_Transaction.verify_many(
+            [x.json() for x in txs[:2]],
+            [[pubkey], [PrivateKey(wif).pubkey, pubkey2]],
+            chain=prefix,
+        )
+        self.assertTrue(results[0].valid)
+        self.assertEqual(results[1].missing, [pubkey2])
+
+    def test_verify_malformed(self):
+        txs = [transaction(i).sign([wif], chain=prefix).json() for i in range(1, 4)]
+        txs[1]["signatures"] = ["00" * 65]
+        txs[2]["signatures"].append("1f" + "00" * 64)
+        for workers in [1, 2]:
+            results = Signed_Transaction.verify_many(
+                txs, chain=prefix, workers=workers
+            )
+            self.assertEqual([x.valid for x in results], [True, False, False])
+            self.assertEqual(results[1].invalid, [0])
+            self.assertEqual(results[2].invalid, [1])
+            self.assertEqual(len(results[2].signers), 1)
+
+    def test_verify_unsigned(self):
+        tx = transaction(1).sign([wif], chain=prefix).json()
+        tx["signatures"] = []
+        results = Signed_Transaction.verify_many([tx], chain=prefix)
+        self.assertEqual(results[0], ([], [], []))
+        self.assertFalse(results[0].valid)
+
+    def test_same_as_serial(self):
+        serial = transaction(1).sign([wif], chain=prefix)
+        tx = Signed_Transaction.sign_many([transaction(1)], [wif], chain=prefix)[0]
+        self.assertEqual(tx.message, serial.message)
+        self.assertEqual(tx.privkeys, serial.privkeys)
+
+    def test_transactionbuilder_sign_many(self):
+        ppy = PeerPlays(offline=True)
+        ppy.rpc = FakeRPC()
+        txbuffers = []
+        for i in range(1, 4):
+            txbuffer = TransactionBuilder(blockchain_instance=ppy)
+            txbuffer.appendOps([bet_place(i)])
+            txbuffer.appendWif(wif)
+            txbuffers.append(txbuffer)
+        txbuffers.append(TransactionBuilder(blockchain_instance=ppy))
+        txs = TransactionBuilder.sign_many(txbuffers, workers=2)
+        self.assertEqual(len(txs), 3)
+        for i, txbuffer in enumerate(txbuffers[:3]):
+            self.assertEqual(
+                txbuffer.json()["operations"][0][1]["amount_to_bet"]["amount"], i + 1
+            )
+            self.assertEqual(len(txbuffer.json()["signatures"]), 1)
+            txbuffer.tx.verify([PrivateKey(wif).pubkey], prefix)
+
+    def test_chain_parameters(self):
+        chain = Signed_Transaction.resolve_chain(prefix)
+        self.assertIs(chain, Signed_Transaction.resolve_chain(prefix))
+        self.assertIs(chain, Signed_Transaction.resolve_chain(chain))
+        self.assertEqual(chain["chain_id"], known_chains["BEATRICE"]["chain_id"])
+
+        ppy = PeerPlays(offline=True)
+        ppy.rpc = FakeRPC()
+        self.assertIs(ppy.chain_params, ppy.chain_params)
+        self.assertEqual(ppy.chain_params.chain_id, chain.chain_id)
+
+        tx = transaction(1)
+        tx.deriveDigest(chain)
+        self.assertEqual(tx.digest, hashlib.sha256(tx.message).digest())
+        self.assertEqual(tx.message[:32], chain.chain_id)
+
+    def test_sign_digest(self):
+        # The precomputed digest is signed, the message is not hashed again
+        digest = hashlib.sha256(b"other").digest()
+        signature = _sign_messages(b"message", digest, [wif])[0]
+        pubkey = verify_message(b"other", signature)
+        self.assertEqual(hexlify(pubkey).decode("ascii"), repr(PrivateKey(wif).pubkey))
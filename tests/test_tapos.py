@@ -0,0 +1,96 @@
+import time
+import unittest
+from peerplays import PeerPlays
+from peerplays.tapos import TaposCache, ref_block_params
+from peerplays.transactionbuilder import TransactionBuilder
+from peerplaysapi.node import PeerPlaysNodeRPC
+from peerplaysapi.websocket import PeerPlaysWebsocket
+from .fixtures_offline import FakeRPC, bet_place
+
+head_block_id = "000085f685abf4dce7c804570100000000000000"
+
+
+def block_id(num):
+    return "{:08x}{:08x}".format(num, num * 7) + "0" * 24
+
+
+class TaposRPC(FakeRPC):
+    def __init__(self):
+        self.calls = []
+
+    def get_dynamic_global_properties(self):
+        self.calls.append("get_dynamic_global_properties")
+        return {
+            "last_irreversible_block_num": 34294,
+            "head_block_id": head_block_id,
+            "next_maintenance_time": "2030-01-01T00:00:00",
+        }
+
+    def get_global_properties(self):
+        self.calls.append("get_global_properties")
+        return {"parameters": {"maximum_transaction_size": 500}}
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.ppy = PeerPlays(offline=True, nobroadcast=True)
+        self.ppy.rpc = TaposRPC()
+        self.ws = PeerPlaysWebsocket("ws://localhost")
+        self.ws.connected.set()
+        self.tapos = self.ppy.use_tapos_cache(
+            TaposCache(websocket=self.ws, depth=2, blockchain_instance=self.ppy)
+        )
+
+    def notice(self, block_id):
+        index = self.ws.__events__.index("on_block")
+        self.ws.process_message({"method": "notice", "params": [index, [block_id]]})
+
+    def block_params(self):
+        tx = TransactionBuilder(blockchain_instance=self.ppy)
+        tx.appendOps([bet_place(1)])
+        tx.constructTx()
+        return tx["ref_block_num"], tx["ref_block_prefix"]
+
+    def test_ref_block_params(self):
+        tx = TransactionBuilder(blockchain_instance=self.ppy)
+        self.assertEqual(ref_block_params(head_block_id), tx.get_block_params())
+        self.ppy.rpc.calls = []
+        self.tapos.updated = 0
+        self.assertEqual(ref_block_params(head_block_id), tx.get_block_params())
+        self.assertIn("get_dynamic_global_properties", self.ppy.rpc.calls)
+
+    def test_block_notices(self):
+        self.ppy.rpc.calls = []
+        self.assertEqual(self.block_params(), ref_block_params(head_block_id))
+        referenced = [head_block_id] * 2 + [block_id(num) for num in range(100, 103)]
+        for num, expected in zip(range(100, 105), referenced):
+            self.notice(block_id(num))
+            self.assertEqual(self.block_params(), ref_block_params(expected))
+        self.assertEqual(self.block_params()[0], 102)
+        self.assertNotIn("get_dynamic_global_properties", self.ppy.rpc.calls)
+
+    def test_maintenance(self):
+        self.ppy.rpc.calls = []
+        self.notice(block_id(100))
+        self.assertEqual(self.ppy.rpc.calls, [])
+        self.tapos.next_maintenance = time.time()
+        self.notice(block_id(101))
+        self.assertEqual(
+            self.ppy.rpc.calls,
+            ["get_dynamic_global_properties", "get_global_properties"],
+        )
+        self.assertGreater(self.tapos.next_maintenance, time.time() + 3600)
+        self.assertEqual(self.ppy.batcher.max_size, 500)
+
+    def test_websocket_urls(self):
+        urls = ["http://a", "wss://b", "ws://c"]
+        self.ppy.rpc = PeerPlaysNodeRPC(urls, connect=False)
+        tapos = TaposCache(blockchain_instance=self.ppy)
+        ws_urls = [next(tapos.websocket.urls) for _ in range(3)]
+        self.assertEqual(ws_urls, ["wss://b", "ws://c", "wss://b"])
+        # The urls of the rpc are left alone
+        self.assertEqual(next(self.ppy.rpc.urls), "http://a")
+
+        self.ppy.rpc = PeerPlaysNodeRPC("http://a", connect=False)
+        with self.assertRaises(ValueError):
+            TaposCache(blockchain_instance=self.ppy)
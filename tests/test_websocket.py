@@ -0,0 +1,230 @@
+import asyncio
+import json
+import threading
+import unittest
+import mock
+from grapheneapi.exceptions import RPCError
+from peerplaysapi.aio.websocket import PeerPlaysWebsocket
+from peerplaysapi.heartbeat import Heartbeat
+from peerplaysapi.decoder import loads, notice_id
+from peerplaysapi.subscriptions import SubscriptionMatcher
+from peerplaysapi.websocket import PeerPlaysWebsocket as SyncPeerPlaysWebsocket
+
+
+class FakeWebsocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+
+class Testcases(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+
+    def tearDown(self):
+        self.loop.close()
+
+    def test_aio_reply_by_id(self):
+        ws = PeerPlaysWebsocket("ws://localhost")
+        ws.ws = FakeWebsocket()
+
+        async def run():
+            first = asyncio.ensure_future(ws.get_objects(["2.0.0"]))
+            second = asyncio.ensure_future(ws.get_objects(["2.1.0"]))
+            await asyncio.sleep(0)
+            ids = [x["id"] for x in ws.ws.sent]
+            # Answer out of order
+            ws.on_message(ws.ws, json.dumps({"id": ids[1], "result": ["b"]}))
+            ws.on_message(ws.ws, json.dumps({"id": ids[0], "result": ["a"]}))
+            return await first, await second
+
+        self.assertEqual(self.loop.run_until_complete(run()), (["a"], ["b"]))
+
+    def test_aio_error_and_notice(self):
+        blocks = []
+        ws = PeerPlaysWebsocket("ws://localhost", on_block=blocks.append)
+        ws.ws = FakeWebsocket()
+
+        async def run():
+            call = asyncio.ensure_future(ws.get_block(1))
+            await asyncio.sleep(0)
+            ws.on_message(
+                ws.ws,
+                json.dumps(
+                    {"method": "notice", "params": [2, ["0000000a00000000"]]}
+                ),
+            )
+            ws.on_message(
+                ws.ws,
+                json.dumps({"id": ws.ws.sent[0]["id"], "error": {"message": "foo"}}),
+            )
+            return await call
+
+        with self.assertRaises(RPCError):
+            self.loop.run_until_complete(run())
+        self.assertEqual(blocks, ["0000000a00000000"])
+
+    def test_aio_close_fails_pending(self):
+        ws = PeerPlaysWebsocket("ws://localhost")
+        ws.ws = FakeWebsocket()
+
+        async def run():
+            call = asyncio.ensure_future(ws.get_objects(["2.0.0"]))
+            await asyncio.sleep(0)
+            ws.on_close(ws.ws)
+            return await call
+
+        with self.assertRaises(ConnectionError):
+            self.loop.run_until_complete(run())
+
+    def test_aio_connected(self):
+        ws = PeerPlaysWebsocket("ws://localhost")
+
+        async def run():
+            waiter = asyncio.ensure_future(ws.connected.wait())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            ws.connected.set()
+            return await asyncio.wait_for(waiter, 1)
+
+        self.assertTrue(self.loop.run_until_complete(run()))
+        ws.on_close(None)
+        self.assertFalse(ws.connected.is_set())
+
+    def test_heartbeat_idle_aware(self):
+        ws = PeerPlaysWebsocket("ws://localhost", keep_alive=0.1)
+        pings = []
+
+        async def ping():
+            pings.append(1)
+
+        ws.ping = ping
+
+        async def run():
+            ws.keepalive = Heartbeat(ws.keep_alive)
+            task = asyncio.ensure_future(ws._keepalive(ws.keepalive))
+            # Traffic postpones the ping
+            for _ in range(5):
+                await asyncio.sleep(0.04)
+                ws.keepalive.touch()
+            self.assertEqual(pings, [])
+            await asyncio.sleep(0.25)
+            self.assertTrue(pings)
+            ws.keepalive.stop()
+            await asyncio.wait_for(task, 1)
+
+        self.loop.run_until_complete(run())
+
+    def test_sync_ping_frames(self):
+        ws = SyncPeerPlaysWebsocket("ws://localhost", keep_alive=10)
+        calls = []
+
+        class FakeApp:
+            def __init__(self, url, **kwargs):
+                pass
+
+            def run_forever(self, **kwargs):
+                calls.append(kwargs)
+                ws.running = False
+
+        with mock.patch("websocket.WebSocketApp", FakeApp):
+            ws.run_forever()
+        self.assertEqual(calls, [{"ping_interval": 10}])
+
+    def test_request_ids(self):
+        ws = SyncPeerPlaysWebsocket("ws://localhost")
+        ids = []
+
+        def allocate():
+            for _ in range(1000):
+                ids.append(ws.get_request_id())
+
+        threads = [threading.Thread(target=allocate) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(ids), list(range(1, 4001)))
+
+    def test_decoder(self):
+        self.assertEqual(loads('{"a": [1, "b"]}'), {"a": [1, "b"]})
+        # Control characters are accepted as by the non-strict json module
+        self.assertEqual(loads('{"a": "b\nc"}'), {"a": "b\nc"})
+        self.assertEqual(notice_id('{"method": "notice", "params": [2, []]}'), 2)
+        self.assertEqual(notice_id(b'{"method":"notice","params":[0,[]]}'), 0)
+        self.assertIsNone(notice_id('{"id": 1, "result": []}'))
+
+    def test_raw_notices(self):
+        blocks, objects = [], []
+        ws = SyncPeerPlaysWebsocket(
+            "ws://localhost",
+            objects=["1.2.0"],
+            on_block=blocks.append,
+            on_object=objects.append,
+            raw_notices=["on_block"],
+        )
+        block = json.dumps({"method": "notice", "params": [2, ["0000000a00000000"]]})
+        ws.on_message(None, block)
+        ws.on_message(
+            None,
+            json.dumps({"method": "notice", "params": [1, [[{"id": "1.2.0"}]]]}),
+        )
+        self.assertEqual(blocks, [block])
+        self.assertEqual(objects, [{"id": "1.2.0"}])
+
+    def test_subscription_matcher(self):
+        bets = []
+        matcher = SubscriptionMatcher({"1.26.x": [], "1.27.5": bets.append})
+        matcher.add("2.0.0")
+        self.assertEqual(matcher.match("1.26.100"), [])
+        self.assertEqual(matcher.match("1.27.5"), [bets.append])
+        self.assertIsNone(matcher.match("1.27.6"))
+        self.assertIn("2.0.0", matcher)
+        self.assertEqual(sorted(matcher), ["1.26.x", "1.27.5", "2.0.0"])
+        matcher.remove("1.27.5", bets.append)
+        self.assertFalse(matcher.has_callbacks)
+
+    def test_subscription_matcher_fallthrough(self):
+        bets = []
+        matcher = SubscriptionMatcher({"1.26.x": bets.append})
+        matcher.add("1.26.5")
+        matcher.add("1.27.5")
+        self.assertEqual(matcher.match("1.26.5"), [bets.append])
+        self.assertEqual(matcher.match("1.27.5"), [])
+        self.assertIsNone(matcher.match("1.27.6"))
+
+    def test_per_object_callbacks(self):
+        bets, objects = [], []
+        ws = SyncPeerPlaysWebsocket(
+            "ws://localhost",
+            objects=["1.26.x"],
+            on_object=objects.append,
+        )
+        ws.subscribe_object("1.27.5", bets.append)
+        for id in ["1.26.1", "1.27.5", "1.27.6"]:
+            ws.process_notice({"id": id})
+        self.assertEqual(objects, [{"id": "1.26.1"}])
+        self.assertEqual(bets, [{"id": "1.27.5"}])
+
+    def test_coalesce_notices(self):
+        blocks, objects = [], []
+        ws = SyncPeerPlaysWebsocket(
+            "ws://localhost",
+            objects=["1.25.x"],
+            on_object=objects.append,
+            on_block=blocks.append,
+            coalesce_notices=True,
+        )
+        for i in range(3):
+            ws.process_message(
+                {
+                    "method": "notice",
+                    "params": [1, [[{"id": "1.25.1", "n": i}, {"id": "1.25.2", "n": i}]]],
+                }
+            )
+        self.assertEqual(objects, [])
+        ws.process_message({"method": "notice", "params": [2, ["00000001"]]})
+        self.assertEqual(objects, [{"id": "1.25.1", "n": 2}, {"id": "1.25.2", "n": 2}])
+        self.assertEqual(blocks, ["00000001"])